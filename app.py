@@ -1,20 +1,138 @@
-from flask import Flask, jsonify, request
+from flask import Blueprint, Flask, Response, current_app, g, jsonify, request, stream_with_context
 from flask_cors import CORS
-from sgp4.api import Satrec, jday
 from datetime import datetime, timedelta
 import requests
 import math
 import random
 import time
 import json
+import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import os
+import atexit
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+from propagation import JD_UNIX_EPOCH, SGP4_ERROR_MESSAGES, ConstellationEngine, julian_date, julian_dates, naive_utc, time_grid
+from coordinates import GroundStation, doppler_shift, teme_to_ecef, teme_to_geodetic
+from passes import PassPredictor
+from conjunctions import ConjunctionScreener
+from illumination import constellation_illumination, illuminated_fraction, illumination_state, sun_position
+from catalogue import CatalogueSnapshot, GroupSnapshot, diff_records, parse_tle_lines
+from tle_cache import TLEDiskCache
+from shared_catalogue import SharedCatalogue
+from ephemeris import EphemerisStore
+from position_cache import UNIX_EPOCH, PositionCache
+from telemetry_store import TelemetryStore, downsample
+from streaming import StreamHub
+from encoding import EXTENSIONS, UnsupportedFormat, compress, encode, negotiate_format, round_columns
+from metrics import MetricsRegistry
+from profiling import PHASES, ProfileStore, RequestProfiler, SlowRequestLog, begin_request, end_request, phase, pstats_summary
+from structured_logging import configure_logging
 
-app = Flask(__name__)
-CORS(app)
+CELESTRAK_URL = os.environ.get('CELESTRAK_URL', 'https://celestrak.org/NORAD/elements')
+FETCH_CONCURRENCY = int(os.environ.get('TLE_FETCH_CONCURRENCY', 8))
+FETCH_RETRIES = int(os.environ.get('TLE_FETCH_RETRIES', 3))
+FETCH_TIMEOUT = (5, 30)  # connect, read seconds
+TLE_REFRESH_INTERVAL = float(os.environ.get('TLE_REFRESH_INTERVAL', 6 * 3600))  # seconds before a group is stale; also the background refresh period
+WARMUP_GROUPS = [group for group in os.environ.get('WARMUP_GROUPS', 'space_stations').split(',') if group]
+POSITION_CACHE_SIZE = int(os.environ.get('POSITION_CACHE_SIZE', 4096))
+POSITION_CACHE_QUANTUM = float(os.environ.get('POSITION_CACHE_QUANTUM', 1.0))  # seconds
+TLE_CACHE_DIR = os.environ.get(
+    'TLE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tle_cache')
+)
+EPHEMERIS_ENABLED = os.environ.get('EPHEMERIS_ENABLED', '1') != '0'
+EPHEMERIS_WINDOW = float(os.environ.get('EPHEMERIS_WINDOW', 2 * 3600))  # seconds of precomputed states
+EPHEMERIS_STEP = float(os.environ.get('EPHEMERIS_STEP', 60))  # seconds between Hermite nodes
+EPHEMERIS_TOLERANCE = float(os.environ.get('EPHEMERIS_TOLERANCE', 0.01))  # km; worse satellites use SGP4
+# standalone: every process fetches; updater: fetch and publish the shared catalogue; reader: map it
+CATALOGUE_MODE = os.environ.get('CATALOGUE_MODE', 'standalone')
+SHARED_CATALOGUE_PATH = os.environ.get('SHARED_CATALOGUE_PATH')  # defaults to <TLE_CACHE_DIR>/catalogue.bin
+SHARED_CATALOGUE_POLL = float(os.environ.get('SHARED_CATALOGUE_POLL', 1.0))  # seconds between file checks
+TELEMETRY_RESOLUTION = float(os.environ.get('TELEMETRY_RESOLUTION', 10))  # seconds between samples
+TELEMETRY_RETENTION = float(os.environ.get('TELEMETRY_RETENTION', 24 * 3600))  # seconds kept per satellite
+TELEMETRY_MAX_SERIES = int(os.environ.get('TELEMETRY_MAX_SERIES', 64))  # satellites kept open
+TELEMETRY_STORE_DIR = os.environ.get('TELEMETRY_STORE_DIR')  # memory-mapped ring files when set
+TELEMETRY_SEED = int(os.environ.get('TELEMETRY_SEED', 0))
+TELEMETRY_DOWNSAMPLE_METHODS = ('mean', 'minmax', 'lttb')
+MIN_DOWNSAMPLE_POINTS = 3  # LTTB keeps both end points and needs one bucket between them
+STREAM_TICK = float(os.environ.get('STREAM_TICK', 1.0))  # seconds between scheduler ticks
+STREAM_QUEUE_SIZE = int(os.environ.get('STREAM_QUEUE_SIZE', 8))  # frames buffered per client
+STREAM_MAX_SATELLITES = 500  # individually followed satellites per client
+STREAM_KEEPALIVE = 15  # seconds between SSE comments on an idle stream
+CONJUNCTION_WORKERS = int(os.environ.get('CONJUNCTION_WORKERS', os.cpu_count() or 1))
+CONJUNCTION_CONCURRENCY = int(os.environ.get('CONJUNCTION_CONCURRENCY', 2))  # screenings running at once
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text or json
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'  # default of app.config['PROFILING_ENABLED']
+PROFILE_HEADER = 'X-Profile'  # pstats (cProfile) or collapsed (sampled stacks)
+PROFILE_MODES = {'pstats': 'pstats', 'collapsed': 'collapsed', '1': 'collapsed', 'true': 'collapsed'}
+PROFILE_HISTORY = int(os.environ.get('PROFILE_HISTORY', 20))  # profiles kept in memory
+PROFILE_DIR = os.environ.get('PROFILE_DIR')  # profiles are also written here when set
+SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', 1.0))
+SLOW_REQUEST_HISTORY = int(os.environ.get('SLOW_REQUEST_HISTORY', 100))  # slow requests kept
+
+logger = configure_logging(LOG_LEVEL, LOG_FORMAT)
+
+# Metrics exposed at /api/metrics; scrape-time collectors fill in the cache and catalogue gauges
+metrics = MetricsRegistry()
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    'gs_http_request_duration_seconds', 'HTTP request latency by route', ('route', 'method', 'status'))
+REQUEST_PHASE_SECONDS = metrics.histogram(
+    'gs_request_phase_seconds', 'Time per request spent in each phase (exclusive of nested phases)', ('phase',))
+PROPAGATION_SECONDS = metrics.histogram(
+    'gs_propagation_duration_seconds', 'Propagation and frame conversion time by workload', ('kind',))
+PROPAGATED_STATES = metrics.counter(
+    'gs_propagated_states_total', 'Satellite states propagated (satellites x times)', ('kind',))
+SGP4_ERRORS = metrics.counter(
+    'gs_sgp4_errors_total', 'SGP4 propagation errors by satellite and error code', ('norad_id', 'code'))
+TLE_FETCH_SECONDS = metrics.histogram(
+    'gs_tle_fetch_duration_seconds', 'TLE group download and install time', ('group',))
+TLE_FETCHES = metrics.counter(
+    'gs_tle_fetches_total', 'TLE group fetches by result', ('group', 'result'))
+TLE_FETCH_BYTES = metrics.counter(
+    'gs_tle_fetch_bytes_total', 'TLE bytes downloaded', ('group',))
+TLE_RECORD_CHANGES = metrics.counter(
+    'gs_tle_record_changes_total', 'Objects added, updated, removed or unchanged by TLE refreshes', ('group', 'change'))
+CATALOGUE_SATELLITES = metrics.gauge('gs_catalogue_satellites', 'Distinct objects in the catalogue')
+CATALOGUE_VERSION = metrics.gauge('gs_catalogue_version', 'Catalogue snapshot version')
+GROUP_SATELLITES = metrics.gauge('gs_group_satellites', 'Objects per loaded group', ('group',))
+GROUP_AGE_SECONDS = metrics.gauge('gs_group_age_seconds', 'Seconds since each group was fetched', ('group',))
+POSITION_CACHE_LOOKUPS = metrics.counter('gs_position_cache_lookups_total', 'Position cache lookups', ('result',))
+POSITION_CACHE_EVICTIONS = metrics.counter('gs_position_cache_evictions_total', 'Position cache LRU evictions')
+POSITION_CACHE_ENTRIES = metrics.gauge('gs_position_cache_entries', 'Cached positions')
+POSITION_CACHE_HIT_RATIO = metrics.gauge('gs_position_cache_hit_ratio', 'Position cache hits / lookups')
+TELEMETRY_STORE_SAMPLES = metrics.gauge('gs_telemetry_store_samples', 'Telemetry samples held in open rings')
+EPHEMERIS_BYTES = metrics.gauge('gs_ephemeris_bytes', 'Memory held by the ephemeris table')
+EPHEMERIS_SATELLITES = metrics.gauge('gs_ephemeris_satellites', 'Satellites in the ephemeris table by lookup path', ('path',))
+EPHEMERIS_ERROR_KM = metrics.gauge('gs_ephemeris_max_error_km', 'Largest measured interpolation error of an interpolated satellite')
+EPHEMERIS_BUILDS = metrics.counter('gs_ephemeris_builds_total', 'Ephemeris table builds')
+STREAM_SUBSCRIBERS = metrics.gauge('gs_stream_subscribers', 'Connected streaming clients')
+STREAM_FRAMES = metrics.counter('gs_stream_frames_total', 'Streaming frames by outcome', ('result',))
+
+slow_requests = SlowRequestLog(SLOW_REQUEST_SECONDS, SLOW_REQUEST_HISTORY)
+
+# Conjunction pools still open at interpreter exit; their workers are stopped without waiting for queued work
+_conjunction_pools = weakref.WeakSet()
+
+@atexit.register
+def _shutdown_conjunction_pools():
+    for pool in list(_conjunction_pools):
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def observe_propagation(kind, started, states, norad_ids=None, codes=None):
+    """Record one propagation call; norad_ids/codes list the states SGP4 rejected"""
+    PROPAGATION_SECONDS.observe(time.perf_counter() - started, kind=kind)
+    PROPAGATED_STATES.inc(states, kind=kind)
+    if codes is not None and len(codes):
+        for norad_id, code in zip(np.asarray(norad_ids).tolist(), np.asarray(codes).tolist()):
+            SGP4_ERRORS.inc(norad_id=norad_id, code=code)
 
 class AdvancedTelemetrySimulator:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.base_values = {
             'battery_voltage': 28.5, 'battery_current': 2.5, 'solar_voltage': 35.0,
             'solar_current': 8.5, 'temperature_internal': 22.0, 'temperature_external': -45.0,
@@ -24,20 +142,22 @@ class AdvancedTelemetrySimulator:
             'angular_velocity_y': 0.1, 'angular_velocity_z': 0.1,
             'thruster_fuel': 85.0, 'reaction_wheel_speed': 3000,
         }
-        self.orbital_effects = {
-            'eclipse_factor': 1.0, 
-            'communication_factor': 1.0, 
-            'thermal_factor': 1.0
-        }
+        # Batch generation draws from its own seeded generator so series are reproducible
+        self.rng = np.random.default_rng(seed)
     
-    def simulate_realistic_telemetry(self, satellite_position=None):
+    @property
+    def batch_fields(self):
+        """Column names produced by simulate_telemetry_batch, in order"""
+        return list(self.base_values) + ['system_health', 'power_balance']
+    
+    def simulate_realistic_telemetry(self, satellite_position=None, illumination=1.0):
+        """One telemetry frame; illumination is the visible fraction of the Sun's disk (0 umbra .. 1 sunlit)"""
         telemetry = {}
         current_time = datetime.utcnow()
         
-        if satellite_position:
-            self._update_orbital_effects(satellite_position)
-        
-        eclipse_multiplier = 0.3 if self.orbital_effects['eclipse_factor'] < 0.5 else 1.0
+        altitude = satellite_position.get('altitude', 400) if satellite_position else 400
+        effects = self.orbital_effects(illumination, altitude)
+        eclipse_multiplier = 0.3 if effects['eclipse_factor'] < 0.5 else 1.0
         
         # Battery System
         telemetry['battery_voltage'] = self._add_realistic_noise(
@@ -49,20 +169,20 @@ class AdvancedTelemetrySimulator:
         
         # Solar System
         telemetry['solar_voltage'] = self._add_realistic_noise(
-            self.base_values['solar_voltage'] * self.orbital_effects['eclipse_factor'], 2.0
+            self.base_values['solar_voltage'] * effects['eclipse_factor'], 2.0
         )
         telemetry['solar_current'] = self._add_realistic_noise(
-            self.base_values['solar_current'] * self.orbital_effects['eclipse_factor'], 1.0
+            self.base_values['solar_current'] * effects['eclipse_factor'], 1.0
         )
         
         # Thermal System
         telemetry['temperature_internal'] = self._add_realistic_noise(
             self.base_values['temperature_internal'] + 
-            (10 * self.orbital_effects['thermal_factor'] - 5), 2.0
+            (10 * effects['thermal_factor'] - 5), 2.0
         )
         telemetry['temperature_external'] = self._add_realistic_noise(
             self.base_values['temperature_external'] + 
-            (30 * self.orbital_effects['thermal_factor'] - 15), 5.0
+            (30 * effects['thermal_factor'] - 15), 5.0
         )
         
         # Computer Systems
@@ -78,10 +198,10 @@ class AdvancedTelemetrySimulator:
         
         # Communication System
         telemetry['signal_strength'] = self._add_realistic_noise(
-            self.base_values['signal_strength'] * self.orbital_effects['communication_factor'], 5.0
+            self.base_values['signal_strength'] * effects['communication_factor'], 5.0
         )
         telemetry['data_rate'] = max(0.1, self._add_realistic_noise(
-            self.base_values['data_rate'] * self.orbital_effects['communication_factor'], 0.5
+            self.base_values['data_rate'] * effects['communication_factor'], 0.5
         ))
         
         # Attitude Control System
@@ -106,17 +226,15 @@ class AdvancedTelemetrySimulator:
         
         return telemetry
     
-    def _update_orbital_effects(self, position):
-        altitude = position.get('altitude', 400)
-        longitude = position.get('longitude', 0)
-        hour_angle = (longitude + 180) % 360
-        if 90 < hour_angle < 270:
-            self.orbital_effects['eclipse_factor'] = 0.1
-            self.orbital_effects['thermal_factor'] = 0.3
-        else:
-            self.orbital_effects['eclipse_factor'] = 1.0
-            self.orbital_effects['thermal_factor'] = 0.8
-        self.orbital_effects['communication_factor'] = min(1.0, altitude / 500.0)
+    @staticmethod
+    def orbital_effects(illumination, altitude):
+        """Eclipse, thermal and communication factors for scalars or arrays of illumination and altitude (km)"""
+        illumination = np.nan_to_num(illumination, nan=1.0)
+        return {
+            'eclipse_factor': 0.1 + 0.9 * illumination,
+            'thermal_factor': 0.3 + 0.5 * illumination,
+            'communication_factor': np.minimum(1.0, altitude / 500.0)
+        }
     
     def _add_realistic_noise(self, base_value, noise_amplitude):
         white_noise = random.gauss(0, noise_amplitude * 0.3)
@@ -133,15 +251,111 @@ class AdvancedTelemetrySimulator:
         if telemetry['cpu_usage'] < 80: health_factors.append(1.0)
         else: health_factors.append(0.6)
         return sum(health_factors) / len(health_factors) * 100
+    
+    def simulate_telemetry_batch(self, latitude, longitude, altitude, illumination=None, rng=None):
+        """Columnar telemetry for arrays of positions (degrees, km) and illuminated fractions, one row per sample"""
+        rng = rng if rng is not None else self.rng
+        altitude = np.asarray(altitude, dtype=float)
+        n = len(altitude)
+        base = self.base_values
+        
+        effects = self.orbital_effects(np.ones(n) if illumination is None else np.asarray(illumination, dtype=float), altitude)
+        eclipse_factor = effects['eclipse_factor']
+        thermal_factor = effects['thermal_factor']
+        communication_factor = effects['communication_factor']
+        eclipse_multiplier = np.where(eclipse_factor < 0.5, 0.3, 1.0)
+        
+        noise = lambda value, amplitude: self._batch_noise(rng, value, amplitude, n)
+        telemetry = {}
+        
+        # Battery System
+        telemetry['battery_voltage'] = noise(base['battery_voltage'] * (0.9 + 0.1 * eclipse_multiplier), 0.5)
+        telemetry['battery_current'] = noise(base['battery_current'] * (2.0 - eclipse_multiplier), 0.2)
+        
+        # Solar System
+        telemetry['solar_voltage'] = noise(base['solar_voltage'] * eclipse_factor, 2.0)
+        telemetry['solar_current'] = noise(base['solar_current'] * eclipse_factor, 1.0)
+        
+        # Thermal System
+        telemetry['temperature_internal'] = noise(base['temperature_internal'] + (10 * thermal_factor - 5), 2.0)
+        telemetry['temperature_external'] = noise(base['temperature_external'] + (30 * thermal_factor - 15), 5.0)
+        
+        # Computer Systems
+        telemetry['cpu_usage'] = np.clip(noise(base['cpu_usage'] + rng.uniform(-10, 20, n), 5.0), 10, 95)
+        telemetry['memory_usage'] = np.clip(noise(base['memory_usage'] + rng.uniform(-5, 10, n), 3.0), 30, 90)
+        telemetry['disk_usage'] = np.clip(base['disk_usage'] + rng.uniform(-1, 2, n), 20, 80)
+        
+        # Communication System
+        telemetry['signal_strength'] = noise(base['signal_strength'] * communication_factor, 5.0)
+        telemetry['data_rate'] = np.maximum(0.1, noise(base['data_rate'] * communication_factor, 0.5))
+        
+        # Attitude Control System
+        for axis in ('x', 'y', 'z'):
+            telemetry[f'attitude_{axis}'] = noise(base[f'attitude_{axis}'], 0.5)
+        for axis in ('x', 'y', 'z'):
+            telemetry[f'angular_velocity_{axis}'] = noise(base[f'angular_velocity_{axis}'], 0.05)
+        
+        # Propulsion System
+        telemetry['thruster_fuel'] = np.maximum(0, base['thruster_fuel'] - rng.uniform(0, 0.001, n))
+        telemetry['reaction_wheel_speed'] = noise(base['reaction_wheel_speed'], 100)
+        
+        # Health indicators, same thresholds as _calculate_system_health
+        battery_health = np.select(
+            [telemetry['battery_voltage'] > 26.0, telemetry['battery_voltage'] > 24.0], [1.0, 0.7], 0.3
+        )
+        thermal_health = np.where(
+            (telemetry['temperature_internal'] >= -10) & (telemetry['temperature_internal'] <= 35), 1.0, 0.5
+        )
+        cpu_health = np.where(telemetry['cpu_usage'] < 80, 1.0, 0.6)
+        telemetry['system_health'] = (battery_health + thermal_health + cpu_health) / 3 * 100
+        telemetry['power_balance'] = (telemetry['solar_voltage'] * telemetry['solar_current']) - (telemetry['battery_voltage'] * telemetry['battery_current'])
+        
+        return telemetry
+    
+    @staticmethod
+    def _batch_noise(rng, base_value, noise_amplitude, n):
+        """Vectorized _add_realistic_noise: white noise plus occasional uniform spikes"""
+        white_noise = rng.normal(0, noise_amplitude * 0.3, n)
+        spike_noise = np.where(rng.random(n) < 0.05, rng.uniform(-noise_amplitude, noise_amplitude, n), 0.0)
+        return base_value + white_noise + spike_noise
 
 class MultiSatelliteTracker:
-    def __init__(self):
-        self.satellites = {}
+    def __init__(self, cache_dir=TLE_CACHE_DIR, base_url=CELESTRAK_URL, refresh_interval=TLE_REFRESH_INTERVAL):
         self.satellite_groups = {}
+        self.refresh_interval = refresh_interval
         self.telemetry_simulator = AdvancedTelemetrySimulator()
-        self.tle_cache = {}
-        self.last_tle_update = None
+        self.tle_cache = TLEDiskCache(cache_dir)
+        self.base_url = base_url.rstrip('/')
         self.update_lock = threading.Lock()
+        self.position_cache = PositionCache(POSITION_CACHE_SIZE, POSITION_CACHE_QUANTUM)
+        self.ephemeris = EphemerisStore(EPHEMERIS_WINDOW, EPHEMERIS_STEP, EPHEMERIS_TOLERANCE)
+        self.telemetry_store = TelemetryStore(
+            self.telemetry_simulator.batch_fields, TELEMETRY_RESOLUTION, TELEMETRY_RETENTION,
+            TELEMETRY_MAX_SERIES, TELEMETRY_STORE_DIR, TELEMETRY_SEED
+        )
+        
+        # Pooled keep-alive session with per-request retries and backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=FETCH_CONCURRENCY,
+            pool_maxsize=FETCH_CONCURRENCY,
+            max_retries=Retry(
+                total=FETCH_RETRIES,
+                backoff_factor=1.0,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=('GET',)
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=FETCH_CONCURRENCY, thread_name_prefix='tle-fetch'
+        )
+        self.inflight_fetches = {}
+        self.inflight_lock = threading.Lock()
+        self.conjunction_pool = None
+        self.conjunction_pool_lock = threading.Lock()
+        self.conjunction_slots = threading.BoundedSemaphore(CONJUNCTION_CONCURRENCY)
         
         # Add satellite name aliases for common shortcuts
         self.satellite_aliases = {
@@ -150,6 +364,9 @@ class MultiSatelliteTracker:
             'TIANGONG': ['TIANGONG', 'CSS (TIANHE)']
         }
         
+        # Readers take one reference to the current snapshot; writers swap in a new one
+        self.catalogue = CatalogueSnapshot(aliases=self.satellite_aliases)
+        
         # Initialize with predefined satellite groups
         self.initialize_satellite_groups()
         
@@ -158,368 +375,1462 @@ class MultiSatelliteTracker:
         self.satellite_groups = {
             'space_stations': {
                 'name': 'Space Stations',
-                'url': 'https://celestrak.org/NORAD/elements/stations.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/stations.txt',
             },
             'starlink': {
                 'name': 'Starlink Constellation', 
-                'url': 'https://celestrak.org/NORAD/elements/starlink.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/starlink.txt',
             },
             'galileo': {
                 'name': 'Galileo Navigation',
-                'url': 'https://celestrak.org/NORAD/elements/galileo.txt', 
-                'satellites': {}
+                'url': f'{self.base_url}/galileo.txt', 
             },
             'gps': {
                 'name': 'GPS Constellation',
-                'url': 'https://celestrak.org/NORAD/elements/gps-ops.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/gps-ops.txt',
             },
             'glonass': {
                 'name': 'GLONASS Navigation',
-                'url': 'https://celestrak.org/NORAD/elements/glonass-ops.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/glonass-ops.txt',
             },
             'weather': {
                 'name': 'Weather Satellites',
-                'url': 'https://celestrak.org/NORAD/elements/weather.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/weather.txt',
             },
             'active': {
                 'name': 'Active Satellites',
-                'url': 'https://celestrak.org/NORAD/elements/active.txt',
-                'satellites': {}
+                'url': f'{self.base_url}/active.txt',
             }
         }
     
+    @property
+    def last_tle_update(self):
+        return self.catalogue.last_update
+    
     def find_satellite_by_name(self, search_name):
-        """Find satellite by exact name or alias"""
-        search_name = search_name.upper().strip()
-        
-        # Try exact match first
-        for sat_name in self.satellites.keys():
-            if sat_name.upper() == search_name:
-                return sat_name
-        
-        # Try alias matching
-        for alias, full_names in self.satellite_aliases.items():
-            if search_name == alias.upper():
-                for full_name in full_names:
-                    for sat_name in self.satellites.keys():
-                        if full_name.upper() in sat_name.upper():
-                            return sat_name
-        
-        # Try partial matching (contains search term)
-        for sat_name in self.satellites.keys():
-            if search_name in sat_name.upper():
-                return sat_name
+        """Find satellite by exact name, NORAD ID, alias or partial name"""
+        record = self.catalogue.resolve(search_name)
+        return record.name if record else None
+    
+    def is_group_stale(self, group_key, now=None):
+        """True if a group was never loaded or is older than the refresh interval"""
+        group = self.catalogue.groups.get(group_key)
+        if not group or not group.fetched_at:
+            return True
+        now = now or datetime.utcnow()
+        return (now - group.fetched_at).total_seconds() >= self.refresh_interval
+    
+    def get_group_freshness(self, now=None):
+        """Per-group fetch time, newest TLE epoch and staleness"""
+        now = now or datetime.utcnow()
+        catalogue = self.catalogue
+        freshness = {}
+        for group_key in self.satellite_groups:
+            group = catalogue.groups.get(group_key)
+            fetched_at = group.fetched_at if group else None
+            epoch = group.epoch if group else None
+            freshness[group_key] = {
+                'count': len(group) if group else 0,
+                'fetched_at': fetched_at.isoformat() if fetched_at else None,
+                'age_seconds': (now - fetched_at).total_seconds() if fetched_at else None,
+                'epoch': epoch.isoformat() if epoch else None,
+                'stale': self.is_group_stale(group_key, now)
+            }
+        return freshness
+    
+    def load_cached_tle_data(self):
+        """Load every group from the on-disk TLE cache without touching the network"""
+        loaded_groups = []
+        for group in self.satellite_groups:
+            entry = self.tle_cache.load(group)
+            if not entry:
+                continue
+            
+            self._publish_group(group, self._parse_tle_text(entry['text']), entry['fetched_at'])
+            loaded_groups.append(group)
         
-        return None
+        return {
+            "status": "success" if loaded_groups else "empty",
+            "loaded_groups": loaded_groups,
+            "total_satellites": len(self.catalogue)
+        }
+    
+    def _parse_tle_text(self, text, group=None):
+        return self._parse_tle_data(text.strip().split('\n'), group)
+    
+    def _publish_group(self, group, records, fetched_at):
+        """Install a parsed group by swapping in a new catalogue snapshot; returns the change counts"""
+        snapshot = GroupSnapshot(group, records, fetched_at)
+        with self.update_lock:
+            previous = self.catalogue.groups.get(group)
+            changes = diff_records(previous.records if previous else (), records)
+            self._swap_catalogue(self.catalogue.with_group(snapshot))
+        for change, count in changes.items():
+            TLE_RECORD_CHANGES.inc(count, group=group, change=change)
+        return changes
+    
+    def load_shared_catalogue(self, view):
+        """Replace the catalogue with one mapped from the shared catalogue file; returns the change counts"""
+        with self.update_lock:
+            previous = self.catalogue
+            catalogue = view.to_snapshot(self.satellite_aliases, previous.version + 1, previous.by_norad())
+            self._swap_catalogue(catalogue.inherit(previous))
+        return diff_records(previous.records, catalogue.records)
+    
+    def _swap_catalogue(self, catalogue):
+        # Callers hold update_lock
+        previous = self.catalogue
+        self.catalogue = catalogue
+        self.ephemeris.changed.set()
+        
+        # Drop cached positions for objects whose elements changed or disappeared
+        current = catalogue.norad_index
+        self.position_cache.invalidate(
+            record.norad_id for record in previous.records
+            if record.norad_id not in current
+            or catalogue.records[current[record.norad_id]] is not record
+        )
     
     def fetch_live_tle_data(self, group_key=None, force_update=False):
-        """Fetch live TLE data from CelesTrak"""
+        """Fetch live TLE data from CelesTrak, revalidating the on-disk cache"""
         current_time = datetime.utcnow()
         
-        # Check if update is needed (every 6 hours unless forced)
-        if not force_update and self.last_tle_update:
-            time_diff = current_time - self.last_tle_update
-            if time_diff.total_seconds() < 6 * 3600:  # 6 hours
+        groups_to_update = [group_key] if group_key else list(self.satellite_groups.keys())
+        
+        # Only refresh groups older than the refresh interval unless forced
+        if not force_update:
+            groups_to_update = [
+                group for group in groups_to_update if self.is_group_stale(group, current_time)
+            ]
+            if not groups_to_update:
                 return {"status": "cached", "message": "Using cached TLE data"}
         
-        with self.update_lock:
-            updated_groups = []
-            errors = []
-            
-            groups_to_update = [group_key] if group_key else self.satellite_groups.keys()
+        # Download groups in parallel; overlapping callers join the in-flight fetch
+        futures = [
+            self._fetch_group_async(group)
+            for group in groups_to_update if group in self.satellite_groups
+        ]
+        
+        updated_groups = []
+        not_modified_groups = []
+        changes = {}
+        errors = []
+        for future in futures:
+            outcome = future.result()
+            if outcome['status'] == 'updated':
+                updated_groups.append(outcome['group'])
+                changes[outcome['group']] = outcome['changes']
+            elif outcome['status'] == 'not_modified':
+                not_modified_groups.append(outcome['group'])
+            else:
+                errors.append(outcome['error'])
+        
+        return {
+            "status": "success" if updated_groups or not_modified_groups else "error",
+            "updated_groups": updated_groups,
+            "not_modified_groups": not_modified_groups,
+            "changes": changes,
+            "total_satellites": len(self.catalogue),
+            "errors": errors,
+            "timestamp": current_time.isoformat()
+        }
+    
+    def _fetch_group_async(self, group):
+        """Return the in-flight fetch for a group, starting one if none is running"""
+        with self.inflight_lock:
+            future = self.inflight_fetches.get(group)
+            if future is None:
+                future = self.fetch_executor.submit(self._fetch_group, group)
+                self.inflight_fetches[group] = future
+                future.add_done_callback(lambda f, group=group: self._clear_inflight(group, f))
+            return future
+    
+    def _clear_inflight(self, group, future):
+        with self.inflight_lock:
+            if self.inflight_fetches.get(group) is future:
+                del self.inflight_fetches[group]
+    
+    def _fetch_group(self, group):
+        """Download one group and install it in the catalogue"""
+        current_time = datetime.utcnow()
+        started = time.perf_counter()
+        outcome = self._download_group(group, current_time)
+        
+        TLE_FETCH_SECONDS.observe(time.perf_counter() - started, group=group)
+        TLE_FETCHES.inc(group=group, result=outcome['status'])
+        return outcome
+    
+    def _download_group(self, group, current_time, conditional=True):
+        try:
+            logger.info("🛰️  Fetching TLE data", extra={'group': group})
+            response = self.session.get(
+                self.satellite_groups[group]['url'],
+                headers=self.tle_cache.conditional_headers(group) if conditional else {},
+                timeout=FETCH_TIMEOUT
+            )
+            TLE_FETCH_BYTES.inc(len(response.content), group=group)
             
-            for group in groups_to_update:
-                if group not in self.satellite_groups:
-                    continue
-                    
-                try:
-                    print(f"🛰️  Fetching TLE data for {self.satellite_groups[group]['name']}...")
-                    response = requests.get(self.satellite_groups[group]['url'], timeout=30)
-                    
-                    if response.status_code == 200:
-                        tle_data = response.text.strip().split('\n')
-                        parsed_sats = self._parse_tle_data(tle_data)
-                        
-                        # Update satellite group
-                        self.satellite_groups[group]['satellites'] = parsed_sats
-                        
-                        # Add to main satellites dictionary
-                        for sat_name, sat_data in parsed_sats.items():
-                            self.satellites[sat_name] = sat_data['satrec']
-                        
-                        updated_groups.append(group)
-                        print(f"✅ Loaded {len(parsed_sats)} satellites from {group}")
-                        
-                    else:
-                        error_msg = f"Failed to fetch {group}: HTTP {response.status_code}"
-                        errors.append(error_msg)
-                        print(f"❌ {error_msg}")
-                        
-                except Exception as e:
-                    error_msg = f"Error fetching {group}: {str(e)}"
-                    errors.append(error_msg)
-                    print(f"❌ {error_msg}")
+            if response.status_code == 304:
+                # Unchanged upstream: only re-parse if this process has not loaded it yet
+                self.tle_cache.touch(group, current_time)
+                if group not in self.catalogue.groups:
+                    entry = self.tle_cache.load(group)
+                    if entry:
+                        changes = self._publish_group(group, self._parse_tle_text(entry['text'], group), current_time)
+                        logger.info("✅ Loaded group from cache (not modified upstream)", extra={'group': group})
+                        return {'group': group, 'status': 'updated', 'changes': changes}
+                    if conditional:
+                        # Validators without a readable body would pin the group empty: fetch it whole
+                        logger.warning("⚠️ Cached TLE text missing, refetching unconditionally", extra={'group': group})
+                        self.tle_cache.forget(group)
+                        return self._download_group(group, current_time, conditional=False)
+                else:
+                    with self.update_lock:
+                        self.catalogue = self.catalogue.with_refreshed_group(group, current_time)
+                logger.info("✅ Group not modified since last fetch", extra={'group': group})
+                return {'group': group, 'status': 'not_modified'}
             
-            if updated_groups:
-                self.last_tle_update = current_time
+            if response.status_code == 200:
+                records = self._parse_tle_text(response.text, group)
+                changes = self._publish_group(group, records, current_time)
+                self.tle_cache.store(
+                    group, response.text, current_time,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+                logger.info("✅ Loaded group", extra={'group': group, 'satellites': len(records), **changes})
+                return {'group': group, 'status': 'updated', 'changes': changes}
             
-            return {
-                "status": "success" if updated_groups else "error",
-                "updated_groups": updated_groups,
-                "total_satellites": len(self.satellites),
-                "errors": errors,
-                "timestamp": current_time.isoformat()
-            }
+            error_msg = f"Failed to fetch {group}: HTTP {response.status_code}"
+        except Exception as e:
+            error_msg = f"Error fetching {group}: {str(e)}"
+        
+        logger.error("❌ TLE fetch failed", extra={'group': group, 'error': error_msg})
+        return {'group': group, 'status': 'error', 'error': error_msg}
     
-    def _parse_tle_data(self, tle_lines):
-        """Parse TLE data from text format"""
-        satellites = {}
-        
-        # Process TLE data (every 3 lines: name, line1, line2)
-        for i in range(0, len(tle_lines), 3):
-            if i + 2 < len(tle_lines):
-                try:
-                    name = tle_lines[i].strip()
-                    line1 = tle_lines[i + 1].strip()
-                    line2 = tle_lines[i + 2].strip()
-                    
-                    # Validate TLE lines
-                    if line1.startswith('1 ') and line2.startswith('2 '):
-                        satrec = Satrec.twoline2rv(line1, line2)
-                        
-                        # Extract NORAD ID
-                        norad_id = int(line1[2:7].strip())
-                        
-                        satellites[name] = {
-                            'satrec': satrec,
-                            'tle_line1': line1,
-                            'tle_line2': line2,
-                            'norad_id': norad_id,
-                            'name': name
-                        }
-                        
-                except Exception as e:
-                    print(f"⚠️  Failed to parse satellite {name}: {e}")
-                    continue
-        
-        return satellites
+    def _parse_tle_data(self, tle_lines, group=None):
+        """Parse TLE data from text format, reusing already-parsed NORAD IDs (the group's own first)"""
+        catalogue = self.catalogue
+        known = catalogue.by_norad()
+        if group in catalogue.groups:
+            known.update((record.norad_id, record) for record in catalogue.groups[group].records)
+        return parse_tle_lines(tle_lines, known=known)
     
     def get_satellite_list(self, group=None):
         """Get list of available satellites"""
+        catalogue = self.catalogue
+        freshness = self.get_group_freshness()
+        
         if group and group in self.satellite_groups:
+            group_snapshot = catalogue.groups.get(group)
+            names = group_snapshot.names if group_snapshot else []
             return {
                 'group': group,
                 'name': self.satellite_groups[group]['name'],
-                'satellites': list(self.satellite_groups[group]['satellites'].keys()),
-                'count': len(self.satellite_groups[group]['satellites'])
+                'satellites': list(names),
+                'count': len(names),
+                'freshness': freshness[group]
             }
         
         # Return all groups summary
         groups_summary = {}
         for group_key, group_data in self.satellite_groups.items():
+            group_snapshot = catalogue.groups.get(group_key)
+            names = group_snapshot.names if group_snapshot else []
             groups_summary[group_key] = {
                 'name': group_data['name'],
-                'count': len(group_data['satellites']),
-                'satellites': list(group_data['satellites'].keys())[:10]  # First 10 for preview
+                'count': len(names),
+                'satellites': names[:10],  # First 10 for preview
+                'freshness': freshness[group_key]
             }
         
         return {
-            'total_satellites': len(self.satellites),
+            'total_satellites': len(catalogue),
             'groups': groups_summary,
-            'last_update': self.last_tle_update.isoformat() if self.last_tle_update else None
+            'last_update': catalogue.last_update.isoformat() if catalogue.last_update else None,
+            'catalogue_version': catalogue.version
         }
     
     def get_position(self, satellite_name, timestamp=None):
-        """Get satellite position at given time"""
-        # Find the actual satellite name
-        actual_name = self.find_satellite_by_name(satellite_name)
-        if not actual_name:
-            print(f"❌ Satellite not found: {satellite_name}")
-            print(f"Available satellites: {list(self.satellites.keys())[:5]}...")
+        """Get satellite position at given time.
+        
+        Without a timestamp the position is for the start of the current cache
+        quantum ('timestamp'); 'requested_at' is when the request was served.
+        """
+        catalogue = self.catalogue
+        
+        # Find the actual satellite
+        record = catalogue.resolve(satellite_name)
+        if not record:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("❌ Satellite not found", extra={'satellite': satellite_name, 'available': catalogue.names[:5]})
             return None
         
-        if timestamp is None:
-            timestamp = datetime.utcnow()
-            
-        sat = self.satellites.get(actual_name)
-        if not sat:
+        requested_at = datetime.utcnow() if timestamp is None else timestamp
+        entry = self._position_entry(record, requested_at, quantize=timestamp is None)
+        if entry is None:
             return None
-            
-        jd, fr = jday(timestamp.year, timestamp.month, timestamp.day, 
-                     timestamp.hour, timestamp.minute, timestamp.second)
-        e, r, v = sat.sgp4(jd, fr)
+        return dict(entry['position'], requested_name=satellite_name, requested_at=requested_at.isoformat())
+    
+    def _position_entry(self, record, timestamp, quantize=False):
+        """Propagated state of a record: the position, the TEME vector and Julian date it came from.
+        
+        Quantized requests snap to the start of the cache quantum so polling
+        clients share one propagation, and concurrent misses on the same
+        quantum wait for a single one. Returns None on an SGP4 error.
+        """
+        if not quantize:
+            return self._propagate_entry(record, timestamp)
+        bucket, bucket_start = self.position_cache.quantize(timestamp)
+        return self.position_cache.get_or_compute(
+            record, bucket, lambda: self._propagate_entry(record, bucket_start)
+        )
+    
+    def _propagate_entry(self, record, timestamp):
+        actual_name = record.name
+        sat = record.satrec
+        
+        started = time.perf_counter()
+        with phase('propagate'):
+            jd, fr = julian_date(timestamp)
+            e, r, v = sat.sgp4(jd, fr)
         
         if e != 0:
-            print(f"SGP4 error {e} for {actual_name}")
+            observe_propagation('position', started, 1, [record.norad_id], [e])
+            logger.debug("SGP4 error", extra={'satellite': actual_name, 'norad_id': record.norad_id, 'code': e})
             return None
             
         # Convert to lat/lon/alt
         lat, lon, alt = self.eci_to_geodetic(r, timestamp)
+        observe_propagation('position', started, 1)
+        
+        return {
+            'position': {
+                'name': actual_name,  # Return actual name found
+                'latitude': math.degrees(lat),
+                'longitude': math.degrees(lon), 
+                'altitude': alt,
+                'velocity': math.sqrt(v[0]**2 + v[1]**2 + v[2]**2) if v else 0,
+                'timestamp': timestamp.isoformat()
+            },
+            'teme': r,
+            'jd': jd,
+            'fr': fr,
+            'illumination': None
+        }
+    
+    def get_orbit(self, satellite_name, start=None, span=7200, step=60):
+        """Get orbital track over a time grid as columnar arrays"""
+        record = self.catalogue.resolve(satellite_name)
+        if not record:
+            return None
+        
+        start = naive_utc(start) if start is not None else datetime.utcnow()
+        
+        actual_name = record.name
+        sat = record.satrec
+        jd, fr, offsets = time_grid(start, span, step)
+        
+        # Interpolate long tracks inside the ephemeris window, else one vectorized SGP4 call
+        started = time.perf_counter()
+        with phase('propagate'):
+            states = self.ephemeris.track(record, (start - UNIX_EPOCH).total_seconds() + offsets)
+            if states is not None:
+                r, v = states
+                e = np.zeros(len(offsets), dtype=np.uint8)
+            else:
+                e, r, v = sat.sgp4_array(jd, fr)
+        ok = e == 0
+        lat, lon, alt = teme_to_geodetic(r[ok], jd[ok], fr[ok])
+        observe_propagation('orbit_interpolated' if states is not None else 'orbit', started, len(e),
+                            np.full((~ok).sum(), record.norad_id), e[~ok])
         
         return {
-            'name': actual_name,  # Return actual name found
-            'requested_name': satellite_name,  # Original requested name
-            'latitude': math.degrees(lat),
-            'longitude': math.degrees(lon), 
+            'name': actual_name,
+            'requested_name': satellite_name,
+            'start': start.isoformat(),
+            'span': span,
+            'step': step,
+            'count': int(ok.sum()),
+            'timestamp': [(start + timedelta(seconds=offset)).isoformat() for offset in offsets[ok].tolist()],
+            'latitude': np.degrees(lat),
+            'longitude': np.degrees(lon),
             'altitude': alt,
-            'velocity': math.sqrt(v[0]**2 + v[1]**2 + v[2]**2) if v else 0,
-            'timestamp': timestamp.isoformat()
+            'velocity': np.linalg.norm(v[ok], axis=-1)
         }
     
-    def get_constellation_positions(self, group_name, max_satellites=50):
-        """Get positions for entire constellation"""
-        if group_name not in self.satellite_groups:
+    def get_tracking_table(self, satellite_name, station, start=None, duration=900, rate=1.0,
+                           frequency=None, min_elevation=None):
+        """Antenna pointing table over [start, start + duration) sampled at rate Hz, as columnar arrays.
+        
+        Azimuth/elevation (degrees), slant range (km) and range rate (km/s,
+        positive receding) from the station; with a carrier frequency (Hz)
+        also the Doppler shift and received frequency. Times are UTC Unix
+        seconds with sub-second resolution.
+        """
+        record = self.catalogue.resolve(satellite_name)
+        if not record:
             return None
         
-        satellites_data = self.satellite_groups[group_name]['satellites']
-        constellation = []
+        start = naive_utc(start) if start is not None else datetime.utcnow()
+        
+        jd, fr, offsets = time_grid(start, duration, 1.0 / rate)
+        times = (start - UNIX_EPOCH).total_seconds() + offsets
+        
+        started = time.perf_counter()
+        with phase('propagate'):
+            states = self.ephemeris.track(record, times)
+            if states is not None:
+                r, v = states
+                e = np.zeros(len(offsets), dtype=np.uint8)
+            else:
+                e, r, v = record.satrec.sgp4_array(jd, fr)
+        r_ecef, v_ecef = teme_to_ecef(r, v, jd, fr)
+        azimuth, elevation, slant_range = station.look_angles(r_ecef)
+        range_rate = station.range_rate(r_ecef, v_ecef)
+        observe_propagation('tracking_interpolated' if states is not None else 'tracking', started, len(e),
+                            np.full((e != 0).sum(), record.norad_id), e[e != 0])
         
-        # Limit number of satellites to avoid performance issues
-        sat_names = list(satellites_data.keys())[:max_satellites]
+        keep = e == 0
+        if min_elevation is not None:
+            keep &= elevation >= math.radians(min_elevation)
+        
+        table = {
+            'name': record.name,
+            'requested_name': satellite_name,
+            'norad_id': record.norad_id,
+            'station': {
+                'latitude': station.latitude,
+                'longitude': station.longitude,
+                'altitude': station.altitude
+            },
+            'start': start.isoformat(),
+            'duration': duration,
+            'rate': rate,
+            'frequency': frequency,
+            'count': int(keep.sum()),
+            'time': times[keep],
+            'azimuth': np.degrees(azimuth[keep]),
+            'elevation': np.degrees(elevation[keep]),
+            'range': slant_range[keep],
+            'range_rate': range_rate[keep]
+        }
+        if frequency:
+            table['doppler'] = doppler_shift(frequency, table['range_rate'])
+            table['received_frequency'] = frequency + table['doppler']
+        return table
+    
+    def get_positions(self, identifiers, timestamps=None, start=None, span=None, step=None):
+        """Positions of many satellites at many times (a timestamp list or start/span/step grid).
+        
+        Identifiers are resolved once; the satellites x times matrix is
+        propagated in one batched call and returned flattened satellite-major
+        as dense columns (NaN where SGP4 failed).
+        """
+        catalogue = self.catalogue
+        records = []
+        requested = []
+        missing = []
+        for identifier in identifiers:
+            record = catalogue.resolve(identifier)
+            if record is None:
+                missing.append(identifier)
+            else:
+                records.append(record)
+                requested.append(identifier)
+        
+        if timestamps is not None:
+            jd, fr = julian_dates(timestamps)
+        else:
+            jd, fr, offsets = time_grid(start, span, step)
+            timestamps = [start + timedelta(seconds=offset) for offset in offsets.tolist()]
+        
+        started = time.perf_counter()
+        with phase('propagate'):
+            engine = ConstellationEngine([record.name for record in records],
+                                         [record.norad_id for record in records],
+                                         [record.satrec for record in records])
+            columns = engine.positions_over(jd, fr)
+        failed_rows, failed_times = np.nonzero(columns['error_code'])
+        failed_codes = columns['error_code'][failed_rows, failed_times]
+        observe_propagation('bulk', started, columns['error_code'].size,
+                            engine.norad_ids[failed_rows], failed_codes)
+        
+        timestamps = [timestamp.isoformat() for timestamp in timestamps]
+        positions = {
+            'satellites': len(records),
+            'times': len(timestamps),
+            'count': len(records) * len(timestamps),
+            'layout': 'satellite-major',
+            'name': engine.names,
+            'requested_name': requested,
+            'norad_id': engine.norad_ids,
+            'timestamp': timestamps,
+            'missing': missing,
+            'errors': [
+                {
+                    'requested_name': requested[row],
+                    'norad_id': int(engine.norad_ids[row]),
+                    'timestamp': timestamps[column],
+                    'code': int(code),
+                    'message': SGP4_ERROR_MESSAGES.get(int(code), 'unknown SGP4 error')
+                }
+                for row, column, code in zip(failed_rows.tolist(), failed_times.tolist(), failed_codes.tolist())
+            ]
+        }
+        for field in ('latitude', 'longitude', 'altitude', 'velocity', 'error_code'):
+            positions[field] = columns[field].reshape(-1)
+        return positions
+    
+    def get_constellation_positions(self, group_name, max_satellites=None, layout='rows'):
+        """Get positions for entire constellation (a list of dicts, or one array per field)"""
+        if group_name not in self.satellite_groups:
+            return None
         
         current_time = datetime.utcnow()
+        timestamp = current_time.isoformat()
+        constellation = []
         
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_name = {
-                executor.submit(self.get_position, name, current_time): name 
-                for name in sat_names
+        group = self.catalogue.groups.get(group_name)
+        if layout == 'columns':
+            snapshot = self._constellation_snapshot(group, current_time, max_satellites) if group else None
+            columns = {
+                'group': group_name,
+                'group_name': self.satellite_groups[group_name]['name'],
+                'timestamp': timestamp,
+                'count': len(snapshot['index']) if snapshot else 0,
+                'name': [group.engine.names[i] for i in snapshot['index'].tolist()] if snapshot else []
             }
-            
-            for future in future_to_name:
-                sat_name = future_to_name[future]
-                try:
-                    position = future.result(timeout=5)
-                    if position:
-                        position['name'] = sat_name
-                        position['norad_id'] = satellites_data[sat_name]['norad_id']
-                        constellation.append(position)
-                except Exception as e:
-                    print(f"Error getting position for {sat_name}: {e}")
+            for field in ('norad_id', 'latitude', 'longitude', 'altitude', 'velocity'):
+                columns[field] = snapshot[field] if snapshot else np.empty(0)
+            return columns
+        
+        if group:
+            engine = group.engine
+            # Propagate the whole group in a single vectorized SGP4 call
+            snapshot = self._constellation_snapshot(group, current_time, max_satellites)
+            names = engine.names
+            for i, norad_id, lat, lon, alt, vel in zip(
+                snapshot['index'].tolist(), snapshot['norad_id'].tolist(),
+                snapshot['latitude'].tolist(), snapshot['longitude'].tolist(),
+                snapshot['altitude'].tolist(), snapshot['velocity'].tolist()
+            ):
+                constellation.append({
+                    'name': names[i],
+                    'requested_name': names[i],
+                    'latitude': lat,
+                    'longitude': lon,
+                    'altitude': alt,
+                    'velocity': vel,
+                    'timestamp': timestamp,
+                    'norad_id': norad_id
+                })
         
         return {
             'group': group_name,
             'group_name': self.satellite_groups[group_name]['name'],
             'satellites': constellation,
             'count': len(constellation),
-            'timestamp': current_time.isoformat()
+            'timestamp': timestamp
+        }
+    
+    def _constellation_snapshot(self, group, timestamp, limit):
+        started = time.perf_counter()
+        kind = 'constellation_interpolated'
+        with phase('propagate'):
+            snapshot = self.ephemeris.positions_at(group, timestamp, limit)
+            if snapshot is None:
+                kind = 'constellation'
+                snapshot = group.engine.positions_at(timestamp, limit=limit)
+        observe_propagation(kind, started, len(snapshot['index']) + len(snapshot['error_code']),
+                            snapshot['error_norad_id'], snapshot['error_code'])
+        return snapshot
+    
+    def get_passes(self, station, satellite_name=None, group_name=None, start=None,
+                   days=1.0, min_elevation=10.0):
+        """Predict passes over a ground station for one satellite or a whole group"""
+        catalogue = self.catalogue
+        if satellite_name:
+            record = catalogue.resolve(satellite_name)
+            if not record:
+                return None
+            records = [record]
+        else:
+            if group_name not in self.satellite_groups:
+                return None
+            group = catalogue.groups.get(group_name)
+            records = list(group.records) if group else []
+        
+        if start is None:
+            start = datetime.utcnow()
+        
+        predictor = PassPredictor(station, min_elevation)
+        started = time.perf_counter()
+        with phase('propagate'):
+            passes = predictor.predict(records, start, days * 86400.0)
+        observe_propagation('passes', started, 0)
+        
+        return {
+            'station': {
+                'latitude': station.latitude,
+                'longitude': station.longitude,
+                'altitude': station.altitude
+            },
+            'min_elevation': min_elevation,
+            'start': start.isoformat(),
+            'end': (start + timedelta(days=days)).isoformat(),
+            'satellites_searched': len(records),
+            'count': len(passes),
+            'passes': passes
         }
     
     def eci_to_geodetic(self, position, timestamp):
-        """Convert ECI coordinates to lat/lon/alt"""
-        x, y, z = position
-        R_EARTH = 6371.0
+        """Convert TEME coordinates to WGS84 lat/lon (radians) and altitude (km)"""
+        jd, fr = julian_date(timestamp)
+        lat, lon, alt = teme_to_geodetic(np.asarray(position), jd, fr)
+        return float(lat), float(lon), float(alt)
+    
+    def get_conjunction_pool(self):
+        """The process pool shared by all screenings, started on first use (None with one worker).
+        
+        Spawned workers do not inherit the server's threads or locks.
+        """
+        if CONJUNCTION_WORKERS <= 1:
+            return None
+        with self.conjunction_pool_lock:
+            if self.conjunction_pool is None:
+                self.conjunction_pool = ProcessPoolExecutor(
+                    CONJUNCTION_WORKERS, mp_context=multiprocessing.get_context('spawn')
+                )
+                _conjunction_pools.add(self.conjunction_pool)
+            return self.conjunction_pool
+    
+    def close(self):
+        """Shut down the conjunction worker processes; the next screening starts new ones"""
+        with self.conjunction_pool_lock:
+            pool, self.conjunction_pool = self.conjunction_pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    
+    def get_conjunctions(self, satellite_name=None, group_name=None, start=None,
+                         hours=24.0, threshold=5.0, step=30.0, max_objects=None):
+        """Screen for close approaches to one satellite, or among all objects, in a group or the catalogue
         
-        altitude = math.sqrt(x*x + y*y + z*z) - R_EARTH
-        latitude = math.atan2(z, math.sqrt(x*x + y*y))
-        longitude = math.atan2(y, x)
+        Raises ValueError when more than max_objects would be screened.
+        """
+        catalogue = self.catalogue
+        primaries = None
+        if satellite_name:
+            record = catalogue.resolve(satellite_name)
+            if not record:
+                return None
+            primaries = [record]
         
-        return latitude, longitude, altitude
+        if group_name:
+            if group_name not in self.satellite_groups:
+                return None
+            group = catalogue.groups.get(group_name)
+            records = list(group.records) if group else []
+        else:
+            records = list(catalogue.records)
+        
+        if start is None:
+            start = datetime.utcnow()
+        
+        screener = ConjunctionScreener(threshold, step, CONJUNCTION_WORKERS, self.get_conjunction_pool())
+        started = time.perf_counter()
+        with phase('propagate'):
+            result = screener.screen(records, start, hours * 3600.0, primaries, max_objects)
+        observe_propagation('conjunctions', started, 0)
+        
+        return {
+            'satellite': primaries[0].name if primaries else None,
+            'group': group_name,
+            'start': start.isoformat(),
+            'end': (start + timedelta(hours=hours)).isoformat(),
+            'threshold': threshold,
+            'step': step,
+            'screened': result['screened'],
+            'candidates': result['candidates'],
+            'count': len(result['events']),
+            'conjunctions': result['events']
+        }
+    
+    def get_constellation_illumination(self, group_name, start=None, hours=2.0, step=30.0, max_satellites=None):
+        """Sunlit/penumbra/umbra state of a group at start and its eclipse entry/exit times over the window"""
+        if group_name not in self.satellite_groups:
+            return None
+        
+        if start is None:
+            start = datetime.utcnow()
+        
+        group = self.catalogue.groups.get(group_name)
+        records = list(group.records)[:max_satellites] if group else []
+        started = time.perf_counter()
+        with phase('propagate'):
+            result = constellation_illumination(records, start, hours * 3600.0, step)
+        failed = result['error_code'] != 0
+        observe_propagation('illumination', started, result['states'],
+                            np.array([record.norad_id for record in records])[failed], result['error_code'][failed])
+        
+        sun = result['sun']
+        return {
+            'group': group_name,
+            'group_name': self.satellite_groups[group_name]['name'],
+            'start': start.isoformat(),
+            'end': (start + timedelta(hours=hours)).isoformat(),
+            'step': step,
+            'sun_right_ascension': math.degrees(math.atan2(sun[1], sun[0])) % 360,
+            'sun_declination': math.degrees(math.asin(sun[2] / np.linalg.norm(sun))),
+            'count': len(records),
+            'name': [record.name for record in records],
+            'norad_id': np.array([record.norad_id for record in records], dtype=np.int64),
+            'illumination': result['illumination'],
+            'state': illumination_state(result['illumination']),
+            'eclipse_entry': result['eclipse_entry'],
+            'eclipse_exit': result['eclipse_exit']
+        }
     
     def get_telemetry(self, satellite_name):
         """Get realistic telemetry data for satellite"""
-        position = self.get_position(satellite_name)
-        if position:
-            return self.telemetry_simulator.simulate_realistic_telemetry(position)
-        return None
+        record = self.catalogue.resolve(satellite_name)
+        if not record:
+            return None
+        bucket, bucket_start = self.position_cache.quantize(datetime.utcnow())
+        entry = self.position_cache.get_or_compute(
+            record, bucket, lambda: self._propagate_entry(record, bucket_start)
+        )
+        if entry is None:
+            return None
+        
+        with phase('telemetry'):
+            # Shadow from the same propagation as the position, computed once per quantum.
+            # Cached entries are shared between threads, so a copy carrying it replaces the entry.
+            illumination = entry['illumination']
+            if illumination is None:
+                illumination = float(
+                    illuminated_fraction(np.asarray(entry['teme']), sun_position(entry['jd'], entry['fr'])))
+                self.position_cache.put(record, bucket, dict(entry, illumination=illumination))
+            position = dict(entry['position'], requested_name=satellite_name)
+            return self.telemetry_simulator.simulate_realistic_telemetry(position, illumination)
 
-# Initialize multi-satellite tracker
-tracker = MultiSatelliteTracker()
+    def get_telemetry_history(self, satellite_name, start, end, points=None, method='mean'):
+        """Stored telemetry between two times as columnar arrays, optionally downsampled"""
+        record = self.catalogue.resolve(satellite_name)
+        if not record:
+            return None
+        
+        def sampler(times, rng):
+            started = time.perf_counter()
+            jd = np.full(len(times), JD_UNIX_EPOCH)
+            fr = times / 86400.0
+            with phase('propagate'):
+                e, r, _ = record.satrec.sgp4_array(jd, fr)
+            lat, lon, alt = teme_to_geodetic(r, jd, fr)
+            observe_propagation('telemetry', started, len(e), np.full((e != 0).sum(), record.norad_id), e[e != 0])
+            with phase('telemetry'):
+                illumination = illuminated_fraction(r, sun_position(jd, fr))
+                telemetry = self.telemetry_simulator.simulate_telemetry_batch(
+                    np.degrees(lat), np.degrees(lon), alt, illumination, rng=rng
+                )
+            for values in telemetry.values():
+                values[e != 0] = np.nan
+            return telemetry
+        
+        # Samples are generated once per grid time and then read back, so repeated queries agree
+        times, values = self.telemetry_store.read(
+            record.norad_id, (start - UNIX_EPOCH).total_seconds(), (end - UNIX_EPOCH).total_seconds(), sampler
+        )
+        sample_count = len(times)
+        times, values, extremes = downsample(times, values, points, method)
+        
+        history = {
+            'name': record.name,
+            'requested_name': satellite_name,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'resolution': self.telemetry_store.resolution,
+            'method': method if len(times) < sample_count else 'raw',
+            'count': len(times),
+            'timestamp': [(UNIX_EPOCH + timedelta(seconds=t)).isoformat() for t in times.tolist()]
+        }
+        for i, field in enumerate(self.telemetry_store.fields):
+            history[field] = values[:, i]
+            if extremes is not None:
+                history[f'{field}_min'] = extremes[0][:, i]
+                history[f'{field}_max'] = extremes[1][:, i]
+        return history
 
-# Load initial satellite data
-print("🚀 Initializing Ground Station with live TLE data...")
-initial_load = tracker.fetch_live_tle_data('space_stations', force_update=True)
-print(f"📡 Initial load result: {initial_load}")
+class GroundStationService:
+    """Lazily built tracker and stream hub, plus the background TLE work for one process.
+    
+    Building the tracker is local work only: the on-disk TLE cache, or the
+    shared catalogue file in reader mode. The network is touched only by the
+    background thread started with start_background(), which in
+    standalone and updater mode warms up and refreshes the TLE data (the
+    updater also publishes the shared catalogue and serves queued refresh
+    requests) and in reader mode remaps the shared catalogue when the updater
+    replaces it.
+    """
+    
+    def __init__(self, refresh_interval=TLE_REFRESH_INTERVAL, warmup_groups=WARMUP_GROUPS,
+                 mode=CATALOGUE_MODE, shared_path=SHARED_CATALOGUE_PATH):
+        if mode not in ('standalone', 'updater', 'reader'):
+            raise ValueError(f'Unknown catalogue mode {mode} (use standalone, updater or reader)')
+        self.mode = mode
+        self.refresh_interval = refresh_interval
+        self.warmup_groups = list(warmup_groups)
+        self.shared = SharedCatalogue(shared_path or os.path.join(TLE_CACHE_DIR, 'catalogue.bin')) \
+            if mode != 'standalone' else None
+        self.published_version = None
+        self.lock = threading.Lock()
+        self._tracker = None
+        self._stream_hub = None
+        self.cache_load = None
+        self.background_thread = None
+        self.warmup_result = None
+        self.warmed_up = threading.Event()
+        self.stopping = threading.Event()
+    
+    @property
+    def tracker(self):
+        if self._tracker is None:
+            with self.lock:
+                if self._tracker is None:
+                    self._build()
+        return self._tracker
+    
+    @property
+    def stream_hub(self):
+        self.tracker
+        return self._stream_hub
+    
+    def _build(self):
+        started = time.perf_counter()
+        tracker = MultiSatelliteTracker(refresh_interval=self.refresh_interval)
+        if self.mode == 'reader':
+            logger.info("🚀 Attaching to the shared catalogue...", extra={'path': self.shared.path})
+            self.cache_load = self._attach(tracker) or {'status': 'empty', 'total_satellites': 0}
+        else:
+            # Start instantly from the on-disk TLE cache; revalidation happens in the background
+            logger.info("🚀 Initializing Ground Station from cached TLE data...")
+            self.cache_load = tracker.load_cached_tle_data()
+            if self.mode == 'updater':
+                self._publish(tracker)
+        self.cache_load['seconds'] = time.perf_counter() - started
+        logger.info("📡 Initial load", extra=self.cache_load)
+        
+        self._stream_hub = StreamHub(tracker, STREAM_TICK, STREAM_QUEUE_SIZE)
+        self._tracker = tracker
+    
+    def _attach(self, tracker):
+        """Map the shared catalogue if the updater replaced it; returns a load summary or None"""
+        if not self.shared.changed():
+            return None
+        view = self.shared.attach()
+        if view is None:
+            return None
+        changes = tracker.load_shared_catalogue(view)
+        total = len(tracker.catalogue)
+        logger.info("📥 Mapped shared catalogue", extra={'published_version': view.version, 'satellites': total, **changes})
+        return {'status': 'shared', 'published_version': view.version, 'total_satellites': total, 'changes': changes}
+    
+    def _publish(self, tracker):
+        catalogue = tracker.catalogue
+        if catalogue.version != self.published_version and len(catalogue):
+            self.shared.publish(catalogue)
+            self.published_version = catalogue.version
+            logger.info("📤 Published shared catalogue", extra={'version': catalogue.version, 'satellites': len(catalogue)})
+    
+    def request_refresh(self, group=None, force=False):
+        """Queue a TLE refresh for the updater process (reader mode only)"""
+        self.shared.request_refresh(group, force)
+    
+    def start_background(self):
+        """Start the warm-up/refresh loop, or the shared catalogue watcher in reader mode (once)"""
+        with self.lock:
+            if self.background_thread is not None:
+                return self.background_thread
+            self.stopping.clear()
+            target = self._watch if self.mode == 'reader' else self._background
+            self.background_thread = threading.Thread(target=target, name='tle-refresh', daemon=True)
+            self.background_thread.start()
+            return self.background_thread
+    
+    def stop_background(self, timeout=None):
+        self.stopping.set()
+        thread = self.background_thread
+        if thread is not None:
+            thread.join(timeout)
+        self.background_thread = None
+        if self._tracker is not None:
+            self._tracker.ephemeris.stop(timeout)
+            self._tracker.close()
+        if self._stream_hub is not None:
+            self._stream_hub.stop(timeout)
+    
+    def _start_ephemeris(self, tracker):
+        if EPHEMERIS_ENABLED:
+            tracker.ephemeris.start(lambda: tracker.catalogue)
+    
+    def _background(self):
+        tracker = self.tracker
+        self._start_ephemeris(tracker)
+        try:
+            # Revalidate the warm-up groups that the disk cache left missing or stale
+            logger.info("🔥 Warming up TLE data", extra={'groups': ','.join(self.warmup_groups)})
+            results = [tracker.fetch_live_tle_data(group) for group in self.warmup_groups]
+            self.warmup_result = {
+                'status': 'error' if any(result['status'] == 'error' for result in results) else 'success',
+                'groups': dict(zip(self.warmup_groups, (result['status'] for result in results)))
+            }
+            if self.mode == 'updater':
+                self._publish(tracker)
+        except Exception:
+            logger.exception("❌ TLE warm-up failed")
+            self.warmup_result = {'status': 'error'}
+        finally:
+            self.warmed_up.set()
+        
+        # The updater wakes often to serve refresh requests queued by the workers
+        wait = SHARED_CATALOGUE_POLL if self.mode == 'updater' else self.refresh_interval
+        next_refresh = time.monotonic() + self.refresh_interval
+        while not self.stopping.wait(wait):
+            try:
+                if time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + self.refresh_interval
+                    logger.info("🔄 Running background TLE update...")
+                    tracker.fetch_live_tle_data(force_update=True)
+                if self.mode == 'updater':
+                    for group, force in self.shared.take_requests():
+                        tracker.fetch_live_tle_data(group, force_update=force)
+                    self._publish(tracker)
+            except Exception:
+                logger.exception("❌ Background TLE update failed")
+    
+    def _watch(self):
+        tracker = self.tracker
+        self._start_ephemeris(tracker)
+        self.warmed_up.set()
+        while not self.stopping.wait(SHARED_CATALOGUE_POLL):
+            try:
+                self._attach(tracker)
+            except Exception:
+                logger.exception("❌ Mapping the shared catalogue failed")
+    
+    def readiness(self):
+        """Ready once the catalogue holds satellites, from the disk cache, warm-up or shared file"""
+        tracker = self.tracker
+        background = self.background_thread
+        readiness = {
+            'ready': len(tracker.catalogue) > 0,
+            'mode': self.mode,
+            'satellites_loaded': len(tracker.catalogue),
+            'groups_loaded': sorted(tracker.catalogue.groups),
+            'cache_load': self.cache_load,
+            'background_running': background is not None and background.is_alive(),
+            'warmup_complete': self.warmed_up.is_set(),
+            'warmup': self.warmup_result,
+            'refresh_interval_seconds': self.refresh_interval
+        }
+        if self.shared:
+            readiness['shared_catalogue'] = self.shared.stats()
+            readiness['shared_catalogue']['published_version'] = self.published_version
+        return readiness
 
-# Find and print ISS name for debugging
-iss_names = [name for name in tracker.satellites.keys() if 'ISS' in name.upper()]
-if iss_names:
-    print(f"🛰️ ISS found as: {iss_names[0]}")
-else:
-    print("❌ ISS not found in loaded satellites")
+@metrics.collector
+def collect_state(service):
+    """Copy catalogue, cache and stream statistics into their metrics at scrape time"""
+    tracker = service.tracker
+    stream_hub = service.stream_hub
+    catalogue = tracker.catalogue
+    CATALOGUE_SATELLITES.set(len(catalogue))
+    CATALOGUE_VERSION.set(catalogue.version)
+    for group, freshness in tracker.get_group_freshness().items():
+        GROUP_SATELLITES.set(freshness['count'], group=group)
+        if freshness['age_seconds'] is not None:
+            GROUP_AGE_SECONDS.set(freshness['age_seconds'], group=group)
+    
+    cache = tracker.position_cache.stats()
+    POSITION_CACHE_LOOKUPS.set_total(cache['hits'], result='hit')
+    POSITION_CACHE_LOOKUPS.set_total(cache['misses'], result='miss')
+    POSITION_CACHE_LOOKUPS.set_total(cache['coalesced'], result='coalesced')
+    POSITION_CACHE_EVICTIONS.set_total(cache['evictions'])
+    POSITION_CACHE_ENTRIES.set(cache['entries'])
+    POSITION_CACHE_HIT_RATIO.set(cache['hit_ratio'] or 0.0)
+    
+    TELEMETRY_STORE_SAMPLES.set(tracker.telemetry_store.stats()['samples'])
+    ephemeris = tracker.ephemeris.stats()
+    EPHEMERIS_BUILDS.set_total(ephemeris['builds'])
+    if 'bytes' in ephemeris:
+        EPHEMERIS_BYTES.set(ephemeris['bytes'])
+        EPHEMERIS_SATELLITES.set(ephemeris['interpolated_satellites'], path='interpolated')
+        EPHEMERIS_SATELLITES.set(ephemeris['satellites'] - ephemeris['interpolated_satellites'], path='direct')
+        EPHEMERIS_ERROR_KM.set(ephemeris['max_error_km'])
+    stream = stream_hub.stats()
+    STREAM_SUBSCRIBERS.set(stream['subscribers'])
+    STREAM_FRAMES.set_total(stream['frames_sent'], result='sent')
+    STREAM_FRAMES.set_total(stream['frames_dropped'], result='dropped')
 
 # API Routes
-@app.route('/')
+api = Blueprint('api', __name__)
+
+def get_service():
+    """The GroundStationService of the application handling the current request"""
+    return current_app.extensions['ground_station']
+
+def get_profiles():
+    """The application's ProfileStore, or None unless app.config['PROFILING_ENABLED'] is set"""
+    if not current_app.config.get('PROFILING_ENABLED'):
+        return None
+    return current_app.extensions['profiles']
+
+MAX_ORBIT_POINTS = 100000
+MAX_BULK_SATELLITES = 1000
+MAX_BULK_STATES = 1000000  # satellites x times per bulk position request
+# Sputnik 1 to the end of the two-digit epoch years TLEs can express
+BULK_TIME_RANGE = (datetime(1957, 10, 4), datetime(2057, 1, 1))
+MAX_PASS_DAYS = 14
+MAX_CONJUNCTION_HOURS = 72
+MAX_CONJUNCTION_THRESHOLD = 100  # km
+MAX_CONJUNCTION_OBJECTS = int(os.environ.get('MAX_CONJUNCTION_OBJECTS', 20000))  # objects per screening
+MAX_ILLUMINATION_HOURS = 24
+MAX_TRACKING_RATE = 20  # Hz
+MAX_TRACKING_SAMPLES = 100000
+
+def parse_start_time(value):
+    """Parse an optional ISO 8601 time as naive UTC; offsets are converted, a missing one means UTC.
+    
+    Raises ValueError for anything that is not an ISO 8601 string.
+    """
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f'expected an ISO 8601 string, got {value!r}')
+    return naive_utc(datetime.fromisoformat(value.strip().replace('Z', '+00:00')))
+
+def bulk_response(payload, fmt=None, filename=None):
+    """Encode a columnar payload per ?format= or Accept, ?precision= and Accept-Encoding.
+    
+    With a filename the body is sent as an attachment named after it and the format.
+    """
+    fmt = fmt or negotiate_format(request.args.get('format'), request.accept_mimetypes)
+    precision = request.args.get('precision', type=int)
+    
+    with phase('serialize'):
+        body, mimetype = encode(round_columns(payload, precision), fmt)
+        body, content_encoding = compress(body, request.accept_encodings)
+    
+    response = Response(body, mimetype=mimetype)
+    if content_encoding:
+        response.headers['Content-Encoding'] = content_encoding
+    if filename:
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{EXTENSIONS[fmt]}"'
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
+
+@api.app_errorhandler(UnsupportedFormat)
+def unsupported_format(error):
+    return jsonify({'error': str(error)}), 406
+
+@api.route('/')
 def home():
+    tracker = get_service().tracker
     return jsonify({
         'message': 'Advanced Multi-Satellite Ground Station API',
-        'total_satellites': len(tracker.satellites),
+        'total_satellites': len(tracker.catalogue),
         'satellite_groups': len(tracker.satellite_groups),
         'last_tle_update': tracker.last_tle_update.isoformat() if tracker.last_tle_update else None,
         'endpoints': {
             'satellite_groups': '/api/satellites/groups',
             'constellation': '/api/constellation/<group_name>',
+            'illumination': '/api/constellation/<group_name>/illumination?hours=<h>&step=<seconds>',
             'satellite_position': '/api/satellite/<name>/position',
+            'bulk_positions': 'POST /api/positions {satellites, timestamps | start, stop, step}',
             'satellite_telemetry': '/api/satellite/<name>/telemetry',
             'satellite_orbit': '/api/satellite/<name>/orbit',
+            'satellite_tracking': '/api/satellite/<name>/tracking?lat=<deg>&lon=<deg>&rate=<Hz>&frequency=<Hz>',
             'historical_telemetry': '/api/satellite/<name>/telemetry/historical',
+            'passes': '/api/passes?lat=<deg>&lon=<deg>&satellite=<name>|group=<group>',
+            'conjunctions': '/api/conjunctions?satellite=<name>&group=<group>&threshold=<km>&hours=<h>',
             'update_tle': '/api/tle/update',
             'debug': '/api/debug/satellites',
-            'health': '/api/health'
+            'slow_requests': '/api/debug/slow-requests',
+            'profiles': '/api/debug/profiles (send X-Profile: pstats|collapsed with PROFILING_ENABLED=1)',
+            'stream': '/api/stream?satellites=<name,...>&groups=<group,...>&interval=<seconds>',
+            'health': '/api/health',
+            'ready': '/api/ready',
+            'metrics': '/api/metrics'
         }
     })
 
-@app.route('/api/satellites/groups')
+@api.before_app_request
+def start_background_on_first_request():
+    """Start the warm-up/refresh thread from the serving process when the app was built without it"""
+    service = get_service()
+    if (current_app.config.get('START_BACKGROUND_ON_REQUEST') and service.background_thread is None
+            and not service.stopping.is_set()):
+        service.start_background()
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    begin_request()
+    
+    # Only explicit values count: "0", "false" or a typo leave the request unprofiled
+    mode = PROFILE_MODES.get(request.headers.get(PROFILE_HEADER, '').strip().lower())
+    if mode is not None and get_profiles() is not None:
+        profiler = RequestProfiler(mode)
+        if not profiler.start():
+            return jsonify({'error': 'Another request is being profiled; retry shortly'}), 409
+        g.profiler = profiler
+
+@api.after_app_request
+def record_request_duration(response):
+    profile_id = None
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profile_id = get_profiles().put(profiler.mode, profiler.stop(), method=request.method,
+                                        path=request.full_path.rstrip('?'), scope=profiler.scope)
+        response.headers['X-Profile-Id'] = profile_id
+        response.headers['X-Profile-Scope'] = profiler.scope
+    
+    recorder = end_request()
+    started = g.pop('request_started', None)
+    if started is not None:
+        duration = time.perf_counter() - started
+        # Label by route template so /api/satellite/<name>/... stays one series
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(duration, route=route, method=request.method, status=response.status_code)
+        
+        phases = dict.fromkeys(PHASES, 0.0)
+        if recorder is not None:
+            phases.update(recorder.totals)
+        phases['other'] = max(0.0, duration - sum(phases.values()))
+        for name, seconds in phases.items():
+            if seconds:
+                REQUEST_PHASE_SECONDS.observe(seconds, phase=name)
+        slow_requests.maybe_record(duration, method=request.method, path=request.full_path.rstrip('?'), route=route,
+                                   status=response.status_code, phases=phases, profile_id=profile_id)
+    return response
+
+@api.teardown_app_request
+def release_request_profiler(exc):
+    # Normally consumed by record_request_duration; this frees the profiler if that never ran
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+
+@api.route('/api/metrics')
+def get_metrics():
+    """Prometheus text exposition of request, propagation, fetch and cache metrics"""
+    return Response(metrics.render(get_service()), content_type=metrics.content_type)
+
+@api.route('/api/satellites/groups')
 def get_satellite_groups():
     """Get all satellite groups and their satellites"""
+    tracker = get_service().tracker
     group = request.args.get('group')
     return jsonify(tracker.get_satellite_list(group))
 
-@app.route('/api/constellation/<group_name>')
+@api.route('/api/constellation/<group_name>')
 def get_constellation(group_name):
-    """Get all satellites in a constellation"""
-    max_sats = request.args.get('max', 50, type=int)
-    constellation = tracker.get_constellation_positions(group_name, max_sats)
+    """Get all satellites in a constellation (layout=rows|columns, format=json|msgpack|arrow)"""
+    tracker = get_service().tracker
+    max_sats = request.args.get('max', type=int)
+    if 'max' in request.args and (max_sats is None or max_sats < 1):
+        return jsonify({'error': 'max must be a positive integer'}), 400
+    fmt = negotiate_format(request.args.get('format'), request.accept_mimetypes)
+    # Binary formats are always columnar; JSON keeps the row layout unless asked
+    layout = request.args.get('layout', 'rows' if fmt == 'json' else 'columns')
+    if layout not in ('rows', 'columns'):
+        return jsonify({'error': f'Unknown layout {layout} (use rows or columns)'}), 400
     
+    constellation = tracker.get_constellation_positions(group_name, max_sats, layout)
     if constellation:
-        return jsonify(constellation)
+        return bulk_response(constellation, fmt)
     return jsonify({'error': f'Constellation {group_name} not found'}), 404
 
-@app.route('/api/satellite/<satellite_name>/position')
+@api.route('/api/constellation/<group_name>/illumination')
+def get_constellation_illumination(group_name):
+    """Sunlight state of a constellation now (or at start) and eclipse entry/exit times over the next hours"""
+    tracker = get_service().tracker
+    max_sats = request.args.get('max', type=int)
+    hours = request.args.get('hours', 2.0, type=float)
+    step = request.args.get('step', 30.0, type=float)
+    
+    if 'max' in request.args and (max_sats is None or max_sats < 1):
+        return jsonify({'error': 'max must be a positive integer'}), 400
+    if not 0 < hours <= MAX_ILLUMINATION_HOURS:
+        return jsonify({'error': f'hours must be between 0 and {MAX_ILLUMINATION_HOURS}'}), 400
+    if not 1 <= step <= 300:
+        return jsonify({'error': 'step must be between 1 and 300 seconds'}), 400
+    
+    try:
+        start_time = parse_start_time(request.args.get('start'))
+    except ValueError:
+        return jsonify({'error': f"Invalid start time: {request.args.get('start')}"}), 400
+    
+    illumination = tracker.get_constellation_illumination(group_name, start_time, hours, step, max_sats)
+    if illumination is None:
+        return jsonify({'error': f'Constellation {group_name} not found'}), 404
+    return bulk_response(illumination)
+
+@api.route('/api/stream')
+def stream_positions():
+    """Server-sent position frames for followed satellites and groups"""
+    service = get_service()
+    tracker = service.tracker
+    stream_hub = service.stream_hub
+    names = [name for name in request.args.get('satellites', '').split(',') if name.strip()]
+    groups = [key for key in request.args.get('groups', '').split(',') if key.strip()]
+    interval = request.args.get('interval', STREAM_TICK, type=float)
+    
+    if not names and not groups:
+        return jsonify({'error': 'Provide satellites and/or groups to follow'}), 400
+    if len(names) > STREAM_MAX_SATELLITES:
+        return jsonify({'error': f'Too many satellites (max {STREAM_MAX_SATELLITES})'}), 400
+    unknown_groups = [key for key in groups if key not in tracker.satellite_groups]
+    if unknown_groups:
+        return jsonify({'error': f'Unknown groups: {", ".join(unknown_groups)}'}), 404
+    
+    # Resolve once; frames are keyed by NORAD ID so TLE refreshes are picked up
+    norad_ids = []
+    for name in names:
+        record = tracker.catalogue.resolve(name)
+        if not record:
+            return jsonify({'error': f'Satellite {name} not found'}), 404
+        norad_ids.append(record.norad_id)
+    
+    subscriber = stream_hub.subscribe(norad_ids, groups, max(interval, STREAM_TICK))
+    
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while not subscriber.closed:
+                frame = subscriber.next_frame(STREAM_KEEPALIVE)
+                yield f'event: positions\ndata: {frame}\n\n' if frame else ': keepalive\n\n'
+        finally:
+            stream_hub.unsubscribe(subscriber)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@api.route('/api/passes')
+def get_passes():
+    """Predict passes over a ground station (lat/lon in degrees, alt in km)"""
+    tracker = get_service().tracker
+    latitude = request.args.get('lat', type=float)
+    longitude = request.args.get('lon', type=float)
+    altitude = request.args.get('alt', 0.0, type=float)
+    min_elevation = request.args.get('min_elevation', 10.0, type=float)
+    days = request.args.get('days', 1.0, type=float)
+    satellite_name = request.args.get('satellite')
+    group_name = request.args.get('group')
+    
+    if latitude is None or longitude is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 360:
+        return jsonify({'error': 'lat/lon out of range'}), 400
+    if not math.isfinite(altitude):
+        return jsonify({'error': 'alt must be a number of km'}), 400
+    if not -90 <= min_elevation <= 90:
+        return jsonify({'error': 'min_elevation must be between -90 and 90 degrees'}), 400
+    if not 0 < days <= MAX_PASS_DAYS:
+        return jsonify({'error': f'days must be between 0 and {MAX_PASS_DAYS}'}), 400
+    if not satellite_name and not group_name:
+        return jsonify({'error': 'Specify a satellite or a group'}), 400
+    
+    try:
+        start_time = parse_start_time(request.args.get('start'))
+    except ValueError:
+        return jsonify({'error': f"Invalid start time: {request.args.get('start')}"}), 400
+    
+    station = GroundStation(latitude, longitude, altitude)
+    result = tracker.get_passes(station, satellite_name, group_name, start_time, days, min_elevation)
+    if result is None:
+        return jsonify({'error': f'Satellite or group {satellite_name or group_name} not found'}), 404
+    return jsonify(result)
+
+@api.route('/api/conjunctions')
+def get_conjunctions():
+    """Screen for close approaches (threshold in km, hours ahead, step in seconds)"""
+    tracker = get_service().tracker
+    satellite_name = request.args.get('satellite')
+    group_name = request.args.get('group')
+    threshold = request.args.get('threshold', 5.0, type=float)
+    hours = request.args.get('hours', 24.0, type=float)
+    step = request.args.get('step', 30.0, type=float)
+    
+    if not 0 < threshold <= MAX_CONJUNCTION_THRESHOLD:
+        return jsonify({'error': f'threshold must be between 0 and {MAX_CONJUNCTION_THRESHOLD} km'}), 400
+    if not 0 < hours <= MAX_CONJUNCTION_HOURS:
+        return jsonify({'error': f'hours must be between 0 and {MAX_CONJUNCTION_HOURS}'}), 400
+    if not 1 <= step <= 300:
+        return jsonify({'error': 'step must be between 1 and 300 seconds'}), 400
+    
+    try:
+        start_time = parse_start_time(request.args.get('start'))
+    except ValueError:
+        return jsonify({'error': f"Invalid start time: {request.args.get('start')}"}), 400
+    
+    # Screenings are CPU-bound and share one process pool: refuse rather than queue past the limit
+    if not tracker.conjunction_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many conjunction screenings in progress, retry later'}), 429, {'Retry-After': '5'}
+    try:
+        result = tracker.get_conjunctions(satellite_name, group_name, start_time, hours, threshold, step,
+                                          MAX_CONJUNCTION_OBJECTS)
+    except ValueError as e:
+        return jsonify({'error': f'Too many objects to screen: {e}'}), 400
+    finally:
+        tracker.conjunction_slots.release()
+    if result is None:
+        return jsonify({'error': f'Satellite or group {satellite_name or group_name} not found'}), 404
+    return jsonify(result)
+
+@api.route('/api/positions', methods=['POST'])
+def get_bulk_positions():
+    """Positions for many satellites at many times: {satellites, timestamps | start, stop, step}"""
+    tracker = get_service().tracker
+    query = request.get_json(silent=True)
+    if query is None:
+        query = {}
+    if not isinstance(query, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    identifiers = query.get('satellites')
+    if (not isinstance(identifiers, list) or not identifiers
+            or not all(isinstance(i, (str, int)) and not isinstance(i, bool) for i in identifiers)):
+        return jsonify({'error': 'satellites must be a non-empty list of names or NORAD IDs'}), 400
+    if len(identifiers) > MAX_BULK_SATELLITES:
+        return jsonify({'error': f'Too many satellites (max {MAX_BULK_SATELLITES})'}), 400
+    
+    try:
+        if 'timestamps' in query:
+            if not isinstance(query['timestamps'], list) or not query['timestamps']:
+                return jsonify({'error': 'timestamps must be a non-empty list of ISO 8601 times'}), 400
+            timestamps = [parse_start_time(value) for value in query['timestamps']]
+            if None in timestamps:
+                return jsonify({'error': 'timestamps must be a non-empty list of ISO 8601 times'}), 400
+            start = span = step = None
+            times = len(timestamps)
+        else:
+            timestamps = None
+            start = parse_start_time(query.get('start'))
+            stop = parse_start_time(query.get('stop'))
+            step = query.get('step', 60)
+            if isinstance(step, bool) or not isinstance(step, (int, float)) or not math.isfinite(step):
+                return jsonify({'error': 'step must be a number of seconds'}), 400
+            if start is None or stop is None:
+                return jsonify({'error': 'Provide timestamps, or start and stop (with an optional step)'}), 400
+            span = (stop - start).total_seconds()
+            if span <= 0 or step <= 0:
+                return jsonify({'error': 'stop must be after start and step must be positive'}), 400
+            times = math.ceil(span / step)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid time specification: {e}'}), 400
+    
+    earliest, latest = BULK_TIME_RANGE
+    if not all(earliest <= t < latest for t in (timestamps if timestamps is not None else (start, stop))):
+        return jsonify({'error': f'Times must be between {earliest.date()} and {latest.date()}'}), 400
+    if times > MAX_ORBIT_POINTS or times * len(identifiers) > MAX_BULK_STATES:
+        return jsonify({'error': f'Too many positions requested (max {MAX_ORBIT_POINTS} times, '
+                                 f'{MAX_BULK_STATES} satellites x times)'}), 400
+    
+    positions = tracker.get_positions([str(identifier) for identifier in identifiers], timestamps, start, span, step)
+    return bulk_response(positions)
+
+@api.route('/api/satellite/<satellite_name>/position')
 def get_satellite_position(satellite_name):
     """Get current satellite position"""
+    tracker = get_service().tracker
     position = tracker.get_position(satellite_name)
     if position:
         return jsonify(position)
     
     # Return helpful error with available satellites
-    available_sats = list(tracker.satellites.keys())[:10]
+    available_sats = tracker.catalogue.names[:10]
     return jsonify({
         'error': f'Satellite {satellite_name} not found',
         'suggestion': 'Try one of these available satellites:',
         'available_satellites': available_sats,
-        'total_satellites': len(tracker.satellites)
+        'total_satellites': len(tracker.catalogue)
     }), 404
 
-@app.route('/api/satellite/<satellite_name>/orbit')
+@api.route('/api/satellite/<satellite_name>/orbit')
 def get_satellite_orbit(satellite_name):
-    """Get orbital positions for next few hours"""
-    positions = []
-    start_time = datetime.utcnow()
-    
-    for i in range(0, 7200, 60):  # Every minute for 2 hours
-        timestamp = start_time + timedelta(seconds=i)
-        position = tracker.get_position(satellite_name, timestamp)
-        if position:
-            positions.append(position)
-    
-    if positions:
-        return jsonify(positions)
+    """Get orbital positions over a time window (span/step in seconds, ISO start)"""
+    tracker = get_service().tracker
+    span = request.args.get('span', 7200, type=float)
+    step = request.args.get('step', 60, type=float)
+    start = request.args.get('start')
+    
+    if not (math.isfinite(span) and math.isfinite(step)) or span <= 0 or step <= 0:
+        return jsonify({'error': 'span and step must be positive numbers'}), 400
+    if span / step > MAX_ORBIT_POINTS:
+        return jsonify({'error': f'Too many points requested (max {MAX_ORBIT_POINTS})'}), 400
+    
+    try:
+        start_time = parse_start_time(start)
+    except ValueError:
+        return jsonify({'error': f'Invalid start time: {start}'}), 400
+    
+    orbit = tracker.get_orbit(satellite_name, start_time, span, step)
+    if orbit and orbit['count']:
+        return bulk_response(orbit)
     return jsonify({'error': f'Could not calculate orbit for {satellite_name}'}), 404
 
-@app.route('/api/satellite/<satellite_name>/telemetry')
+@api.route('/api/satellite/<satellite_name>/tracking')
+def get_satellite_tracking(satellite_name):
+    """Antenna tracking table for a station (lat/lon deg, alt km, duration s, rate Hz, frequency Hz; download=1 for a file)"""
+    tracker = get_service().tracker
+    latitude = request.args.get('lat', type=float)
+    longitude = request.args.get('lon', type=float)
+    altitude = request.args.get('alt', 0.0, type=float)
+    duration = request.args.get('duration', 900.0, type=float)
+    rate = request.args.get('rate', 1.0, type=float)
+    frequency = request.args.get('frequency', type=float)
+    min_elevation = request.args.get('min_elevation', type=float)
+    download = request.args.get('download', 'false').lower() in ('1', 'true')
+    
+    if latitude is None or longitude is None:
+        return jsonify({'error': 'lat and lon are required'}), 400
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 360:
+        return jsonify({'error': 'lat/lon out of range'}), 400
+    if not math.isfinite(altitude):
+        return jsonify({'error': 'alt must be a number of km'}), 400
+    if not 0 < rate <= MAX_TRACKING_RATE:
+        return jsonify({'error': f'rate must be between 0 and {MAX_TRACKING_RATE} Hz'}), 400
+    if not math.isfinite(duration) or duration <= 0 or duration * rate > MAX_TRACKING_SAMPLES:
+        return jsonify({'error': f'duration must be positive and give at most {MAX_TRACKING_SAMPLES} samples'}), 400
+    if frequency is not None and not (math.isfinite(frequency) and frequency > 0):
+        return jsonify({'error': 'frequency must be positive'}), 400
+    if min_elevation is not None and not -90 <= min_elevation <= 90:
+        return jsonify({'error': 'min_elevation must be between -90 and 90 degrees'}), 400
+    
+    try:
+        start_time = parse_start_time(request.args.get('start'))
+    except ValueError:
+        return jsonify({'error': f"Invalid start time: {request.args.get('start')}"}), 400
+    
+    station = GroundStation(latitude, longitude, altitude)
+    table = tracker.get_tracking_table(satellite_name, station, start_time, duration, rate, frequency, min_elevation)
+    if table is None:
+        return jsonify({'error': f'Satellite {satellite_name} not found'}), 404
+    filename = f"tracking_{table['norad_id']}_{table['start'][:19].replace(':', '')}" if download else None
+    return bulk_response(table, filename=filename)
+
+@api.route('/api/satellite/<satellite_name>/telemetry')
 def get_satellite_telemetry(satellite_name):
     """Get current satellite telemetry data"""
+    tracker = get_service().tracker
     try:
         telemetry = tracker.get_telemetry(satellite_name)
         if telemetry:
             return jsonify(telemetry)
         
-        available_sats = list(tracker.satellites.keys())[:5]
+        available_sats = tracker.catalogue.names[:5]
         return jsonify({
             'error': f'Could not generate telemetry for {satellite_name}',
             'available_satellites': available_sats
@@ -527,108 +1838,184 @@ def get_satellite_telemetry(satellite_name):
     except Exception as e:
         return jsonify({'error': f'Telemetry error: {str(e)}'}), 500
 
-@app.route('/api/satellite/<satellite_name>/telemetry/historical')
+@api.route('/api/satellite/<satellite_name>/telemetry/historical')
 def get_satellite_telemetry_historical(satellite_name):
-    """Get historical telemetry data for charts"""
+    """Get historical telemetry data for charts (hours back from now, downsampled to points or step seconds)"""
+    tracker = get_service().tracker
     try:
-        hours = request.args.get('hours', 2, type=int)
-        data_points = []
+        hours = request.args.get('hours', 2, type=float)
+        points = request.args.get('points', type=int)
+        step = request.args.get('step', type=float)
+        method = request.args.get('method', 'mean')
         
-        start_time = datetime.utcnow() - timedelta(hours=hours)
+        span = hours * 3600
+        resolution = tracker.telemetry_store.resolution
+        if not math.isfinite(span) or span <= 0 or span > tracker.telemetry_store.retention:
+            return jsonify({'error': f'hours must be positive and within the {tracker.telemetry_store.retention / 3600:g} h retention'}), 400
+        if span < resolution:
+            return jsonify({'error': f'hours must cover at least one {resolution:g} s sample'}), 400
+        if method not in TELEMETRY_DOWNSAMPLE_METHODS:
+            return jsonify({'error': f'Unknown method {method} (use {", ".join(TELEMETRY_DOWNSAMPLE_METHODS)})'}), 400
+        if points is None and step is not None:
+            if not math.isfinite(step) or step <= 0:
+                return jsonify({'error': 'step must be a positive number of seconds'}), 400
+            # Steps finer than the stored grid just return the raw samples
+            points = int(span // max(step, resolution))
+        if points is not None and points < MIN_DOWNSAMPLE_POINTS:
+            return jsonify({'error': f'points must be at least {MIN_DOWNSAMPLE_POINTS} (step at most a third of the window)'}), 400
         
-        # Generate fewer points for better performance
-        step_minutes = max(1, hours * 60 // 120)  # Max 120 data points
-        
-        for i in range(0, hours * 60, step_minutes):
-            timestamp = start_time + timedelta(minutes=i)
-            
-            # Get position for this time
-            position = tracker.get_position(satellite_name, timestamp)
-            
-            # Generate telemetry for this time
-            if position:
-                telemetry = tracker.telemetry_simulator.simulate_realistic_telemetry(position)
-                telemetry['timestamp'] = timestamp.isoformat()
-                data_points.append(telemetry)
-        
-        return jsonify(data_points)
+        end_time = datetime.utcnow()
+        history = tracker.get_telemetry_history(satellite_name, end_time - timedelta(hours=hours), end_time, points, method)
+        if history and history['count']:
+            return bulk_response(history)
+        return jsonify({'error': f'Could not calculate telemetry history for {satellite_name}'}), 404
+    except UnsupportedFormat:
+        raise
     except Exception as e:
         return jsonify({'error': f'Historical telemetry error: {str(e)}'}), 500
 
-@app.route('/api/tle/update', methods=['POST', 'GET'])
+@api.route('/api/tle/update', methods=['POST', 'GET'])
 def update_tle_data():
     """Update TLE data from CelesTrak"""
+    service = get_service()
     group = request.args.get('group') if request.method == 'GET' else request.json.get('group') if request.json else None
     force = request.args.get('force', 'false').lower() == 'true'
     
-    result = tracker.fetch_live_tle_data(group, force_update=force)
+    if service.mode == 'reader':
+        # Only the updater process talks to CelesTrak; the new catalogue is mapped when it publishes
+        service.request_refresh(group, force)
+        return jsonify({
+            'status': 'queued',
+            'group': group,
+            'catalogue_version': service.tracker.catalogue.version
+        }), 202
+    
+    result = service.tracker.fetch_live_tle_data(group, force_update=force)
     return jsonify(result)
 
-@app.route('/api/debug/satellites')
+@api.route('/api/debug/satellites')
 def debug_satellites():
     """Debug endpoint to see all loaded satellites"""
+    tracker = get_service().tracker
+    catalogue = tracker.catalogue
     return jsonify({
-        'total_satellites': len(tracker.satellites),
-        'satellite_names': list(tracker.satellites.keys()),
+        'total_satellites': len(catalogue),
+        'satellite_names': catalogue.names,
         'groups': {
-            group: list(data['satellites'].keys())[:5] 
-            for group, data in tracker.satellite_groups.items()
+            group: data.names[:5] 
+            for group, data in catalogue.groups.items()
         },
-        'iss_matches': [name for name in tracker.satellites.keys() if 'ISS' in name.upper()]
+        'iss_matches': [name for name in catalogue.names if 'ISS' in name.upper()]
+    })
+
+@api.route('/api/debug/slow-requests')
+def debug_slow_requests():
+    """Most recent requests slower than SLOW_REQUEST_SECONDS, with per-phase timings"""
+    entries = slow_requests.snapshot()
+    return jsonify({
+        'threshold': slow_requests.threshold,
+        'capacity': slow_requests.entries.maxlen,
+        'recorded': slow_requests.recorded,
+        'count': len(entries),
+        'requests': entries
+    })
+
+@api.route('/api/debug/profiles')
+def debug_profiles():
+    """Request profiles captured with the X-Profile header (PROFILING_ENABLED=1)"""
+    profiles = get_profiles()
+    if profiles is None:
+        return jsonify({'error': 'Profiling is disabled (set PROFILING_ENABLED=1)'}), 404
+    index = profiles.index()
+    return jsonify({'count': len(index), 'profiles': index})
+
+@api.route('/api/debug/profiles/<profile_id>')
+def debug_profile(profile_id):
+    """One profile: collapsed stacks, or pstats as a binary file (or format=text for a summary)"""
+    profiles = get_profiles()
+    profile = profiles.get(profile_id) if profiles is not None else None
+    if profile is None:
+        return jsonify({'error': f'Profile {profile_id} not found'}), 404
+    
+    if profile['mode'] == 'collapsed':
+        return Response(profile['data'], mimetype='text/plain')
+    if request.args.get('format') == 'text':
+        return Response(pstats_summary(profile['data']), mimetype='text/plain')
+    return Response(profile['data'], mimetype='application/octet-stream', headers={
+        'Content-Disposition': f'attachment; filename="{profile_id}.prof"'
     })
 
-@app.route('/api/health')
+@api.route('/api/health')
 def health_check():
     """API health check"""
+    service = get_service()
+    tracker = service.tracker
+    stream_hub = service.stream_hub
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'satellites_loaded': len(tracker.satellites),
-        'groups_loaded': len(tracker.satellite_groups),
+        'satellites_loaded': len(tracker.catalogue),
+        'groups_loaded': len(tracker.catalogue.groups),
         'last_tle_update': tracker.last_tle_update.isoformat() if tracker.last_tle_update else None,
+        'catalogue_version': tracker.catalogue.version,
+        'catalogue_mode': service.mode,
+        'groups': tracker.get_group_freshness(),
+        'position_cache': tracker.position_cache.stats(),
+        'telemetry_store': tracker.telemetry_store.stats(),
+        'ephemeris': tracker.ephemeris.stats(),
+        'stream': stream_hub.stats(),
         'version': '2.0.0'
     })
 
-# Background TLE update task
-def background_tle_update():
-    """Background task to update TLE data periodically"""
-    while True:
-        try:
-            time.sleep(6 * 3600)  # Update every 6 hours
-            print("🔄 Running background TLE update...")
-            tracker.fetch_live_tle_data(force_update=True)
-        except Exception as e:
-            print(f"❌ Background TLE update failed: {e}")
+@api.route('/api/ready')
+def readiness_check():
+    """Readiness probe: 200 once satellites are loaded, 503 while still warming up"""
+    readiness = get_service().readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+def create_app(start_background=True, refresh_interval=TLE_REFRESH_INTERVAL, profiling=PROFILING_ENABLED):
+    """Build the Flask application; the tracker itself is created on first use.
+    
+    WSGI servers should point at the factory (e.g. ``gunicorn 'app:create_app()'``)
+    so each worker starts its own warm-up and refresh thread. With
+    ``start_background='first_request'`` the thread is started by the first
+    request instead, in whichever process serves it. Request profiling
+    through the X-Profile header is off unless ``profiling`` (or the
+    PROFILING_ENABLED environment variable) turns it on.
+    """
+    app = Flask(__name__)
+    CORS(app)
+    app.config['START_BACKGROUND_ON_REQUEST'] = start_background == 'first_request'
+    app.config['PROFILING_ENABLED'] = profiling
+    app.extensions['profiles'] = ProfileStore(PROFILE_HISTORY, PROFILE_DIR)
+    app.extensions['ground_station'] = GroundStationService(refresh_interval)
+    app.register_blueprint(api)
+    if start_background is True:
+        app.extensions['ground_station'].start_background()
+    return app
 
-# Start background update thread
-update_thread = threading.Thread(target=background_tle_update, daemon=True)
-update_thread.start()
+# Importable without side effects: no tracker, network access or threads until used. Served
+# directly (``gunicorn app:app``, also with --preload) each worker warms up on its first request.
+app = create_app(start_background='first_request')
 
 if __name__ == '__main__':
-    print("🚀 Starting Advanced Multi-Satellite Ground Station API...")
+    logger.info("🚀 Starting Advanced Multi-Satellite Ground Station API...")
+    service = app.extensions['ground_station']
+    tracker = service.tracker
     
-    # Load space stations first to get ISS
-    print("📡 Loading space stations...")
-    result = tracker.fetch_live_tle_data('space_stations', force_update=True)
-    print(f"Initial load result: {result}")
+    # With the debug reloader only the child process that serves requests does background work
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        service.start_background()
     
-    # Find and print ISS name
-    iss_names = [name for name in tracker.satellites.keys() if 'ISS' in name.upper()]
+    # Find and log ISS name
+    iss_names = [name for name in tracker.catalogue.names if 'ISS' in name.upper()]
     if iss_names:
-        print(f"🛰️ ISS found as: {iss_names[0]}")
+        logger.info("🛰️ ISS found", extra={'satellite': iss_names[0]})
     else:
-        print("❌ ISS not found in loaded satellites")
-    
-    print(f"📡 Loaded {len(tracker.satellites)} satellites across {len(tracker.satellite_groups)} groups")
-    print("🌐 Server available at: http://localhost:5000")
-    print("🐛 Debug endpoint: http://localhost:5000/api/debug/satellites")
-    print("📊 Available endpoints:")
-    print("   - GET /api/satellites/groups               : List all satellite groups")
-    print("   - GET /api/constellation/starlink          : Get Starlink constellation")  
-    print("   - GET /api/constellation/galileo           : Get Galileo constellation")
-    print("   - GET /api/satellite/ISS/position          : Get ISS position")
-    print("   - GET /api/satellite/ISS/telemetry         : Get ISS telemetry")
-    print("   - GET /api/satellite/ISS/orbit             : Get ISS orbit")
-    print("   - POST/GET /api/tle/update                 : Update live TLE data")
-    print("   - GET /api/debug/satellites                : Debug satellite names")
+        logger.warning("❌ ISS not found in loaded satellites")
+    
+    logger.info("📡 Catalogue loaded", extra={'satellites': len(tracker.catalogue), 'groups': len(tracker.satellite_groups)})
+    logger.info("🌐 Server available at: http://localhost:5000")
+    logger.info("🐛 Debug endpoint: http://localhost:5000/api/debug/satellites")
+    logger.info("📊 Metrics endpoint: http://localhost:5000/api/metrics")
     app.run(debug=True, host='0.0.0.0', port=5000)
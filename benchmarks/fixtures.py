@@ -0,0 +1,115 @@
+"""Frozen TLE fixtures for the offline benchmarks.
+
+Writes CelesTrak-style group files (active.txt and its subsets) generated
+from a fixed seed, so every run and every machine sees byte-identical
+input. The catalogue mimics the real one in size and orbit mix: a Starlink
+shell, a polar LEO constellation, navigation constellations in MEO,
+geostationary and sun-synchronous weather satellites, stations and a
+background of assorted LEO objects. Drag terms are zero so the elements
+stay propagatable however far the benchmark clock is from their epoch.
+
+Recorded CelesTrak files with the same names can be used instead by
+pointing run.py --fixtures at their directory.
+"""
+import argparse
+import os
+import random
+
+EPOCH = '25001.00000000'  # 2025-01-01 00:00 UTC
+ACTIVE_SIZE = 12000
+SEED = 20250101
+
+GROUP_FILES = {
+    'stations.txt': 'stations',
+    'starlink.txt': 'starlink',
+    'gps-ops.txt': 'gps',
+    'galileo.txt': 'galileo',
+    'glonass-ops.txt': 'glonass',
+    'weather.txt': 'weather',
+}
+
+
+def _checksum(line):
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return str(total % 10)
+
+
+def format_tle(norad_id, name, inclination, raan, eccentricity, arg_perigee, mean_anomaly, mean_motion):
+    """Three-line element set with valid checksums and no drag"""
+    line1 = f'1 {norad_id:05d}U 25001A   {EPOCH}  .00000000  00000-0  00000-0 0  999'
+    line2 = (f'2 {norad_id:05d} {inclination:8.4f} {raan:8.4f} {int(round(eccentricity * 1e7)):07d} '
+             f'{arg_perigee:8.4f} {mean_anomaly:8.4f} {mean_motion:11.8f}{1:5d}')
+    return f'{name}\n{line1[:68]}{_checksum(line1)}\n{line2[:68]}{_checksum(line2)}'
+
+
+def build_catalogue(size=ACTIVE_SIZE, seed=SEED):
+    """(group name or None, TLE text) for every object, in catalogue order"""
+    rng = random.Random(seed)
+    entries = []
+    norad_id = iter(range(44000, 99999))
+
+    def add(group, name, inclination, mean_motion, eccentricity=None, raan=None, mean_anomaly=None):
+        entries.append((group, format_tle(
+            next(norad_id), name, inclination,
+            rng.uniform(0, 360) if raan is None else raan,
+            rng.uniform(0.0001, 0.002) if eccentricity is None else eccentricity,
+            rng.uniform(0, 360),
+            rng.uniform(0, 360) if mean_anomaly is None else mean_anomaly,
+            mean_motion
+        )))
+
+    entries.append(('stations', format_tle(25544, 'ISS (ZARYA)', 51.6416, 247.4627, 0.0006703, 130.5360,
+                                           325.0288, 15.49815308)))
+    add('stations', 'CSS (TIANHE)', 41.4700, 15.60000000)
+    add('stations', 'CSS (WENTIAN)', 41.4700, 15.60000000)
+    add('stations', 'CSS (MENGTIAN)', 41.4700, 15.60000000)
+    for i in range(16):
+        add('stations', f'ISS DEB {i + 1}', 51.64, rng.uniform(15.45, 15.9))
+
+    # Starlink-like shell: 72 planes in a Walker pattern
+    for i in range(6000):
+        plane, slot = divmod(i, 84)
+        add('starlink', f'STARLINK-{1000 + i}', 53.05, 15.06 + rng.uniform(-0.002, 0.002), 0.0001,
+            raan=plane * 5.0, mean_anomaly=(slot * 360.0 / 84 + plane * 1.3) % 360)
+
+    for i in range(600):
+        add(None, f'ONEWEB-{i + 1:04d}', 87.9, 13.10 + rng.uniform(-0.01, 0.01))
+    for i in range(31):
+        add('gps', f'GPS BIIF-{i + 1} (PRN {i + 1:02d})', 55.0 + rng.uniform(-1, 1), 2.00563, rng.uniform(0.001, 0.02))
+    for i in range(28):
+        add('galileo', f'GSAT0{100 + i} (GALILEO {i + 1})', 56.0, 1.70475)
+    for i in range(24):
+        add('glonass', f'COSMOS {2400 + i} (GLONASS-M)', 64.8, 2.13102)
+    for i in range(30):
+        add('weather', f'GOES-{i + 1}', rng.uniform(0, 0.5), 1.00273, 0.0002)
+    for i in range(36):
+        add('weather', f'NOAA {i + 1}', 98.7, 14.2 + rng.uniform(-0.1, 0.1))
+
+    # Assorted LEO background up to the target size
+    while len(entries) < size:
+        add(None, f'OBJECT {len(entries)}', rng.uniform(0, 100), rng.uniform(12.5, 16.0), rng.uniform(0.0001, 0.02))
+
+    return entries
+
+
+def write_fixtures(directory, size=ACTIVE_SIZE):
+    """Write active.txt and the per-group files into directory"""
+    os.makedirs(directory, exist_ok=True)
+    entries = build_catalogue(size)
+
+    files = {'active.txt': [text for _, text in entries]}
+    for filename, group in GROUP_FILES.items():
+        files[filename] = [text for entry_group, text in entries if entry_group == group]
+
+    for filename, texts in files.items():
+        with open(os.path.join(directory, filename), 'w') as f:
+            f.write('\n'.join(texts) + '\n')
+    return sorted(files)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory', nargs='?', default=os.path.join(os.path.dirname(__file__), 'fixtures'))
+    parser.add_argument('--size', type=int, default=ACTIVE_SIZE)
+    args = parser.parse_args()
+    print(', '.join(write_fixtures(args.directory, args.size)))
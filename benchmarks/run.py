@@ -0,0 +1,234 @@
+"""Offline benchmarks for the ground station API hot paths.
+
+Serves the frozen TLE fixtures from a local HTTP server, points the app at
+it through CELESTRAK_URL (with a throwaway TLE_CACHE_DIR), loads every
+group and times the tracker methods and Flask routes in-process. Results
+(throughput, p50/p99/mean latency, peak traced memory per scenario, process
+max RSS) are written as JSON for comparison across versions:
+
+    python benchmarks/run.py --output benchmarks/results.json
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import write_fixtures
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_fixtures(directory):
+    """Start a local CelesTrak stand-in; returns its base URL"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def summarize(durations, wall=None, peak=None):
+    durations = sorted(durations)
+    wall = wall if wall is not None else sum(durations)
+    return {
+        'iterations': len(durations),
+        'total_seconds': wall,
+        'throughput_per_second': len(durations) / wall if wall else None,
+        'mean_ms': 1000 * sum(durations) / len(durations),
+        'p50_ms': 1000 * percentile(durations, 0.50),
+        'p99_ms': 1000 * percentile(durations, 0.99),
+        'max_ms': 1000 * durations[-1],
+        'peak_traced_kb': peak / 1024 if peak is not None else None
+    }
+
+
+def measure(fn, iterations, warmup=1):
+    """Per-call latencies of fn(i), then one extra traced call for peak allocation"""
+    for i in range(warmup):
+        fn(i)
+
+    durations = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        fn(i)
+        durations.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn(iterations)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(durations, peak=peak)
+
+
+def expect_ok(response):
+    if response.status_code != 200:
+        raise RuntimeError(f'{response.request.path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response
+
+
+def load_test(client_factory, requests_per_client, paths, clients):
+    """Concurrent clients issuing a shuffled mix of requests; returns latency summary"""
+    def worker(seed):
+        client = client_factory()
+        rng = random.Random(seed)
+        latencies = []
+        for _ in range(requests_per_client):
+            path = rng.choice(paths)
+            started = time.perf_counter()
+            expect_ok(client.get(path))
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(worker, range(clients)))
+    wall = time.perf_counter() - started
+    summary = summarize([latency for latencies in results for latency in latencies], wall=wall)
+    summary['clients'] = clients
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmarks for the ground station API')
+    parser.add_argument('--fixtures', default=os.path.join(BENCH_DIR, 'fixtures'),
+                        help='directory of CelesTrak-style group files (generated if missing)')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results.json'))
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply iteration counts')
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.fixtures, 'active.txt')):
+        write_fixtures(args.fixtures)
+
+    os.environ['CELESTRAK_URL'] = serve_fixtures(args.fixtures)
+    os.environ['TLE_CACHE_DIR'] = tempfile.mkdtemp(prefix='gs-bench-')
+    os.environ.setdefault('TELEMETRY_SEED', '0')
+
+    import numpy as np
+    import sgp4
+
+    # Cold start: import, factory and first readiness answer (an empty disk cache here)
+    startup_started = time.perf_counter()
+    import app as ground_station
+    flask_app = ground_station.create_app(start_background=False)
+    client = flask_app.test_client()
+    client.get('/api/ready')
+    startup_seconds = time.perf_counter() - startup_started
+
+    from catalogue import parse_tle_lines
+
+    tracker = flask_app.extensions['ground_station'].tracker
+    load_started = time.perf_counter()
+    fetch = tracker.fetch_live_tle_data(force_update=True)
+    load_seconds = time.perf_counter() - load_started
+    if fetch['status'] != 'success':
+        raise RuntimeError(f'Fixture load failed: {fetch}')
+
+    def n(count):
+        return max(1, int(count * args.scale))
+
+    with open(os.path.join(args.fixtures, 'active.txt')) as f:
+        active_lines = f.read().strip().splitlines()
+
+    rng = random.Random(1)
+    records = list(tracker.catalogue.records)
+    names = [record.name for record in rng.sample(records, 200)]
+    queries = names[:100] + [str(record.norad_id) for record in rng.sample(records, 50)] + \
+        ['ISS', 'iss', 'HUBBLE', 'STARLINK-15', 'GPS BIIF', 'NO SUCH SATELLITE'] * 5
+    base_time = datetime(2025, 1, 2)
+
+    results = {}
+    scenarios = [
+        ('parse_tle_cold', lambda i: parse_tle_lines(active_lines), n(5)),
+        ('parse_tle_data_warm', lambda i: tracker._parse_tle_data(active_lines), n(10)),
+        ('find_satellite_by_name', lambda i: tracker.find_satellite_by_name(queries[i % len(queries)]), n(2000)),
+        ('get_position_now', lambda i: tracker.get_position(names[i % len(names)]), n(2000)),
+        ('get_position_at', lambda i: tracker.get_position(names[i % len(names)], base_time + timedelta(seconds=37 * i)), n(2000)),
+        ('get_constellation_positions_starlink', lambda i: tracker.get_constellation_positions('starlink'), n(20)),
+        ('get_constellation_positions_active', lambda i: tracker.get_constellation_positions('active'), n(10)),
+        ('route_orbit_default', lambda i: expect_ok(client.get('/api/satellite/ISS/orbit')), n(200)),
+        ('route_orbit_24h_10s', lambda i: expect_ok(client.get('/api/satellite/ISS/orbit?span=86400&step=10')), n(20)),
+        ('route_constellation_active', lambda i: expect_ok(client.get('/api/constellation/active')), n(10)),
+        ('route_constellation_active_columns', lambda i: expect_ok(
+            client.get('/api/constellation/active?layout=columns&precision=4')), n(10)),
+        ('route_telemetry_historical_24h', lambda i: expect_ok(
+            client.get('/api/satellite/ISS/telemetry/historical?hours=24')), n(20)),
+        ('route_telemetry_historical_24h_500pts', lambda i: expect_ok(
+            client.get('/api/satellite/ISS/telemetry/historical?hours=24&points=500')), n(50)),
+    ]
+    for name, fn, iterations in scenarios:
+        print(f'⏱️  {name} ({iterations} iterations)')
+        results[name] = measure(fn, iterations)
+
+    print(f'⏱️  concurrent_clients ({args.clients} clients)')
+    results['concurrent_clients'] = load_test(
+        flask_app.test_client, n(50),
+        ['/api/satellite/ISS/position', '/api/satellite/STARLINK-1500/position', '/api/satellite/ISS/orbit',
+         '/api/satellite/ISS/telemetry', '/api/constellation/gps', '/api/constellation/starlink?max=500',
+         '/api/satellite/ISS/telemetry/historical?hours=6&points=360'],
+        args.clients
+    )
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'sgp4': sgp4.__version__,
+            'fixtures': os.path.abspath(args.fixtures),
+            'catalogue_size': len(tracker.catalogue),
+            'startup_seconds': startup_seconds,
+            'initial_load_seconds': load_seconds,
+            'scale': args.scale,
+        },
+        'results': results,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'scenario':42s} {'ops/s':>10s} {'p50 ms':>9s} {'p99 ms':>9s} {'peak KB':>9s}")
+    for name, result in results.items():
+        peak = result['peak_traced_kb']
+        print(f"{name:42s} {result['throughput_per_second']:10.1f} {result['p50_ms']:9.2f} "
+              f"{result['p99_ms']:9.2f} {'-' if peak is None else round(peak):>9}")
+    print(f'\n📄 Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
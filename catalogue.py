@@ -0,0 +1,234 @@
+import numpy as np
+from sgp4.api import Satrec
+from propagation import ConstellationEngine, jd_to_datetime
+from profiling import phase
+from resolver import SatelliteResolver
+from structured_logging import get_logger
+
+logger = get_logger('catalogue')
+
+
+class SatelliteRecord:
+    """One parsed element set, shared by every group that lists the object"""
+
+    __slots__ = ('norad_id', 'name', 'line1', 'line2', 'satrec')
+
+    def __init__(self, norad_id, name, line1, line2, satrec):
+        self.norad_id = norad_id
+        self.name = name
+        self.line1 = line1
+        self.line2 = line2
+        self.satrec = satrec
+
+    @property
+    def epoch_jd(self):
+        return self.satrec.jdsatepoch + self.satrec.jdsatepochF
+
+
+def parse_tle_lines(tle_lines, known=None):
+    """Parse 3-line TLE text into SatelliteRecords, one per NORAD ID.
+
+    Records in ``known`` (NORAD ID -> SatelliteRecord) whose name and lines
+    are unchanged are reused instead of being parsed again.
+    """
+    known = known or {}
+    records = {}
+
+    # Process TLE data (every 3 lines: name, line1, line2)
+    for i in range(0, len(tle_lines) - 2, 3):
+        name = tle_lines[i].strip()
+        line1 = tle_lines[i + 1].strip()
+        line2 = tle_lines[i + 2].strip()
+
+        # Validate TLE lines
+        if not (line1.startswith('1 ') and line2.startswith('2 ')):
+            continue
+
+        try:
+            norad_id = int(line1[2:7])
+            if norad_id in records:
+                continue
+
+            record = known.get(norad_id)
+            if record is None or record.line1 != line1 or record.line2 != line2 or record.name != name:
+                record = SatelliteRecord(norad_id, name, line1, line2, Satrec.twoline2rv(line1, line2))
+            records[norad_id] = record
+        except Exception as e:
+            logger.warning("⚠️  Failed to parse satellite", extra={'satellite': name, 'error': str(e)})
+
+    return list(records.values())
+
+
+def same_elements(a, b):
+    return a.line1 == b.line1 and a.line2 == b.line2 and a.name == b.name
+
+
+def diff_records(previous, records):
+    """Counts of added/updated/removed/unchanged objects between two record sequences"""
+    before = {record.norad_id: record for record in previous}
+    changes = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    seen = set()
+    for record in records:
+        seen.add(record.norad_id)
+        old = before.get(record.norad_id)
+        if old is None:
+            changes['added'] += 1
+        elif old is record or same_elements(old, record):
+            changes['unchanged'] += 1
+        else:
+            changes['updated'] += 1
+    changes['removed'] = sum(1 for norad_id in before if norad_id not in seen)
+    return changes
+
+
+class GroupSnapshot:
+    """Immutable view of one loaded satellite group"""
+
+    __slots__ = ('key', 'records', 'fetched_at', 'epoch', '_engine')
+
+    def __init__(self, key, records, fetched_at, engine=None, epoch=None):
+        self.key = key
+        self.records = tuple(records)
+        self.fetched_at = fetched_at
+        self._engine = engine
+
+        if epoch is None and self.records:
+            # Newest element set epoch in the group
+            epoch = jd_to_datetime(max(record.epoch_jd for record in self.records))
+        self.epoch = epoch
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def names(self):
+        return [record.name for record in self.records]
+
+    @property
+    def engine(self):
+        """Batch propagation engine, built on first use (a SatrecArray copies every Satrec)"""
+        if self._engine is None:
+            self._engine = ConstellationEngine(
+                [record.name for record in self.records],
+                [record.norad_id for record in self.records],
+                [record.satrec for record in self.records]
+            )
+        return self._engine
+
+    def refreshed(self, fetched_at):
+        """Same elements, revalidated at a new fetch time"""
+        return GroupSnapshot(self.key, self.records, fetched_at, self._engine, self.epoch)
+
+
+class CatalogueSnapshot:
+    """Immutable catalogue state, published by a single reference swap.
+
+    Every NORAD ID is stored once in ``records``; groups refer to it through
+    integer index arrays in ``members``.
+    """
+
+    def __init__(self, groups=None, aliases=None, version=0, _indexes=None, _resolver=None):
+        self.groups = dict(groups or {})
+        self.aliases = aliases or {}
+        self.version = version
+        self._resolver = _resolver
+
+        if _indexes is None:
+            _indexes = self._build_indexes()
+        self.records, self.norad_index, self.members = _indexes
+
+    def _build_indexes(self):
+        # Where groups disagree about an object, the newest element set wins
+        newest = {}
+        for group in self.groups.values():
+            for record in group.records:
+                current = newest.get(record.norad_id)
+                if current is None or record.epoch_jd > current.epoch_jd:
+                    newest[record.norad_id] = record
+
+        records = list(newest.values())
+        norad_index = {record.norad_id: i for i, record in enumerate(records)}
+        members = {
+            key: np.fromiter((norad_index[record.norad_id] for record in group.records),
+                             dtype=np.int32, count=len(group.records))
+            for key, group in self.groups.items()
+        }
+        return records, norad_index, members
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def resolver(self):
+        """Name/NORAD lookup index, built on first use so refresh bursts only index once"""
+        if self._resolver is None:
+            self._resolver = SatelliteResolver(
+                [record.name for record in self.records],
+                [record.norad_id for record in self.records],
+                self.aliases
+            )
+        return self._resolver
+
+    @property
+    def names(self):
+        return self.resolver.names
+
+    @property
+    def last_update(self):
+        fetched = [group.fetched_at for group in self.groups.values() if group.fetched_at]
+        return max(fetched) if fetched else None
+
+    def by_norad(self):
+        """NORAD ID -> SatelliteRecord map, used to reuse unchanged parses"""
+        return {record.norad_id: record for record in self.records}
+
+    def resolve(self, search_name):
+        """Return the SatelliteRecord matching a name, NORAD ID or alias, or None"""
+        with phase('resolve'):
+            index = self.resolver.resolve_index(str(search_name))
+        return self.records[index] if index is not None else None
+
+    def with_group(self, group):
+        """New snapshot with one group's elements replaced"""
+        # Groups parsed concurrently may each hold a copy of an unchanged object
+        current = self.by_norad()
+        canonical = []
+        for record in group.records:
+            existing = current.get(record.norad_id)
+            if existing is not None and existing is not record and same_elements(existing, record):
+                record = existing
+            canonical.append(record)
+        group = GroupSnapshot(group.key, canonical, group.fetched_at, epoch=group.epoch)
+
+        groups = dict(self.groups)
+        groups[group.key] = group
+        return CatalogueSnapshot(groups, self.aliases, self.version + 1).inherit(self)
+
+    def inherit(self, previous):
+        """Adopt derived state from ``previous`` that a refresh left valid; returns self.
+
+        A group keeps its batch engine when every record is the same object,
+        and the name index is kept when the catalogue still lists the same
+        objects under the same names in the same order (element updates only).
+        """
+        for key, group in self.groups.items():
+            old = previous.groups.get(key)
+            if group._engine is None and old is not None and old._engine is not None and \
+                    len(old.records) == len(group.records) and \
+                    all(a is b for a, b in zip(old.records, group.records)):
+                group._engine = old._engine
+
+        if self._resolver is None and previous._resolver is not None and \
+                len(previous.records) == len(self.records) and \
+                all(a.norad_id == b.norad_id and a.name == b.name for a, b in zip(previous.records, self.records)):
+            self._resolver = previous._resolver
+        return self
+
+    def with_refreshed_group(self, key, fetched_at):
+        """New snapshot recording a revalidation; indexes are shared, not rebuilt"""
+        groups = dict(self.groups)
+        groups[key] = groups[key].refreshed(fetched_at)
+        return CatalogueSnapshot(
+            groups, self.aliases, self.version + 1,
+            _indexes=(self.records, self.norad_index, self.members), _resolver=self._resolver
+        )
@@ -0,0 +1,274 @@
+import math
+from datetime import timedelta
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+from propagation import SECONDS_PER_DAY, julian_date, offset_dates
+
+BLOCK_STEPS = 32            # time samples propagated per SatrecArray call
+MAX_RELATIVE_ACCEL = 0.02   # km/s^2, bound on the relative acceleration of two Earth orbiters
+REFINE_ITERATIONS = 6
+
+# Offsets to the neighbouring grid cells; HALF_NEIGHBOURS visits each unordered cell pair once
+NEIGHBOURS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+HALF_NEIGHBOURS = NEIGHBOURS[13:]
+
+
+def close_pairs(a, radius, b=None):
+    """Index pairs closer than radius, found with a uniform grid hash of cell size radius.
+
+    With only ``a``, returns each unordered pair of rows of ``a`` once; with
+    ``b``, returns pairs (i, j) of a row of ``a`` and a row of ``b``.
+    """
+    points = a if b is None else b
+    origin = np.minimum(a.min(axis=0), points.min(axis=0))
+    cells_a = np.floor((a - origin) / radius).astype(np.int64) + 1
+    cells_b = cells_a if b is None else np.floor((b - origin) / radius).astype(np.int64) + 1
+    dims = np.maximum(cells_a.max(axis=0), cells_b.max(axis=0)) + 2
+
+    def cell_key(cells):
+        return (cells[..., 0] * dims[1] + cells[..., 1]) * dims[2] + cells[..., 2]
+
+    # Points of b grouped by cell: unique occupied cells with their member runs
+    keys_b = cell_key(cells_b)
+    order_b = np.argsort(keys_b, kind='stable')
+    cells, starts_b, counts_b = np.unique(keys_b[order_b], return_index=True, return_counts=True)
+
+    if b is None:
+        queries, starts_a, counts_a, order_a = cells, starts_b, counts_b, order_b
+    else:
+        keys_a = cell_key(cells_a)
+        order_a = np.argsort(keys_a, kind='stable')
+        queries, starts_a, counts_a = np.unique(keys_a[order_a], return_index=True, return_counts=True)
+
+    pairs_i, pairs_j = [], []
+    for offset in (HALF_NEIGHBOURS if b is None else NEIGHBOURS):
+        # The key is linear in the cell index, so shifted queries stay sorted
+        target = queries + cell_key(offset)
+        hit = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+        found = np.flatnonzero(cells[hit] == target)
+        if not len(found):
+            continue
+        same_cell = b is None and not offset.any()
+
+        # Expand every occupied query cell against the points of its neighbouring cell
+        n_a, n_b = counts_a[found], counts_b[hit[found]]
+        pair_counts = n_a * n_b
+        total = pair_counts.sum()
+        cell = np.repeat(np.arange(len(found)), pair_counts)
+        local = np.arange(total) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        i = order_a[starts_a[found][cell] + local // n_b[cell]]
+        j = order_b[starts_b[hit[found]][cell] + local % n_b[cell]]
+        if same_cell:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+
+    if not pairs_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    i, j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    close = np.einsum('ij,ij->i', a[i] - points[j], a[i] - points[j]) < radius * radius
+    return i[close], j[close]
+
+
+def shells(satrecs):
+    """Perigee and apogee radii (km) from the mean elements"""
+    perigee = np.array([(1.0 + s.altp) * s.radiusearthkm for s in satrecs])
+    apogee = np.array([(1.0 + s.alta) * s.radiusearthkm for s in satrecs])
+    return perigee, apogee
+
+
+def _screen_segment(satrecs, primary_count, jd0, fr0, offsets, threshold, step):
+    """Candidate samples (i, j, step index, distance) over a run of time offsets.
+
+    Each sample at t stands for [t - step/2, t + step/2]; a pair is kept when
+    its separation could drop below threshold anywhere in that interval.
+    """
+    satellites = SatrecArray(satrecs)
+    perigee, apogee = shells(satrecs)
+    half = step / 2
+    found = []
+
+    for block in range(0, len(offsets), BLOCK_STEPS):
+        t = offsets[block:block + BLOCK_STEPS]
+        e, r, v = satellites.sgp4(*offset_dates(jd0, fr0, t))
+        speed = np.linalg.norm(v, axis=-1)
+
+        for k in range(len(t)):
+            valid = np.flatnonzero(e[:, k] == 0)
+            if len(valid) < 2:
+                continue
+            pos = r[valid, k]
+            margin = 2 * speed[valid, k].max() * half + MAX_RELATIVE_ACCEL * half * half / 2
+            radius = threshold + margin
+
+            if primary_count:
+                primary = valid < primary_count
+                if not primary.any() or primary.all():
+                    continue
+                i, j = close_pairs(pos[primary], radius, pos[~primary])
+                i, j = valid[primary][i], valid[~primary][j]
+            else:
+                i, j = close_pairs(pos, radius)
+                # Same orientation at every step so an encounter's samples form one run
+                i, j = valid[np.minimum(i, j)], valid[np.maximum(i, j)]
+
+            # Apogee/perigee filter: the orbits' radial shells must come within threshold
+            keep = np.maximum(perigee[i], perigee[j]) - np.minimum(apogee[i], apogee[j]) <= threshold
+            i, j = i[keep], j[keep]
+
+            # Straight-line closest approach within the interval, padded for curvature
+            rel_r = r[i, k] - r[j, k]
+            rel_v = v[i, k] - v[j, k]
+            speed_sq = np.maximum(np.einsum('ij,ij->i', rel_v, rel_v), 1e-12)
+            tau = np.clip(-np.einsum('ij,ij->i', rel_r, rel_v) / speed_sq, -half, half)
+            nearest = np.linalg.norm(rel_r + rel_v * tau[:, None], axis=-1)
+            keep = nearest - MAX_RELATIVE_ACCEL * half * half / 2 <= threshold
+            distance = np.linalg.norm(rel_r, axis=-1)
+            if keep.any():
+                found.append(np.column_stack((i[keep], j[keep], np.full(keep.sum(), block + k), distance[keep])))
+
+    return np.concatenate(found) if found else np.empty((0, 4))
+
+
+def _screen_segment_lines(lines, *args):
+    """Process-pool entry point: Satrec objects are rebuilt from TLE lines in the worker"""
+    return _screen_segment([Satrec.twoline2rv(line1, line2) for line1, line2 in lines], *args)
+
+
+class ConjunctionScreener:
+    """Catalogue-wide close-approach screening on a time grid.
+
+    Objects are propagated together every ``step`` seconds; a uniform grid
+    hash finds pairs that could come within ``threshold`` km in each
+    interval, the apogee/perigee and relative-velocity bounds prune them,
+    and each remaining encounter's time of closest approach is refined by
+    Newton iteration on the range rate. With a process ``pool`` the time
+    window is split into ``workers`` segments screened in parallel.
+    """
+
+    def __init__(self, threshold=5.0, step=30.0, workers=1, pool=None):
+        self.threshold = float(threshold)
+        self.step = float(step)
+        self.workers = max(1, int(workers)) if pool is not None else 1
+        self.pool = pool
+
+    def screen(self, records, start, duration, primaries=None, max_objects=None):
+        """Close approaches among records (or between primaries and records) in [start, start + duration)
+
+        Raises ValueError when more than ``max_objects`` objects would be screened.
+        """
+        if primaries:
+            primary_ids = {record.norad_id for record in primaries}
+            perigee, apogee = shells([record.satrec for record in primaries])
+            low, high = perigee.min() - self.threshold, apogee.max() + self.threshold
+            # Only objects whose radial shell overlaps a primary's can approach it
+            sec_perigee, sec_apogee = shells([record.satrec for record in records])
+            population = list(primaries) + [
+                record for record, q, a in zip(records, sec_perigee, sec_apogee)
+                if record.norad_id not in primary_ids and q <= high and a >= low
+            ]
+            primary_count = len(primaries)
+        else:
+            population = list(records)
+            primary_count = 0
+        if max_objects is not None and len(population) > max_objects:
+            raise ValueError(f'{len(population)} objects to screen (max {max_objects})')
+
+        jd0, fr0 = julian_date(start)
+        offsets = np.arange(0.0, duration + self.step / 2, self.step)
+        candidates = self._candidates(population, primary_count, jd0, fr0, offsets)
+
+        events = self._refine(population, candidates, jd0, fr0, offsets, duration)
+        events.sort(key=lambda event: event[0])
+        return {
+            'screened': len(population),
+            'candidates': len(candidates),
+            'events': [
+                {
+                    'primary_name': population[i].name,
+                    'primary_norad_id': population[i].norad_id,
+                    'secondary_name': population[j].name,
+                    'secondary_norad_id': population[j].norad_id,
+                    'tca': (start + timedelta(seconds=tca)).isoformat(),
+                    'miss_distance': miss,
+                    'relative_speed': speed
+                }
+                for tca, i, j, miss, speed in events
+            ]
+        }
+
+    def _candidates(self, population, primary_count, jd0, fr0, offsets):
+        if len(population) < 2:
+            return np.empty((0, 4))
+        args = (primary_count, jd0, fr0)
+        if self.workers == 1 or len(offsets) < 2 * self.workers:
+            return _screen_segment([record.satrec for record in population], *args, offsets, self.threshold, self.step)
+
+        # Contiguous time segments per process; step indices are re-based afterwards
+        lines = [(record.line1, record.line2) for record in population]
+        segments = np.array_split(np.arange(len(offsets)), self.workers)
+        futures = [self.pool.submit(_screen_segment_lines, lines, *args, offsets[segment], self.threshold, self.step)
+                   for segment in segments]
+        results = []
+        for segment, future in zip(segments, futures):
+            result = future.result()
+            result[:, 2] += segment[0]
+            results.append(result)
+        return np.concatenate(results)
+
+    def _refine(self, population, candidates, jd0, fr0, offsets, duration):
+        """(tca offset, i, j, miss km, relative speed km/s) per encounter"""
+        if not len(candidates):
+            return []
+
+        # One encounter per run of consecutive flagged samples of the same pair
+        i, j, k, distance = candidates[:, 0].astype(int), candidates[:, 1].astype(int), candidates[:, 2].astype(int), candidates[:, 3]
+        order = np.lexsort((k, j, i))
+        i, j, k, distance = i[order], j[order], k[order], distance[order]
+        new_run = np.ones(len(i), dtype=bool)
+        new_run[1:] = (i[1:] != i[:-1]) | (j[1:] != j[:-1]) | (k[1:] != k[:-1] + 1)
+        run_id = np.cumsum(new_run) - 1
+
+        # Closest sample of each run seeds the refinement
+        best = np.lexsort((distance, run_id))
+        best = best[np.concatenate(([True], run_id[best][1:] != run_id[best][:-1]))]
+
+        events = []
+        for a, b, sample in zip(i[best].tolist(), j[best].tolist(), k[best].tolist()):
+            t0 = float(offsets[sample])
+            tca, miss, speed = self._closest_approach(
+                population[a].satrec, population[b].satrec, jd0, fr0,
+                t0, max(0.0, t0 - self.step), min(duration, t0 + self.step)
+            )
+            if miss is not None and miss <= self.threshold:
+                events.append((tca, a, b, miss, speed))
+        return events
+
+    @staticmethod
+    def _relative_state(sat_a, sat_b, jd0, fr0, t):
+        fr = fr0 + t / SECONDS_PER_DAY
+        e1, r1, v1 = sat_a.sgp4(jd0, fr)
+        e2, r2, v2 = sat_b.sgp4(jd0, fr)
+        if e1 or e2:
+            return None, None
+        return [p - q for p, q in zip(r1, r2)], [p - q for p, q in zip(v1, v2)]
+
+    def _closest_approach(self, sat_a, sat_b, jd0, fr0, t, lo, hi):
+        """Newton iteration on d/dt |r_rel|^2 = 0, assuming locally straight relative motion"""
+        best = (None, None, None)
+        for _ in range(REFINE_ITERATIONS):
+            rel_r, rel_v = self._relative_state(sat_a, sat_b, jd0, fr0, t)
+            if rel_r is None:
+                break
+            miss = math.sqrt(sum(x * x for x in rel_r))
+            speed_sq = sum(x * x for x in rel_v)
+            if best[1] is None or miss < best[1]:
+                best = (t, miss, math.sqrt(speed_sq))
+            if speed_sq < 1e-12:
+                break
+            t_next = min(hi, max(lo, t - sum(x * y for x, y in zip(rel_r, rel_v)) / speed_sq))
+            if abs(t_next - t) < 1e-3:
+                break
+            t = t_next
+        return best
@@ -0,0 +1,121 @@
+import numpy as np
+from profiling import timed_phase
+
+# WGS84 ellipsoid
+WGS84_A = 6378.137  # km
+WGS84_F = 1.0 / 298.257223563
+WGS84_B = WGS84_A * (1.0 - WGS84_F)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)
+
+EARTH_ROTATION_RATE = 7.292115146706979e-5  # rad/s
+SPEED_OF_LIGHT = 299792.458  # km/s
+
+
+def gmst(jd, fr):
+    """Greenwich mean sidereal time (IAU-82, radians) for UT1 Julian date arrays"""
+    jd = np.asarray(jd, dtype=float)
+    fr = np.asarray(fr, dtype=float)
+    tut1 = ((jd - 2451545.0) + fr) / 36525.0
+    seconds = (-6.2e-6 * tut1 ** 3 + 0.093104 * tut1 ** 2
+               + (876600.0 * 3600 + 8640184.812866) * tut1 + 67310.54841)
+    return np.mod(np.radians(seconds / 240.0), 2 * np.pi)
+
+
+@timed_phase('convert')
+def teme_to_ecef(r, v, jd, fr):
+    """Rotate (..., 3) TEME position/velocity into the Earth-fixed frame.
+
+    ``jd``/``fr`` broadcast against the leading dimensions of ``r``; polar
+    motion is neglected (metre-level).
+    """
+    theta = gmst(jd, fr)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    r_ecef = np.stack((cos_t * x + sin_t * y, -sin_t * x + cos_t * y, z), axis=-1)
+
+    if v is None:
+        return r_ecef, None
+
+    vx, vy, vz = v[..., 0], v[..., 1], v[..., 2]
+    v_ecef = np.stack((
+        cos_t * vx + sin_t * vy + EARTH_ROTATION_RATE * r_ecef[..., 1],
+        -sin_t * vx + cos_t * vy - EARTH_ROTATION_RATE * r_ecef[..., 0],
+        vz
+    ), axis=-1)
+    return r_ecef, v_ecef
+
+
+@timed_phase('convert')
+def ecef_to_geodetic(r):
+    """WGS84 latitude/longitude (radians) and altitude (km) for (..., 3) ECEF positions"""
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    p = np.hypot(x, y)
+    longitude = np.arctan2(y, x)
+
+    # Bowring's method; three iterations converge to well under a millimetre
+    beta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    for _ in range(3):
+        latitude = np.arctan2(z + WGS84_EP2 * WGS84_B * np.sin(beta) ** 3,
+                              p - WGS84_E2 * WGS84_A * np.cos(beta) ** 3)
+        beta = np.arctan2((1.0 - WGS84_F) * np.sin(latitude), np.cos(latitude))
+
+    sin_lat = np.sin(latitude)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat ** 2)
+    altitude = p * np.cos(latitude) + z * sin_lat - WGS84_A ** 2 / n
+
+    return latitude, longitude, altitude
+
+
+def teme_to_geodetic(r, jd, fr):
+    """WGS84 latitude/longitude (radians) and altitude (km) for (..., 3) TEME positions"""
+    r_ecef, _ = teme_to_ecef(r, None, jd, fr)
+    return ecef_to_geodetic(r_ecef)
+
+
+def geodetic_to_ecef(latitude, longitude, altitude):
+    """ECEF position (km) for WGS84 latitude/longitude (radians) and altitude (km)"""
+    sin_lat, cos_lat = np.sin(latitude), np.cos(latitude)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat ** 2)
+    return np.stack((
+        (n + altitude) * cos_lat * np.cos(longitude),
+        (n + altitude) * cos_lat * np.sin(longitude),
+        (n * (1.0 - WGS84_E2) + altitude) * sin_lat
+    ), axis=-1)
+
+
+class GroundStation:
+    """Fixed observing site with its ECEF position and local east/north/up frame"""
+
+    def __init__(self, latitude, longitude, altitude=0.0):
+        self.latitude = float(latitude)    # degrees
+        self.longitude = float(longitude)  # degrees
+        self.altitude = float(altitude)    # km
+
+        lat, lon = np.radians(self.latitude), np.radians(self.longitude)
+        self.ecef = geodetic_to_ecef(lat, lon, self.altitude)
+        self.enu = np.array([
+            [-np.sin(lon), np.cos(lon), 0.0],
+            [-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)],
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+        ])
+
+    @timed_phase('convert')
+    def look_angles(self, r_ecef):
+        """Azimuth, elevation (radians) and slant range (km) to (..., 3) ECEF positions"""
+        east, north, up = np.moveaxis((r_ecef - self.ecef) @ self.enu.T, -1, 0)
+        slant_range = np.sqrt(east ** 2 + north ** 2 + up ** 2)
+        azimuth = np.mod(np.arctan2(east, north), 2 * np.pi)
+        elevation = np.arcsin(up / slant_range)
+        return azimuth, elevation, slant_range
+
+    def range_rate(self, r_ecef, v_ecef):
+        """Rate of change of slant range (km/s, positive receding) for (..., 3) ECEF states"""
+        line_of_sight = r_ecef - self.ecef
+        return np.einsum('...i,...i->...', line_of_sight, v_ecef) / np.linalg.norm(line_of_sight, axis=-1)
+
+
+def doppler_shift(frequency, range_rate):
+    """Doppler shift (Hz) of a carrier received from a source moving at range_rate (km/s)"""
+    return -frequency * range_rate / SPEED_OF_LIGHT
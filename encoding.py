@@ -0,0 +1,143 @@
+import csv
+import gzip
+import io
+import json
+import numpy as np
+
+# Optional encoders; formats whose module is missing are simply not offered
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIMETYPES = {
+    'json': 'application/json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'csv': 'text/csv'
+}
+EXTENSIONS = {'json': 'json', 'msgpack': 'msgpack', 'arrow': 'arrows', 'csv': 'csv'}
+MIME_ALIASES = {
+    'application/json': 'json',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.apache.arrow.stream': 'arrow',
+    'text/csv': 'csv'
+}
+COMPRESS_MIN_BYTES = 1024
+
+
+class UnsupportedFormat(ValueError):
+    """Requested response format is unknown or its encoder is not installed"""
+
+
+def available_formats():
+    return [name for name, module in (('json', json), ('msgpack', msgpack), ('arrow', pa), ('csv', csv))
+            if module is not None]
+
+
+def negotiate_format(requested, accept_mimetypes):
+    """Pick an encoding from an explicit ?format= value or the Accept header"""
+    if requested:
+        if requested not in MIMETYPES:
+            raise UnsupportedFormat(f'Unknown format {requested} (use {", ".join(MIMETYPES)})')
+        if requested not in available_formats():
+            raise UnsupportedFormat(f'Format {requested} is not available on this server')
+        return requested
+
+    available = available_formats()
+    best = accept_mimetypes.best_match([MIMETYPES[name] for name in available] + ['application/x-msgpack'])
+    return MIME_ALIASES.get(best, 'json')
+
+
+def column_names(payload):
+    """Keys holding one value per row (arrays as long as payload['count'])"""
+    count = payload.get('count')
+    return [key for key, value in payload.items()
+            if isinstance(value, (list, np.ndarray)) and len(value) == count]
+
+
+def round_columns(payload, precision):
+    """Round float columns to a number of decimals, shrinking text and compressed sizes"""
+    if precision is None:
+        return payload
+    rounded = dict(payload)
+    for key in column_names(payload):
+        value = payload[key]
+        if isinstance(value, np.ndarray) and value.dtype.kind == 'f':
+            rounded[key] = np.round(value, precision)
+    return rounded
+
+
+def _plain(value):
+    return value.tolist() if isinstance(value, np.ndarray) else value
+
+
+def _json_plain(value):
+    """Like _plain, but NaN (no value) becomes null so the body stays valid JSON"""
+    if isinstance(value, np.ndarray) and value.dtype.kind == 'f':
+        missing = np.isnan(value)
+        if missing.any():
+            return np.where(missing, None, value).tolist()
+    return _plain(value)
+
+
+def encode(payload, fmt):
+    """Serialize a payload dict; returns (body bytes, mimetype)"""
+    if fmt == 'msgpack':
+        body = msgpack.packb({key: _plain(value) for key, value in payload.items()})
+    elif fmt == 'arrow':
+        body = _encode_arrow(payload)
+    elif fmt == 'csv':
+        body = _encode_csv(payload)
+    else:
+        body = json.dumps({key: _json_plain(value) for key, value in payload.items()},
+                          separators=(',', ':')).encode()
+    return body, MIMETYPES[fmt]
+
+
+def _encode_arrow(payload):
+    """Arrow IPC stream: columns become a record batch, scalars go into schema metadata"""
+    columns = column_names(payload)
+    metadata = {key: value for key, value in payload.items() if key not in columns}
+    table = pa.table({key: pa.array(payload[key]) for key in columns},
+                     metadata={'payload': json.dumps(metadata, default=_plain)})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _encode_csv(payload):
+    """Columns only, one header line then one line per row; NaN is written as an empty field"""
+    columns = column_names(payload)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    writer.writerows(zip(*(_json_plain(payload[key]) for key in columns)))
+    return buffer.getvalue().encode()
+
+
+def compress(body, accept_encodings):
+    """Compress with the best encoding the client accepts; returns (body, content-encoding or None).
+
+    ``accept_encodings`` is a werkzeug Accept; a coding listed with q=0 is refused.
+    """
+    if len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    if brotli is not None and accept_encodings.quality('br') > 0:
+        return brotli.compress(body, quality=4), 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return gzip.compress(body, compresslevel=5), 'gzip'
+    return body, None
@@ -0,0 +1,328 @@
+import math
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from sgp4.api import SatrecArray
+
+from position_cache import UNIX_EPOCH
+from propagation import JD_UNIX_EPOCH, geodetic_snapshot, julian_dates
+from structured_logging import get_logger
+
+logger = get_logger('ephemeris')
+
+MU_EARTH = 398600.4418  # km^3/s^2
+BUILD_CHUNK = 2048  # satellites per SatrecArray call, so a rebuild never holds the GIL for long
+MAX_DIRECT_FRACTION = 0.25  # above this share of uncovered satellites a group goes straight to SGP4
+MIN_TRACK_POINTS = 256  # shorter single-satellite tracks are cheaper through sgp4_array
+
+
+def unix_seconds(timestamp):
+    return (timestamp - UNIX_EPOCH).total_seconds()
+
+
+def hermite_error_bound(satrecs, step):
+    """Estimated worst-case cubic Hermite position error (km) per satellite for a node spacing.
+
+    |r - p| <= h^4 / 384 * max|r''''|, with |r''''| taken as four times
+    w^4 * rp for the angular rate w at perigee radius rp, so eccentric orbits
+    are judged by their perigee passage.
+    """
+    mean_motion = np.array([satrec.no_kozai for satrec in satrecs]) / 60.0  # rad/s
+    eccentricity = np.array([satrec.ecco for satrec in satrecs])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        perigee = np.cbrt(MU_EARTH / mean_motion ** 2) * (1.0 - eccentricity)
+        rate = np.sqrt(MU_EARTH * (1.0 + eccentricity) / perigee ** 3)
+        bound = step ** 4 / 384.0 * 4.0 * rate ** 4 * perigee
+    return np.where(np.isfinite(bound) & (perigee > 0), bound, np.inf)
+
+
+def propagate_nodes(satrecs, times):
+    """SGP4 error codes (T, N) and float32 TEME states (T, N, 6: position km, velocity km/s)"""
+    jd = np.full(len(times), JD_UNIX_EPOCH)
+    fr = np.asarray(times, dtype=float) / 86400.0
+    errors = np.zeros((len(times), len(satrecs)), dtype=np.uint8)
+    states = np.empty((len(times), len(satrecs), 6), dtype=np.float32)
+    for lo in range(0, len(satrecs), BUILD_CHUNK):
+        hi = min(lo + BUILD_CHUNK, len(satrecs))
+        e, r, v = SatrecArray(satrecs[lo:hi]).sgp4(jd, fr)
+        errors[:, lo:hi] = e.T
+        states[:, lo:hi, :3] = r.transpose(1, 0, 2)
+        states[:, lo:hi, 3:] = v.transpose(1, 0, 2)
+    return errors, states
+
+
+def hermite_basis(s, step):
+    """Cubic Hermite weights for (p0, v0, p1, v1) and their time derivatives at fraction s"""
+    s2 = s * s
+    s3 = s2 * s
+    weights = (2 * s3 - 3 * s2 + 1, (s3 - 2 * s2 + s) * step, 3 * s2 - 2 * s3, (s3 - s2) * step)
+    rates = ((6 * s2 - 6 * s) / step, 3 * s2 - 4 * s + 1, (6 * s - 6 * s2) / step, 3 * s2 - 2 * s)
+    return weights, rates
+
+
+def hermite_matrices(s, step):
+    """(6, 6) matrices mapping the node states on either side of an instant to its state"""
+    (w0, wv0, w1, wv1), (d0, dv0, d1, dv1) = hermite_basis(s, step)
+    before = np.zeros((6, 6))
+    after = np.zeros((6, 6))
+    identity = np.eye(3)
+    before[:3, :3], before[3:, :3], before[:3, 3:], before[3:, 3:] = w0 * identity, wv0 * identity, d0 * identity, dv0 * identity
+    after[:3, :3], after[3:, :3], after[:3, 3:], after[3:, 3:] = w1 * identity, wv1 * identity, d1 * identity, dv1 * identity
+    return before, after
+
+
+class EphemerisTable:
+    """TEME states of one catalogue's records on a regular time grid (immutable once published)"""
+
+    def __init__(self, source, start, step, errors, states, usable, max_error_km):
+        self.source = source  # the catalogue's record list; identity tells whether it changed
+        self.records = list(source)
+        self.rows = {record.norad_id: i for i, record in enumerate(self.records)}
+        self.start = start
+        self.step = step
+        self.errors = errors
+        self.states = states
+        self.usable = usable
+        self.max_error_km = max_error_km
+        self.group_rows = {}  # group key -> (GroupSnapshot, rows, NORAD IDs)
+
+    @property
+    def nodes(self):
+        return len(self.states)
+
+    @property
+    def end(self):
+        return self.start + (self.nodes - 1) * self.step
+
+    @property
+    def nbytes(self):
+        return self.states.nbytes + self.errors.nbytes
+
+    def covers(self, first, last=None):
+        return self.start <= first and (first if last is None else last) <= self.end
+
+    def row_of(self, record):
+        """Table row for this exact element set, or -1 if it must be propagated directly"""
+        row = self.rows.get(record.norad_id)
+        if row is None or self.records[row] is not record or not self.usable[row]:
+            return -1
+        return row
+
+    def rows_for(self, group):
+        cached = self.group_rows.get(group.key)
+        if cached is None or cached[0] is not group:
+            rows = np.fromiter((self.row_of(record) for record in group.records), dtype=np.int64, count=len(group))
+            norad_ids = np.fromiter((record.norad_id for record in group.records), dtype=np.int64, count=len(group))
+            cached = self.group_rows[group.key] = (group, rows, norad_ids)
+        return cached[1], cached[2]
+
+    def interpolate(self, rows, times):
+        """Positions and velocities (..., 3) of table rows at unix times (broadcast together)"""
+        if np.ndim(times) == 0:
+            # One instant: a gather per node and two small matrix products
+            u = (times - self.start) / self.step
+            k = min(int(u), self.nodes - 2)
+            before, after = hermite_matrices(u - k, self.step)
+            state = (self.states[k].take(rows, axis=0).astype(float) @ before
+                     + self.states[k + 1].take(rows, axis=0).astype(float) @ after)
+            return state[..., :3], state[..., 3:]
+        
+        rows, times = np.broadcast_arrays(rows, times)
+        u = (times - self.start) / self.step
+        k = np.minimum(np.floor(u).astype(np.int64), self.nodes - 2)
+        first = self.states[k, rows].astype(float)
+        second = self.states[k + 1, rows].astype(float)
+        (w0, wv0, w1, wv1), (d0, dv0, d1, dv1) = hermite_basis((u - k)[..., None], self.step)
+        p0, v0, p1, v1 = first[..., :3], first[..., 3:], second[..., :3], second[..., 3:]
+        return w0 * p0 + wv0 * v0 + w1 * p1 + wv1 * v1, d0 * p0 + dv0 * v0 + d1 * p1 + dv1 * v1
+
+
+class EphemerisStore:
+    """Sliding-window Hermite ephemeris of the whole catalogue, rebuilt in the background.
+
+    A table covers about ``window`` seconds from just before now on a
+    ``step`` grid and slides forward once half the window has elapsed.
+    Rebuilds are incremental: states of unchanged element sets on nodes that
+    both windows share are copied, so a TLE refresh only propagates the
+    changed satellites and a slide only the new nodes. Satellites whose
+    estimated or measured interpolation error exceeds ``tolerance`` km, or
+    that SGP4 rejects inside the window, are left to direct propagation.
+    """
+
+    def __init__(self, window=7200.0, step=60.0, tolerance=0.01, check_interval=30.0):
+        self.window = window
+        self.step = step
+        self.tolerance = tolerance
+        self.check_interval = check_interval
+        self.table = None
+        self.changed = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.builds = 0
+        self.last_build = None
+
+    def needs_rebuild(self, catalogue, now):
+        table = self.table
+        return (table is None or table.source is not catalogue.records
+                or now > table.start + self.window / 2)
+
+    def rebuild(self, catalogue, now=None):
+        """Build and publish a table for the catalogue around ``now`` (unix seconds)"""
+        now = time.time() if now is None else now
+        started = time.perf_counter()
+        start = math.floor(now / self.step) * self.step - self.step
+        nodes = int(math.ceil(self.window / self.step)) + 2
+        times = start + self.step * np.arange(nodes)
+        records = catalogue.records
+        count = len(records)
+
+        errors = np.zeros((nodes, count), dtype=np.uint8)
+        states = np.empty((nodes, count, 6), dtype=np.float32)
+
+        # Copy unchanged element sets on the nodes the previous window shares with this one
+        reused = np.zeros(count, dtype=bool)
+        first = last = 0
+        previous = self.table
+        if previous is not None and previous.step == self.step:
+            shift = int(round((start - previous.start) / self.step))
+            first, last = max(0, -shift), min(nodes, previous.nodes - shift)
+            if first < last:
+                old_rows = np.fromiter((previous.rows.get(record.norad_id, -1) for record in records),
+                                       dtype=np.int64, count=count)
+                reused = np.fromiter((row >= 0 and previous.records[row] is record
+                                      for row, record in zip(old_rows.tolist(), records)), dtype=bool, count=count)
+                rows, source = np.flatnonzero(reused), old_rows[reused]
+                overlap = slice(first + shift, last + shift)
+                errors[first:last, rows] = previous.errors[overlap][:, source]
+                states[first:last, rows] = previous.states[overlap][:, source]
+
+        propagated = 0
+        fresh = np.flatnonzero(~reused)
+        if len(fresh):
+            errors[:, fresh], states[:, fresh] = propagate_nodes([records[i].satrec for i in fresh.tolist()], times)
+            propagated += len(fresh) * nodes
+        missing_nodes = np.r_[0:first, last:nodes] if reused.any() else np.empty(0, dtype=np.int64)
+        if len(missing_nodes):
+            rows = np.flatnonzero(reused)
+            grid = np.ix_(missing_nodes, rows)
+            errors[grid], states[grid] = propagate_nodes([records[i].satrec for i in rows.tolist()], times[missing_nodes])
+            propagated += len(rows) * len(missing_nodes)
+
+        usable = ~errors.any(axis=0) & (hermite_error_bound([record.satrec for record in records], self.step)
+                                        <= self.tolerance)
+        table = EphemerisTable(records, start, self.step, errors, states, usable, None)
+        table.max_error_km = self._verify(table)
+
+        self.table = table
+        self.builds += 1
+        self.last_build = {
+            'seconds': time.perf_counter() - started,
+            'propagated_states': propagated,
+            'reused_satellites': int(reused.sum()),
+            'built_at': datetime.utcnow().isoformat()
+        }
+        logger.info("🧮 Ephemeris table built", extra={
+            'satellites': count, 'interpolated': int(table.usable.sum()), 'nodes': nodes,
+            'reused': self.last_build['reused_satellites'], 'seconds': round(self.last_build['seconds'], 3),
+            'max_error_km': table.max_error_km
+        })
+        return table
+
+    def _verify(self, table):
+        """Compare interpolation against SGP4 mid-interval (where Hermite error peaks) for
+        every usable satellite; rows over tolerance fall back to direct propagation"""
+        rows = np.flatnonzero(table.usable)
+        if not len(rows):
+            return 0.0
+        probes = table.start + table.step * (np.array([table.nodes // 4, 3 * table.nodes // 4]) + 0.5)
+        e, states = propagate_nodes([table.records[i].satrec for i in rows.tolist()], probes)
+        interpolated, _ = table.interpolate(rows[None, :], probes[:, None])
+        error = np.where(e == 0, np.linalg.norm(interpolated - states[..., :3], axis=-1), np.inf).max(axis=0)
+        table.usable[rows[error > self.tolerance]] = False
+        within = error[error <= self.tolerance]
+        return float(within.max()) if len(within) else 0.0
+
+    def positions_at(self, group, timestamp, limit=None):
+        """Interpolated geodetic snapshot of a group (as ConstellationEngine.positions_at),
+        or None if the table does not cover the time or most of the group"""
+        table = self.table
+        t = unix_seconds(timestamp)
+        if table is None or not table.covers(t):
+            return None
+        rows, norad_ids = table.rows_for(group)
+        rows, norad_ids = rows[:limit], norad_ids[:limit]
+        direct = np.flatnonzero(rows < 0)
+        if len(direct) > MAX_DIRECT_FRACTION * len(rows):
+            return None
+
+        jd, fr = julian_dates([timestamp])
+        e = np.zeros(len(rows), dtype=np.uint8)
+        r = np.empty((len(rows), 3))
+        v = np.empty((len(rows), 3))
+        interpolated = rows >= 0
+        r[interpolated], v[interpolated] = table.interpolate(rows[interpolated], t)
+        for i in direct.tolist():
+            e[i], r[i], v[i] = group.records[i].satrec.sgp4(jd[0], fr[0])
+        return geodetic_snapshot(norad_ids, e, r, v, jd[0], fr[0])
+
+    def track(self, record, times):
+        """Interpolated TEME positions and velocities (T, 3) of one satellite at ascending
+        unix times, or None if the table does not cover them"""
+        table = self.table
+        if table is None or len(times) < MIN_TRACK_POINTS or not table.covers(times[0], times[-1]):
+            return None
+        row = table.row_of(record)
+        if row < 0:
+            return None
+        return table.interpolate(row, times)
+
+    def start(self, get_catalogue):
+        """Keep the table current in a background thread (rebuilt on changed or slide)"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self._run, args=(get_catalogue,), name='ephemeris', daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        self.stopping.set()
+        self.changed.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def _run(self, get_catalogue):
+        while not self.stopping.is_set():
+            self.changed.clear()
+            try:
+                catalogue = get_catalogue()
+                now = time.time()
+                if len(catalogue) and self.needs_rebuild(catalogue, now):
+                    self.rebuild(catalogue, now)
+            except Exception:
+                logger.exception("❌ Ephemeris rebuild failed")
+            self.changed.wait(self.check_interval)
+
+    def stats(self):
+        table = self.table
+        stats = {
+            'running': self.thread is not None and self.thread.is_alive(),
+            'window_seconds': self.window,
+            'step_seconds': self.step,
+            'tolerance_km': self.tolerance,
+            'builds': self.builds,
+            'last_build': self.last_build
+        }
+        if table is not None:
+            stats.update({
+                'start': datetime.utcfromtimestamp(table.start).isoformat(),
+                'end': datetime.utcfromtimestamp(table.end).isoformat(),
+                'nodes': table.nodes,
+                'satellites': len(table.records),
+                'interpolated_satellites': int(table.usable.sum()),
+                'max_error_km': table.max_error_km,
+                'bytes': table.nbytes
+            })
+        return stats
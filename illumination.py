@@ -0,0 +1,140 @@
+from datetime import timedelta
+import numpy as np
+from sgp4.api import SatrecArray
+from coordinates import WGS84_A
+from propagation import CHUNK_SIZE, time_grid
+
+AU = 149597870.7  # km
+SUN_RADIUS = 696000.0  # km
+
+
+def sun_position(jd, fr):
+    """Geocentric Sun position (km, (T, 3)) for Julian date arrays.
+
+    Low-precision solar coordinates from the Astronomical Almanac (about
+    0.01 degrees over 1950-2050) in the mean equator and equinox of date,
+    which is TEME to well within that accuracy.
+    """
+    t = ((np.asarray(jd, dtype=float) - 2451545.0) + np.asarray(fr, dtype=float)) / 36525.0
+    mean_longitude = np.radians(280.460 + 36000.771 * t)
+    mean_anomaly = np.radians(357.5291092 + 35999.05034 * t)
+    longitude = mean_longitude + np.radians(1.914666471 * np.sin(mean_anomaly)
+                                            + 0.019994643 * np.sin(2 * mean_anomaly))
+    distance = AU * (1.000140612 - 0.016708617 * np.cos(mean_anomaly) - 0.000139589 * np.cos(2 * mean_anomaly))
+    obliquity = np.radians(23.439291 - 0.0130042 * t)
+
+    return distance[..., None] * np.stack((
+        np.cos(longitude),
+        np.cos(obliquity) * np.sin(longitude),
+        np.sin(obliquity) * np.sin(longitude)
+    ), axis=-1)
+
+
+def shadow_geometry(r, r_sun):
+    """Apparent radii of the Sun and Earth and their separation (radians) seen from (..., 3) positions"""
+    to_sun = r_sun - r
+    sun_distance = np.linalg.norm(to_sun, axis=-1)
+    radius = np.linalg.norm(r, axis=-1)
+
+    sun_radius = np.arcsin(np.minimum(SUN_RADIUS / sun_distance, 1.0))
+    earth_radius = np.arcsin(np.minimum(WGS84_A / radius, 1.0))
+    cos_separation = -np.einsum('...i,...i->...', r, to_sun) / (radius * sun_distance)
+    separation = np.arccos(np.clip(cos_separation, -1.0, 1.0))
+    return sun_radius, earth_radius, separation
+
+
+def shadow_margin(r, r_sun):
+    """Angle (radians) by which the Sun's disk clears the Earth's; negative inside the penumbra"""
+    sun_radius, earth_radius, separation = shadow_geometry(r, r_sun)
+    return separation - (sun_radius + earth_radius)
+
+
+def illuminated_fraction(r, r_sun):
+    """Visible fraction of the Sun's disk (1 sunlit, 0 umbra) for (..., 3) TEME positions.
+
+    Conical shadow model: the Earth (a sphere of equatorial radius) and the
+    Sun are treated as disks and the fraction is one minus their overlap.
+    """
+    a, b, c = shadow_geometry(r, r_sun)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = (c ** 2 + a ** 2 - b ** 2) / (2 * c)
+        y = np.sqrt(np.maximum(a ** 2 - x ** 2, 0.0))
+        overlap = (a ** 2 * np.arccos(np.clip(x / a, -1.0, 1.0))
+                   + b ** 2 * np.arccos(np.clip((c - x) / b, -1.0, 1.0)) - c * y)
+        partial = 1.0 - overlap / (np.pi * a ** 2)
+
+    fraction = np.select(
+        [c >= a + b, c <= b - a, c <= a - b],
+        [1.0, 0.0, 1.0 - (b / a) ** 2],
+        partial
+    )
+    return np.where(np.isnan(c), np.nan, np.clip(fraction, 0.0, 1.0))
+
+
+def illumination_state(fraction):
+    """'sunlit', 'penumbra' or 'umbra' per fraction (None where it is NaN)"""
+    return [None if f != f else 'sunlit' if f >= 1.0 else 'umbra' if f <= 0.0 else 'penumbra'
+            for f in np.asarray(fraction).tolist()]
+
+
+def shadow_crossings(offsets, margin):
+    """Eclipse intervals from (N, T) shadow margins sampled at ``offsets`` seconds.
+
+    Returns per satellite a list of (entry, exit) offsets, linearly
+    interpolated between samples; entry is None for an eclipse already under
+    way at the first sample and exit None for one still going at the last.
+    NaN margins (SGP4 failures) never start or end an eclipse.
+    """
+    shadow = margin < 0
+    valid = ~np.isnan(margin)
+    changes = (shadow[:, :-1] != shadow[:, 1:]) & valid[:, :-1] & valid[:, 1:]
+    intervals = [[] for _ in range(len(margin))]
+
+    for row in np.flatnonzero(shadow.any(axis=1)).tolist():
+        in_shadow = bool(shadow[row, 0])
+        entry = None
+        for k in np.flatnonzero(changes[row]).tolist():
+            m0, m1 = margin[row, k], margin[row, k + 1]
+            crossing = float(offsets[k] + (offsets[k + 1] - offsets[k]) * m0 / (m0 - m1))
+            if shadow[row, k + 1]:
+                entry = crossing
+            else:
+                intervals[row].append((entry, crossing))
+            in_shadow = bool(shadow[row, k + 1])
+        if in_shadow:
+            intervals[row].append((entry, None))
+    return intervals
+
+
+def constellation_illumination(records, start, duration, step):
+    """Illumination of SatelliteRecords at ``start`` and their eclipses over the following ``duration`` seconds.
+
+    Satellites are propagated in chunks of CHUNK_SIZE so memory stays
+    bounded for the full catalogue; the Sun vector is computed once per time.
+    """
+    jd, fr, offsets = time_grid(start, duration + step, step)
+    r_sun = sun_position(jd, fr)
+
+    fractions = np.full(len(records), np.nan)
+    error_codes = np.zeros(len(records), dtype=np.uint8)
+    eclipses = []
+    for i in range(0, len(records), CHUNK_SIZE):
+        chunk = records[i:i + CHUNK_SIZE]
+        e, r, _ = SatrecArray([record.satrec for record in chunk]).sgp4(jd, fr)
+        with np.errstate(invalid='ignore'):
+            margin = np.where(e == 0, shadow_margin(r, r_sun), np.nan)
+            fractions[i:i + len(chunk)] = np.where(e[:, 0] == 0, illuminated_fraction(r[:, 0], r_sun[0]), np.nan)
+        error_codes[i:i + len(chunk)] = e[:, 0]
+        eclipses.extend(shadow_crossings(offsets, margin))
+
+    def timestamp(offset):
+        return None if offset is None else (start + timedelta(seconds=offset)).isoformat()
+
+    return {
+        'illumination': fractions,
+        'error_code': error_codes,
+        'eclipse_entry': [[timestamp(entry) for entry, _ in intervals] for intervals in eclipses],
+        'eclipse_exit': [[timestamp(exit_) for _, exit_ in intervals] for intervals in eclipses],
+        'states': len(records) * len(offsets),
+        'sun': r_sun[0]
+    }
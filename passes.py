@@ -0,0 +1,170 @@
+from datetime import timedelta
+import numpy as np
+from sgp4.api import SatrecArray
+from coordinates import EARTH_ROTATION_RATE, teme_to_ecef
+from propagation import CHUNK_SIZE, julian_date, offset_dates
+
+REFINE_ITERATIONS = 6
+
+
+class PassPredictor:
+    """Find AOS/TCA/LOS of satellite passes over a ground station.
+
+    A coarse vectorized sweep flags the intervals in which each satellite
+    could possibly clear the elevation mask (Earth-central angle test with a
+    margin for motion between samples). Only those intervals are sampled at
+    ``fine_step``; horizon crossings are then refined by regula falsi and
+    the culmination by successive parabolic interpolation. Passes shorter
+    than ``fine_step`` can be missed. A pass already under way at the start
+    (or still under way at the end) reports the window edge as its AOS (LOS)
+    and is flagged ``aos_truncated`` (``los_truncated``).
+    """
+
+    def __init__(self, station, min_elevation=10.0, coarse_step=300.0, fine_step=30.0):
+        self.station = station
+        self.min_elevation = np.radians(min_elevation)
+        self.coarse_step = float(coarse_step)
+        self.fine_step = float(fine_step)
+
+        self.station_radius = np.linalg.norm(station.ecef)
+        self.station_up = station.ecef / self.station_radius
+
+    def predict(self, records, start, duration):
+        """Passes for SatelliteRecords over [start, start + duration seconds), sorted by AOS"""
+        jd0, fr0 = julian_date(start)
+        passes = []
+
+        for i in range(0, len(records), CHUNK_SIZE):
+            chunk = records[i:i + CHUNK_SIZE]
+            windows = self._candidate_windows(chunk, jd0, fr0, duration)
+            for record, window_starts in zip(chunk, windows):
+                if len(window_starts):
+                    passes.extend(self._satellite_passes(record, jd0, fr0, duration, window_starts, start))
+
+        passes.sort(key=lambda item: item[0])
+        return [item[1] for item in passes]
+
+    def _candidate_windows(self, chunk, jd0, fr0, duration):
+        """Per satellite, start offsets of coarse intervals where a pass is possible"""
+        t = np.arange(0.0, duration + self.coarse_step, self.coarse_step)
+        jd, fr = offset_dates(jd0, fr0, t)
+
+        e, r, _ = SatrecArray([record.satrec for record in chunk]).sgp4(jd, fr)
+        r_ecef, _ = teme_to_ecef(r, None, jd, fr)
+        radius = np.linalg.norm(r_ecef, axis=-1)
+
+        angle = np.arccos(np.clip((r_ecef @ self.station_up) / radius, -1.0, 1.0))
+        angle[e != 0] = np.pi
+
+        # Largest Earth-central angle at which the satellite clears the mask
+        cos_min_el = np.cos(self.min_elevation)
+        horizon = np.arccos(np.clip(self.station_radius / radius * cos_min_el, -1.0, 1.0)) - self.min_elevation
+        horizon = np.maximum(horizon[:, :-1], horizon[:, 1:])
+
+        # Fastest possible angular motion relative to the station (perigee rate + Earth rotation)
+        ecc = np.array([record.satrec.ecco for record in chunk])
+        mean_motion = np.array([record.satrec.no_kozai for record in chunk]) / 60.0
+        rate = mean_motion * (1 + ecc) ** 2 / (1 - ecc ** 2) ** 1.5 + EARTH_ROTATION_RATE
+        travel = 1.1 * rate[:, None] * self.coarse_step / 2 + np.radians(1.0)
+
+        lower_bound = (angle[:, :-1] + angle[:, 1:]) / 2 - travel
+        candidates = lower_bound <= horizon
+        return [t[:-1][row] for row in candidates]
+
+    def _elevation(self, satrec, jd0, fr0, t):
+        """Azimuth and elevation (radians) of one satellite at offsets t (seconds)"""
+        jd, fr = offset_dates(jd0, fr0, t)
+        e, r, _ = satrec.sgp4_array(jd, fr)
+        r_ecef, _ = teme_to_ecef(r, None, jd, fr)
+        azimuth, elevation, _ = self.station.look_angles(r_ecef)
+        elevation[e != 0] = -np.pi / 2
+        return azimuth, elevation
+
+    @staticmethod
+    def _vertex_offset(before, center, after, spacing):
+        """Offset of the parabola vertex through three equally spaced samples"""
+        curvature = before - 2 * center + after
+        offset = np.where(curvature < 0, spacing * (before - after) / (2 * np.where(curvature < 0, curvature, -1.0)), 0.0)
+        return np.clip(offset, -spacing, spacing)
+
+    def _satellite_passes(self, record, jd0, fr0, duration, window_starts, start):
+        """(AOS offset, pass dict) pairs for one satellite within its candidate windows"""
+        steps = np.arange(0.0, self.coarse_step + self.fine_step / 2, self.fine_step)
+        t = np.unique(np.clip((window_starts[:, None] + steps[None, :]).ravel(), 0.0, duration))
+        _, elevation = self._elevation(record.satrec, jd0, fr0, t)
+
+        above = elevation >= self.min_elevation
+        if not above.any():
+            return []
+
+        # Runs of consecutive above-mask samples on the contiguous fine grid
+        contiguous = np.diff(t) <= self.fine_step * 1.5
+        prev_above = np.concatenate(([False], above[:-1] & contiguous))
+        next_above = np.concatenate((above[1:] & contiguous, [False]))
+        run_starts = np.flatnonzero(above & ~prev_above)
+        run_ends = np.flatnonzero(above & ~next_above)
+
+        has_prev = np.concatenate(([False], contiguous))
+        has_next = np.concatenate((contiguous, [False]))
+        last = len(t) - 1
+
+        # Horizon-crossing brackets; a run touching the window edge keeps its edge sample
+        crossing = elevation - self.min_elevation
+        aos_a = np.where(has_prev[run_starts], run_starts - 1, run_starts)
+        los_b = np.where(has_next[run_ends], np.minimum(run_ends + 1, last), run_ends)
+        a = np.concatenate((t[aos_a], t[run_ends]))
+        b = np.concatenate((t[run_starts], t[los_b]))
+        fa = np.concatenate((crossing[aos_a], crossing[run_ends]))
+        fb = np.concatenate((crossing[run_starts], crossing[los_b]))
+
+        # Culmination: parabola through sin(elevation), which stays smooth even for overhead passes
+        peaks = np.array([s + np.argmax(elevation[s:e + 1]) for s, e in zip(run_starts, run_ends)])
+        sin_el = np.sin(elevation)
+        tca = t[peaks] + self._vertex_offset(
+            sin_el[np.where(has_prev[peaks], peaks - 1, peaks)], sin_el[peaks],
+            sin_el[np.where(has_next[peaks], np.minimum(peaks + 1, last), peaks)],
+            self.fine_step
+        )
+        tca = np.clip(tca, t[run_starts], t[run_ends])
+
+        n = len(run_starts)
+        half_width = self.fine_step / 4
+        for _ in range(REFINE_ITERATIONS):
+            # Illinois (modified regula falsi) step on both crossings of every pass
+            slope = fb - fa
+            x = np.where(slope != 0, b - fb * (b - a) / np.where(slope != 0, slope, 1.0), b)
+
+            _, el = self._elevation(record.satrec, jd0, fr0, np.concatenate((
+                x, tca - half_width, tca, tca + half_width
+            )))
+            fx = el[:2 * n] - self.min_elevation
+            switch = np.sign(fx) != np.sign(fb)
+            a, fa = np.where(switch, b, a), np.where(switch, fb, fa / 2)
+            b, fb = x, fx
+
+            sin_el = np.sin(el[2 * n:])
+            tca = tca + self._vertex_offset(sin_el[:n], sin_el[n:2 * n], sin_el[2 * n:], half_width)
+            half_width /= 4
+
+        aos, los = b[:n], b[n:]
+        azimuth, elevation = self._elevation(record.satrec, jd0, fr0, np.concatenate((aos, tca, los)))
+        azimuth, elevation = np.degrees(azimuth).tolist(), np.degrees(elevation).tolist()
+        aos, tca, los = aos.tolist(), tca.tolist(), los.tolist()
+
+        return [
+            (aos[k], {
+                'name': record.name,
+                'norad_id': record.norad_id,
+                'aos': (start + timedelta(seconds=aos[k])).isoformat(),
+                'tca': (start + timedelta(seconds=tca[k])).isoformat(),
+                'los': (start + timedelta(seconds=los[k])).isoformat(),
+                'duration': los[k] - aos[k],
+                'max_elevation': elevation[n + k],
+                'aos_azimuth': azimuth[k],
+                'tca_azimuth': azimuth[n + k],
+                'los_azimuth': azimuth[2 * n + k],
+                'aos_truncated': aos[k] <= 0.0,
+                'los_truncated': los[k] >= duration
+            })
+            for k in range(n)
+        ]
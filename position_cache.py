@@ -0,0 +1,117 @@
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+class PositionCache:
+    """Bounded LRU cache of propagated positions keyed by (NORAD ID, time quantum)"""
+
+    def __init__(self, max_entries=4096, quantum=1.0):
+        self.max_entries = max_entries
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def quantize(self, timestamp):
+        """Return (bucket, bucket start time) for a naive UTC timestamp"""
+        bucket = math.floor((timestamp - UNIX_EPOCH).total_seconds() / self.quantum)
+        return bucket, UNIX_EPOCH + timedelta(seconds=bucket * self.quantum)
+
+    def get(self, record, bucket):
+        """Cached value for this exact element set and bucket, or None"""
+        key = (record.norad_id, bucket)
+        with self.lock:
+            entry = self.entries.get(key)
+            # A different record object means the TLE changed since this was cached
+            if entry is None or entry[0] is not record:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_or_compute(self, record, bucket, compute):
+        """Cached value, or compute() run once while concurrent misses on the same key wait for it.
+
+        None results (SGP4 errors) are handed to the waiters but not cached.
+        """
+        key = (record.norad_id, bucket)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] is record:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            flight = self.inflight.get(key)
+            if flight is not None and flight[0] is record:
+                self.coalesced += 1
+                future = flight[1]
+                owner = False
+            else:
+                self.misses += 1
+                future = Future()
+                self.inflight[key] = (record, future)
+                owner = True
+
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            if value is not None:
+                self.put(record, bucket, value)
+            return value
+        finally:
+            with self.lock:
+                if self.inflight.get(key, (None, None))[1] is future:
+                    del self.inflight[key]
+
+    def put(self, record, bucket, value):
+        key = (record.norad_id, bucket)
+        with self.lock:
+            self.entries[key] = (record, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, norad_ids):
+        """Drop every cached bucket for the given NORAD IDs"""
+        norad_ids = set(norad_ids)
+        if not norad_ids:
+            return
+        with self.lock:
+            stale = [key for key in self.entries if key[0] in norad_ids]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'quantum_seconds': self.quantum,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'in_flight': len(self.inflight),
+                'hit_ratio': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
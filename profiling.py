@@ -0,0 +1,248 @@
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+
+PHASES = ('resolve', 'propagate', 'convert', 'telemetry', 'serialize')
+
+_recorder = ContextVar('phase_recorder', default=None)
+
+
+class PhaseRecorder:
+    """Exclusive wall time per phase for one request.
+
+    Phases nest: time spent in an inner phase is not counted again in the
+    phase around it, so the totals add up to at most the request duration.
+    """
+
+    __slots__ = ('totals', 'stack')
+
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+
+    def start(self, name):
+        self.stack.append((name, time.perf_counter()))
+
+    def stop(self):
+        name, started = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+        if self.stack:
+            outer = self.stack[-1][0]
+            self.totals[outer] = self.totals.get(outer, 0.0) - elapsed
+
+
+class _Phase:
+    __slots__ = ('name', 'recorder')
+
+    def __init__(self, name, recorder):
+        self.name = name
+        self.recorder = recorder
+
+    def __enter__(self):
+        self.recorder.start(self.name)
+
+    def __exit__(self, *exc):
+        self.recorder.stop()
+
+
+_NO_PHASE = nullcontext()
+
+
+def phase(name):
+    """Context manager timing a block as ``name`` for the current request (a no-op outside one)"""
+    recorder = _recorder.get()
+    return _NO_PHASE if recorder is None else _Phase(name, recorder)
+
+
+def timed_phase(name):
+    """Decorator recording every call of a function as phase ``name``"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder.get()
+            if recorder is None:
+                return fn(*args, **kwargs)
+            with _Phase(name, recorder):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_request():
+    """Start recording phases in the current context; returns the recorder"""
+    recorder = PhaseRecorder()
+    _recorder.set(recorder)
+    return recorder
+
+
+def end_request():
+    """Stop recording phases; returns the recorder that was active, if any"""
+    recorder = _recorder.get()
+    _recorder.set(None)
+    return recorder
+
+
+class SlowRequestLog:
+    """The last ``size`` requests that took at least ``threshold`` seconds"""
+
+    def __init__(self, threshold, size):
+        self.threshold = threshold
+        self.entries = deque(maxlen=size)
+        self.lock = threading.Lock()
+        self.recorded = 0
+
+    def maybe_record(self, duration, **details):
+        if duration < self.threshold:
+            return False
+        entry = dict(details, timestamp=datetime.utcnow().isoformat(), duration=duration)
+        with self.lock:
+            self.entries.append(entry)
+            self.recorded += 1
+        return True
+
+    def snapshot(self):
+        with self.lock:
+            return list(reversed(self.entries))
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every ``interval`` seconds from a helper thread.
+
+    Stacks are counted in collapsed form (``outer;inner;leaf count``), the
+    input format of flamegraph tools. Sampling needs the GIL, so long
+    C calls that hold it show up as fewer, longer samples.
+    """
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples = Counter()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.thread.join()
+        return self
+
+    def _run(self):
+        while not self.stopping.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+
+class RequestProfiler:
+    """Deterministic (cProfile, pstats output) or sampling (collapsed stacks) profile of one request.
+
+    Both modes only see the thread serving the request: work handed to the
+    TLE fetch executor, the conjunction process pool or the stream ticker is
+    not in the profile. One request is profiled at a time per process, since
+    cProfile hooks the interpreter and a second profiler would skew the first.
+    """
+
+    scope = 'request-thread'
+    active = threading.Lock()
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.profiler = cProfile.Profile() if mode == 'pstats' else SamplingProfiler()
+
+    def start(self):
+        """Start profiling; False (and nothing started) while another request is being profiled"""
+        if not self.active.acquire(blocking=False):
+            return False
+        if self.mode == 'pstats':
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+        return True
+
+    def stop(self):
+        try:
+            if self.mode == 'pstats':
+                self.profiler.disable()
+                self.profiler.create_stats()
+                return marshal.dumps(self.profiler.stats)
+            return self.profiler.stop().collapsed().encode()
+        finally:
+            self.active.release()
+
+
+class _LoadedStats:
+    """What pstats.Stats accepts in place of a live profiler"""
+
+    def __init__(self, data):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+
+def pstats_summary(data, limit=40):
+    """Human-readable top functions by cumulative time from marshalled pstats data"""
+    stream = io.StringIO()
+    pstats.Stats(_LoadedStats(data), stream=stream).sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+class ProfileStore:
+    """The most recent request profiles, by id; also written to ``directory`` when given"""
+
+    extensions = {'pstats': 'prof', 'collapsed': 'collapsed'}
+
+    def __init__(self, size, directory=None):
+        self.size = size
+        self.directory = directory
+        self.profiles = OrderedDict()
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def put(self, mode, data, **details):
+        profile_id = uuid.uuid4().hex[:16]
+        if self.directory:
+            with open(os.path.join(self.directory, f'{profile_id}.{self.extensions[mode]}'), 'wb') as f:
+                f.write(data)
+        with self.lock:
+            self.profiles[profile_id] = dict(details, mode=mode, data=data,
+                                             timestamp=datetime.utcnow().isoformat())
+            while len(self.profiles) > self.size:
+                self.profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id):
+        with self.lock:
+            return self.profiles.get(profile_id)
+
+    def index(self):
+        with self.lock:
+            return [
+                {key: value for key, value in profile.items() if key != 'data'} | {'id': profile_id}
+                for profile_id, profile in reversed(self.profiles.items())
+            ]
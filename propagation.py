@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sgp4.api import SGP4_ERRORS as SGP4_ERROR_MESSAGES, SatrecArray, jday
+from coordinates import teme_to_geodetic
+
+JD_UNIX_EPOCH = 2440587.5
+SECONDS_PER_DAY = 86400.0
+CHUNK_SIZE = 256  # satellites per SatrecArray call in the chunked catalogue sweeps
+
+
+def jd_to_datetime(jd, fr=0.0):
+    """Convert a Julian date (optionally split as jd + fr) to a naive UTC datetime"""
+    return datetime(1970, 1, 1) + timedelta(days=(jd - JD_UNIX_EPOCH) + fr)
+
+
+def naive_utc(timestamp):
+    """The naive UTC datetime the propagators expect; aware datetimes are converted, naive ones kept"""
+    if timestamp is not None and timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def julian_date(timestamp):
+    """SGP4 (jd, fr) of one naive UTC datetime, keeping its microseconds"""
+    return jday(timestamp.year, timestamp.month, timestamp.day, timestamp.hour, timestamp.minute,
+                timestamp.second + timestamp.microsecond / 1e6)
+
+
+def julian_dates(timestamps):
+    """Convert a sequence of datetimes to SGP4 (jd, fr) arrays"""
+    jd = np.empty(len(timestamps))
+    fr = np.empty(len(timestamps))
+    for i, ts in enumerate(timestamps):
+        jd[i], fr[i] = julian_date(ts)
+    return jd, fr
+
+
+def offset_dates(jd0, fr0, offsets):
+    """(jd, fr) arrays for offsets in seconds after the Julian date jd0 + fr0"""
+    offsets = np.asarray(offsets, dtype=float)
+    return np.full(len(offsets), jd0), fr0 + offsets / SECONDS_PER_DAY
+
+
+def time_grid(start, span, step):
+    """Build (jd, fr, offsets) arrays sampling [start, start + span) every step seconds"""
+    offsets = np.arange(0.0, span, step)
+    jd, fr = offset_dates(*julian_date(start), offsets)
+    return jd, fr, offsets
+
+
+def geodetic_snapshot(norad_ids, e, r, v, jd, fr, limit=None):
+    """Columnar geodetic snapshot of N TEME states at one instant (the first ``limit`` only)"""
+    in_range = np.arange(len(norad_ids)) < limit if limit is not None else np.ones(len(norad_ids), dtype=bool)
+    ok = in_range & (e == 0)
+    failed = in_range & (e != 0)
+    lat, lon, alt = teme_to_geodetic(r[ok], jd, fr)
+
+    return {
+        'index': np.flatnonzero(ok),
+        'norad_id': norad_ids[ok],
+        'latitude': np.degrees(lat),
+        'longitude': np.degrees(lon),
+        'altitude': alt,
+        'velocity': np.linalg.norm(v[ok], axis=-1),
+        'error_norad_id': norad_ids[failed],
+        'error_code': e[failed],
+    }
+
+
+class ConstellationEngine:
+    """Batch SGP4 propagator holding one SatrecArray for a satellite group"""
+
+    def __init__(self, names, norad_ids, satrecs):
+        self.names = list(names)
+        self.norad_ids = np.asarray(norad_ids, dtype=np.int64)
+        self.satrec_array = SatrecArray(list(satrecs)) if self.names else None
+
+    def __len__(self):
+        return len(self.names)
+
+    def propagate(self, jd, fr):
+        """Propagate every satellite over the (jd, fr) time arrays -> e, r, v of shape (N, T, ...)"""
+        if self.satrec_array is None:
+            return (np.zeros((0, len(jd)), dtype=np.uint8),
+                    np.zeros((0, len(jd), 3)), np.zeros((0, len(jd), 3)))
+        return self.satrec_array.sgp4(np.asarray(jd, dtype=float), np.asarray(fr, dtype=float))
+
+    def positions_at(self, timestamp, limit=None):
+        """Geodetic snapshot of the whole group at one instant, as columnar arrays"""
+        jd, fr = julian_dates([timestamp])
+        e, r, v = self.propagate(jd, fr)
+        return geodetic_snapshot(self.norad_ids, e[:, 0], r[:, 0], v[:, 0], jd[0], fr[0], limit)
+
+    def positions_over(self, jd, fr):
+        """Geodetic positions of every satellite at every time as dense (N, T) arrays.
+
+        Entries SGP4 rejected are NaN; ``error_code`` holds the SGP4 code (0 = ok).
+        """
+        e, r, v = self.propagate(jd, fr)
+        ok = e == 0
+        with np.errstate(invalid='ignore'):
+            lat, lon, alt = teme_to_geodetic(r, jd, fr)
+            velocity = np.linalg.norm(v, axis=-1)
+
+        columns = {'error_code': e}
+        for field, values in (('latitude', np.degrees(lat)), ('longitude', np.degrees(lon)),
+                              ('altitude', alt), ('velocity', velocity)):
+            columns[field] = np.where(ok, values, np.nan)
+        return columns
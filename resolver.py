@@ -0,0 +1,75 @@
+NGRAM = 3
+
+
+class SatelliteResolver:
+    """Immutable lookup index over catalogue names, NORAD IDs and aliases"""
+
+    def __init__(self, names, norad_ids, aliases=None):
+        self.names = list(names)
+        self.upper_names = [name.upper() for name in self.names]
+        self.exact = {}
+        self.norad = {}
+        self.ngrams = {}
+
+        for i, (upper, norad_id) in enumerate(zip(self.upper_names, norad_ids)):
+            self.exact.setdefault(upper, i)
+            self.norad.setdefault(int(norad_id), i)
+            for gram in {upper[j:j + NGRAM] for j in range(len(upper) - NGRAM + 1)}:
+                self.ngrams.setdefault(gram, []).append(i)
+
+        self.aliases = {
+            alias.upper(): [full_name.upper() for full_name in full_names]
+            for alias, full_names in (aliases or {}).items()
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, search_name):
+        """Return the catalogue name matching a name, NORAD ID, alias or substring"""
+        index = self.resolve_index(search_name)
+        return self.names[index] if index is not None else None
+
+    def resolve_index(self, search_name):
+        """Return the catalogue position matching a name, NORAD ID, alias or substring"""
+        search_name = search_name.upper().strip()
+        if not search_name:
+            return None
+
+        # Exact name match
+        index = self.exact.get(search_name)
+        if index is not None:
+            return index
+
+        # NORAD catalogue number
+        if search_name.isdigit():
+            index = self.norad.get(int(search_name))
+            if index is not None:
+                return index
+
+        # Alias match
+        for full_name in self.aliases.get(search_name, ()):
+            index = self._find_substring(full_name)
+            if index is not None:
+                return index
+
+        # Partial match (contains search term)
+        return self._find_substring(search_name)
+
+    def _find_substring(self, needle):
+        """Index of the first name containing needle, using the n-gram postings"""
+        if len(needle) < NGRAM:
+            candidates = range(len(self.upper_names))
+        else:
+            postings = []
+            for j in range(len(needle) - NGRAM + 1):
+                posting = self.ngrams.get(needle[j:j + NGRAM])
+                if posting is None:
+                    return None
+                postings.append(posting)
+            candidates = min(postings, key=len)
+
+        for i in candidates:
+            if needle in self.upper_names[i]:
+                return i
+        return None
@@ -0,0 +1,221 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from datetime import datetime
+
+import numpy as np
+from sgp4.api import Satrec
+from catalogue import CatalogueSnapshot, GroupSnapshot, SatelliteRecord
+
+MAGIC = b'GSCATLG1'
+HEADER = struct.Struct('<8sQQ')  # magic, catalogue version, metadata length
+ALIGNMENT = 8
+TLE_LINE = 'S69'
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_catalogue(path, catalogue):
+    """Write a catalogue snapshot as one file and atomically swap it into place.
+
+    Layout: header, JSON metadata, then 8-byte aligned arrays (NORAD IDs,
+    both TLE lines, a names blob with offsets and the concatenated group
+    member indexes). Readers that still map the previous file keep a
+    consistent view; new readers see the new inode.
+    """
+    records = catalogue.records
+    names = [record.name.encode('utf-8') for record in records]
+    name_offsets = np.zeros(len(records) + 1, dtype='<i8')
+    np.cumsum([len(name) for name in names], out=name_offsets[1:])
+
+    groups = {}
+    member_arrays = []
+    member_offset = 0
+    for key, group in catalogue.groups.items():
+        members = catalogue.members[key]
+        groups[key] = {
+            'fetched_at': group.fetched_at.isoformat() if group.fetched_at else None,
+            'start': member_offset,
+            'count': len(members)
+        }
+        member_arrays.append(members)
+        member_offset += len(members)
+
+    sections = {
+        'norad_id': np.array([record.norad_id for record in records], dtype='<i4'),
+        'line1': np.array([record.line1.encode('ascii') for record in records], dtype=TLE_LINE),
+        'line2': np.array([record.line2.encode('ascii') for record in records], dtype=TLE_LINE),
+        'name_offsets': name_offsets,
+        'names': np.frombuffer(b''.join(names), dtype='u1'),
+        'members': np.concatenate(member_arrays).astype('<i4') if member_arrays else np.empty(0, '<i4')
+    }
+
+    layout = {}
+    offset = 0
+    for section, array in sections.items():
+        layout[section] = {'offset': offset, 'dtype': array.dtype.str, 'count': len(array)}
+        offset = _align(offset + array.nbytes)
+    metadata = json.dumps({
+        'written_at': datetime.utcnow().isoformat(),
+        'count': len(records),
+        'groups': groups,
+        'sections': layout
+    }).encode()
+    data_start = _align(HEADER.size + len(metadata))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, catalogue.version, len(metadata)))
+            f.write(metadata)
+            for section, array in sections.items():
+                f.seek(data_start + layout[section]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.chmod(tmp_path, 0o644)  # workers may run as another user
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class SharedCatalogueView:
+    """Read-only mapping of one catalogue file; arrays are zero-copy views"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.identity = self._identity(os.fstat(f.fileno()))
+            self.mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.version, metadata_length = HEADER.unpack_from(self.mapped)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a shared catalogue file')
+        metadata = json.loads(self.mapped[HEADER.size:HEADER.size + metadata_length])
+        data_start = _align(HEADER.size + metadata_length)
+
+        self.written_at = datetime.fromisoformat(metadata['written_at'])
+        self.groups = metadata['groups']
+        self.arrays = {
+            section: np.frombuffer(self.mapped, dtype=spec['dtype'], count=spec['count'],
+                                   offset=data_start + spec['offset'])
+            for section, spec in metadata['sections'].items()
+        }
+
+    @staticmethod
+    def _identity(stat):
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def __len__(self):
+        return len(self.arrays['norad_id'])
+
+    def name(self, i):
+        offsets = self.arrays['name_offsets']
+        return self.arrays['names'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def to_snapshot(self, aliases=None, version=0, known=None):
+        """Build a CatalogueSnapshot, reusing records in ``known`` whose elements are unchanged"""
+        known = known or {}
+        line1s = self.arrays['line1']
+        line2s = self.arrays['line2']
+        records = []
+        for i, norad_id in enumerate(self.arrays['norad_id'].tolist()):
+            name = self.name(i)
+            line1 = line1s[i].decode('ascii')
+            line2 = line2s[i].decode('ascii')
+            record = known.get(norad_id)
+            if record is None or record.line1 != line1 or record.line2 != line2 or record.name != name:
+                record = SatelliteRecord(norad_id, name, line1, line2, Satrec.twoline2rv(line1, line2))
+            records.append(record)
+
+        members = self.arrays['members']
+        groups = {}
+        for key, group in self.groups.items():
+            fetched_at = datetime.fromisoformat(group['fetched_at']) if group['fetched_at'] else None
+            indexes = members[group['start']:group['start'] + group['count']].tolist()
+            groups[key] = GroupSnapshot(key, [records[i] for i in indexes], fetched_at)
+        return CatalogueSnapshot(groups, aliases, version)
+
+    def close(self):
+        self.arrays = {}
+        try:
+            self.mapped.close()
+        except BufferError:
+            pass  # an array view is still referenced; the mapping goes with it
+
+
+class SharedCatalogue:
+    """A catalogue file written by one updater process and mapped by request workers.
+
+    Workers cannot fetch; refresh requests are dropped into ``<path>.requests/``
+    for the updater to pick up on its next poll.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.request_dir = path + '.requests'
+        self.view = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def publish(self, catalogue):
+        write_catalogue(self.path, catalogue)
+
+    def changed(self):
+        """True if the file on disk is not the one currently mapped"""
+        try:
+            identity = SharedCatalogueView._identity(os.stat(self.path))
+        except FileNotFoundError:
+            return False
+        return self.view is None or identity != self.view.identity
+
+    def attach(self):
+        """Map the current file (closing the previous mapping); None if not written yet"""
+        try:
+            view = SharedCatalogueView(self.path)
+        except FileNotFoundError:
+            return None
+        previous, self.view = self.view, view
+        if previous is not None:
+            previous.close()
+        return view
+
+    def request_refresh(self, group=None, force=False):
+        os.makedirs(self.request_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.request_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'group': group, 'force': force}, f)
+        os.replace(tmp_path, tmp_path[:-len('.tmp')] + '.json')
+
+    def take_requests(self):
+        """Consume queued refresh requests as (group, force) pairs"""
+        try:
+            entries = sorted(os.listdir(self.request_dir))
+        except FileNotFoundError:
+            return []
+
+        requests = []
+        for entry in entries:
+            if not entry.endswith('.json'):
+                continue
+            request_path = os.path.join(self.request_dir, entry)
+            try:
+                with open(request_path) as f:
+                    request = json.load(f)
+                os.unlink(request_path)
+            except (OSError, ValueError):
+                continue
+            requests.append((request.get('group'), bool(request.get('force'))))
+        return requests
+
+    def stats(self):
+        view = self.view
+        return {
+            'path': self.path,
+            'attached_version': view.version if view else None,
+            'written_at': view.written_at.isoformat() if view else None,
+            'satellites': len(view) if view else 0
+        }
@@ -80,10 +80,18 @@ const AdvancedTelemetryDashboard = ({ satelliteData, isConnected }) => {
     try {
       const hours = selectedTimeRange === '1h' ? 1 : selectedTimeRange === '6h' ? 6 : 24;
       const response = await axios.get(
-        `http://localhost:5000/api/satellite/ISS/telemetry/historical?hours=${hours}`
+        `http://localhost:5000/api/satellite/ISS/telemetry/historical?hours=${hours}&step=${hours * 10}`
       );
       
-      const data = response.data;
+      // Columnar response: one array per field
+      const columns = response.data;
+      const data = (columns.timestamp || []).map((timestamp, i) => {
+        const point = { timestamp };
+        Object.keys(columns).forEach(key => {
+          if (Array.isArray(columns[key])) point[key] = columns[key][i];
+        });
+        return point;
+      });
       setHistoricalData(processHistoricalData(data));
       
     } catch (error) {
@@ -63,6 +63,22 @@ const GroundStationDashboard = () => {
     fetchSatelliteGroups();
   }, []);
 
+  // Positions are pushed by the server's shared stream ticker; telemetry and the orbit are still polled
+  useEffect(() => {
+    if (!selectedSatellite) return undefined;
+    const source = new EventSource(`${API_BASE}/stream?satellites=${encodeURIComponent(selectedSatellite)}&interval=1`);
+    source.addEventListener('positions', (event) => {
+      const frame = JSON.parse(event.data);
+      if (frame.satellites.length) {
+        setSatellitePosition({ ...frame.satellites[0], timestamp: frame.timestamp });
+        setIsConnected(true);
+      }
+    });
+    // EventSource reconnects by itself (the server sends retry: 5000)
+    source.onerror = () => setIsConnected(false);
+    return () => source.close();
+  }, [selectedSatellite]);
+
   useEffect(() => {
     if (selectedSatellite) {
       fetchData();
@@ -71,6 +87,12 @@ const GroundStationDashboard = () => {
     }
   }, [selectedSatellite]);
 
+  useEffect(() => {
+    if (viewMode === '3d' && viewerRef.current && satellitePosition?.latitude && satellitePosition?.longitude) {
+      updateSatelliteVisualization(satellitePosition, orbitPath);
+    }
+  }, [satellitePosition, orbitPath, viewMode]);
+
   const initializeCesium = async () => {
     if (!cesiumContainerRef.current || !window.Cesium) return;
 
@@ -118,24 +140,20 @@ const GroundStationDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const posResponse = await fetch(`${API_BASE}/satellite/${encodeURIComponent(selectedSatellite)}/position`);
-      const posData = await posResponse.json();
-      setSatellitePosition(posData);
-
       const telResponse = await fetch(`${API_BASE}/satellite/${encodeURIComponent(selectedSatellite)}/telemetry`);
       const telData = await telResponse.json();
       setTelemetryData(telData);
 
       const orbitResponse = await fetch(`${API_BASE}/satellite/${encodeURIComponent(selectedSatellite)}/orbit`);
       const orbitData = await orbitResponse.json();
-      setOrbitPath(orbitData);
+      const orbitPoints = (orbitData.latitude || []).map((latitude, i) => ({
+        latitude,
+        longitude: orbitData.longitude[i],
+        altitude: orbitData.altitude[i]
+      }));
+      setOrbitPath(orbitPoints);
 
-      setIsConnected(true);
       checkAlerts(telData);
-      
-      if (viewMode === '3d' && viewerRef.current && posData.latitude && posData.longitude) {
-        updateSatelliteVisualization(posData, orbitData);
-      }
     } catch (error) {
       console.error('Error fetching data:', error);
       setIsConnected(false);
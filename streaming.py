@@ -0,0 +1,194 @@
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import numpy as np
+from propagation import ConstellationEngine
+from structured_logging import get_logger
+
+logger = get_logger('streaming')
+
+STREAM_FIELDS = ('latitude', 'longitude', 'altitude', 'velocity')
+
+
+class StreamSubscriber:
+    """One connected client: what it follows, how often, and its bounded frame queue"""
+
+    def __init__(self, norad_ids, groups, every, queue_size):
+        self.norad_ids = tuple(norad_ids)
+        self.groups = tuple(groups)
+        self.every = every
+        self.frames = deque(maxlen=queue_size)
+        self.ready = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, frame):
+        """Queue a frame; returns True if the oldest queued frame had to be dropped"""
+        with self.ready:
+            # A full queue keeps the newest frames; the client simply skips ahead
+            dropped = len(self.frames) == self.frames.maxlen
+            self.dropped += dropped
+            self.frames.append(frame)
+            self.ready.notify()
+            return dropped
+
+    def next_frame(self, timeout):
+        """Oldest queued frame, or None after timeout"""
+        with self.ready:
+            if not self.frames and not self.closed:
+                self.ready.wait(timeout)
+            return self.frames.popleft() if self.frames else None
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify()
+
+
+class StreamHub:
+    """Shared position ticker behind the streaming endpoint.
+
+    Every ``tick`` seconds the hub propagates the union of what the due
+    subscribers follow (each group once through its engine, individual
+    satellites in one SatrecArray), serializes each satellite/group once and
+    fans the resulting frames out. Work per tick scales with distinct
+    satellites, not with the number of clients.
+    """
+
+    def __init__(self, tracker, tick=1.0, queue_size=8, max_dropped=64):
+        self.tracker = tracker
+        self.tick = tick
+        self.queue_size = queue_size
+        self.max_dropped = max_dropped
+        self.subscribers = set()
+        self.lock = threading.Condition()
+        self.thread = None
+        self.stopping = threading.Event()
+        self.engine_cache = (None, None)
+        self.ticks = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.disconnected = 0
+        self.last_tick_satellites = 0
+        self.last_tick_seconds = 0.0
+
+    def subscribe(self, norad_ids, groups, interval):
+        subscriber = StreamSubscriber(norad_ids, groups, max(1, round(interval / self.tick)), self.queue_size)
+        with self.lock:
+            self.subscribers.add(subscriber)
+            if self.thread is None or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self._run, name='stream-hub', daemon=True)
+                self.thread.start()
+            self.lock.notify()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def stop(self, timeout=None):
+        """Stop the ticker thread and close every subscriber (a later subscribe starts it again)"""
+        with self.lock:
+            self.stopping.set()
+            subscribers, self.subscribers = self.subscribers, set()
+            self.lock.notify_all()
+        for subscriber in subscribers:
+            subscriber.close()
+        thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self.stopping.is_set():
+            with self.lock:
+                while not self.subscribers and not self.stopping.is_set():
+                    self.lock.wait()
+                    next_tick = time.monotonic()
+                if self.stopping.is_set():
+                    return
+                due = [s for s in self.subscribers if self.ticks % s.every == 0]
+                self.ticks += 1
+
+            if due:
+                try:
+                    self._publish(due)
+                except Exception:
+                    logger.exception("❌ Stream tick failed")
+
+            next_tick += self.tick
+            self.stopping.wait(max(0.0, next_tick - time.monotonic()))
+
+    def _publish(self, due):
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        catalogue = self.tracker.catalogue
+
+        group_keys = {key for s in due for key in s.groups if key in catalogue.groups}
+        norad_ids = sorted({n for s in due for n in s.norad_ids if n in catalogue.norad_index})
+
+        groups = {key: self._group_json(catalogue.groups[key], now) for key in group_keys}
+        satellites = self._satellite_json([catalogue.records[catalogue.norad_index[n]] for n in norad_ids], now)
+
+        timestamp = json.dumps(now.isoformat())
+        for subscriber in due:
+            parts = [satellites[n] for n in subscriber.norad_ids if n in satellites]
+            group_parts = [f'{json.dumps(key)}:{groups[key]}' for key in subscriber.groups if key in groups]
+            self.frames_dropped += subscriber.push(
+                f'{{"timestamp":{timestamp},"satellites":[{",".join(parts)}],"groups":{{{",".join(group_parts)}}}}}'
+            )
+
+            if subscriber.dropped > self.max_dropped:
+                # Persistently slow consumer: stop buffering for it
+                self.unsubscribe(subscriber)
+                self.disconnected += 1
+
+        self.frames_sent += len(due)
+        self.last_tick_satellites = len(norad_ids) + sum(len(catalogue.groups[key]) for key in group_keys)
+        self.last_tick_seconds = time.perf_counter() - started
+
+    def _satellite_json(self, records, now):
+        """NORAD ID -> serialized position for individually followed satellites"""
+        if not records:
+            return {}
+
+        # Reuse the SatrecArray while the followed set and its elements stay the same
+        key, engine = self.engine_cache
+        if key != tuple(records):
+            key = tuple(records)
+            engine = ConstellationEngine([r.name for r in records], [r.norad_id for r in records],
+                                         [r.satrec for r in records])
+            self.engine_cache = (key, engine)
+
+        snapshot = engine.positions_at(now)
+        columns = [np.round(snapshot[field], 5).tolist() for field in STREAM_FIELDS]
+        return {
+            norad_id: json.dumps(dict(zip(('name', 'norad_id') + STREAM_FIELDS, (records[i].name, norad_id) + row)))
+            for i, norad_id, row in zip(snapshot['index'].tolist(), snapshot['norad_id'].tolist(), zip(*columns))
+        }
+
+    def _group_json(self, group, now):
+        """One serialized columnar frame for a whole group"""
+        snapshot = group.engine.positions_at(now)
+        frame = {'count': len(snapshot['norad_id']), 'norad_id': snapshot['norad_id'].tolist()}
+        for field in STREAM_FIELDS:
+            frame[field] = np.round(snapshot[field], 5).tolist()
+        return json.dumps(frame)
+
+    def stats(self):
+        with self.lock:
+            subscribers = len(self.subscribers)
+        return {
+            'subscribers': subscribers,
+            'tick_seconds': self.tick,
+            'ticks': self.ticks,
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'disconnected_slow_consumers': self.disconnected,
+            'last_tick_satellites': self.last_tick_satellites,
+            'last_tick_duration': self.last_tick_seconds
+        }
@@ -0,0 +1,62 @@
+import json
+import logging
+import sys
+from datetime import datetime
+
+LOGGER_NAME = 'ground_station'
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+STANDARD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def record_fields(record):
+    """Structured fields attached to a record via ``extra``"""
+    return {key: value for key, value in vars(record).items() if key not in STANDARD_ATTRIBUTES}
+
+
+class TextFormatter(logging.Formatter):
+    """``time LEVEL logger message key=value ...``"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = record_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the record's structured fields at top level"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.utcfromtimestamp(record.created).isoformat() + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(record_fields(record))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def get_logger(component=None):
+    return logging.getLogger(f'{LOGGER_NAME}.{component}' if component else LOGGER_NAME)
+
+
+def configure_logging(level='INFO', fmt='text', stream=None):
+    """Attach one handler to the application's logger tree (the root logger is left alone)"""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    return logger
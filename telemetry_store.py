@@ -0,0 +1,204 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+BLOCK_SIZE = 360  # samples generated per seeded block
+
+
+class TelemetryRing:
+    """Fixed-capacity, time-ordered ring of telemetry samples for one satellite.
+
+    Sample times (unix seconds, NaN when empty) and float32 field values live
+    in one structured array, optionally backed by a memory-mapped file so the
+    history survives restarts and only touched pages stay resident.
+    """
+
+    def __init__(self, n_fields, capacity, path=None):
+        self.capacity = capacity
+        self.dtype = np.dtype([('time', 'f8'), ('values', 'f4', (n_fields,))])
+        self.lock = threading.Lock()
+
+        if path is None:
+            self.data = np.empty(capacity, dtype=self.dtype)
+            self.data['time'] = np.nan
+        else:
+            expected = capacity * self.dtype.itemsize
+            reuse = os.path.exists(path) and os.path.getsize(path) == expected
+            self.data = np.memmap(path, dtype=self.dtype, mode='r+' if reuse else 'w+', shape=(capacity,))
+            if not reuse:
+                self.data['time'] = np.nan
+
+        # Recover the write position from the stored times
+        filled = ~np.isnan(self.data['time'])
+        self.count = int(filled.sum())
+        self.head = (int(np.nanargmax(self.data['time'])) + 1) % capacity if self.count else 0
+
+    @property
+    def last_time(self):
+        return float(self.data['time'][self.head - 1]) if self.count else None
+
+    def append(self, times, values):
+        """Append samples newer than last_time; the oldest are overwritten when full"""
+        times, values = times[-self.capacity:], values[-self.capacity:]
+        n = len(times)
+        first = min(n, self.capacity - self.head)
+
+        self.data['time'][self.head:self.head + first] = times[:first]
+        self.data['values'][self.head:self.head + first] = values[:first]
+        self.data['time'][:n - first] = times[first:]
+        self.data['values'][:n - first] = values[first:]
+
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.capacity, self.count + n)
+
+    def ordered(self):
+        """All stored samples, oldest first"""
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+    def range(self, start, end):
+        """(times, values) for start <= time < end, skipping samples that failed to propagate"""
+        samples = self.ordered()
+        lo, hi = np.searchsorted(samples['time'], (start, end))
+        samples = samples[lo:hi]
+        valid = ~np.isnan(samples['values'][:, 0])
+        return samples['time'][valid], samples['values'][valid]
+
+    def flush(self):
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+
+class TelemetryStore:
+    """Per-satellite telemetry history on a fixed time grid.
+
+    Samples are generated lazily in seeded blocks of BLOCK_SIZE grid points,
+    so the value at a grid time depends only on (seed, key, time) and never
+    changes once stored. At most ``max_series`` rings are kept open.
+    """
+
+    def __init__(self, fields, resolution=10.0, retention=86400.0, max_series=64, directory=None, seed=0):
+        self.fields = list(fields)
+        self.resolution = float(resolution)
+        self.capacity = int(retention // resolution)
+        self.max_series = max_series
+        self.directory = directory
+        self.seed = seed
+        self.rings = OrderedDict()
+        self.lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def retention(self):
+        return self.capacity * self.resolution
+
+    def ring(self, key):
+        """Open (or create) the ring for a series, evicting the least recently used"""
+        with self.lock:
+            ring = self.rings.get(key)
+            if ring is None:
+                path = os.path.join(self.directory, f'{key}.ring') if self.directory else None
+                ring = TelemetryRing(len(self.fields), self.capacity, path)
+                self.rings[key] = ring
+                while len(self.rings) > self.max_series:
+                    _, evicted = self.rings.popitem(last=False)
+                    evicted.flush()
+            self.rings.move_to_end(key)
+            return ring
+
+    def read(self, key, start, end, sampler):
+        """(times, values) on the grid in [start, end) unix seconds, generating missing samples.
+
+        ``sampler(times, rng)`` returns a dict of field arrays for the given
+        times; rows it cannot compute should be NaN.
+        """
+        ring = self.ring(key)
+        with ring.lock:
+            self._extend(ring, key, end, sampler)
+            return ring.range(start, end)
+
+    def _extend(self, ring, key, end, sampler):
+        last = int(np.ceil(end / self.resolution)) - 1
+        first = last - self.capacity + 1
+        if ring.count:
+            first = max(first, int(round(ring.last_time / self.resolution)) + 1)
+        if first > last:
+            return
+
+        for block in range(first // BLOCK_SIZE, last // BLOCK_SIZE + 1):
+            index = block * BLOCK_SIZE + np.arange(BLOCK_SIZE)
+            times = index * self.resolution
+            # Whole blocks are always drawn so partially filled blocks extend identically
+            rng = np.random.default_rng([self.seed, key, block])
+            columns = sampler(times, rng)
+            values = np.column_stack([columns[field] for field in self.fields]).astype(np.float32)
+
+            keep = (index >= first) & (index <= last)
+            ring.append(times[keep], values[keep])
+
+    def stats(self):
+        with self.lock:
+            rings = list(self.rings.values())
+        return {
+            'series': len(rings),
+            'max_series': self.max_series,
+            'resolution_seconds': self.resolution,
+            'retention_seconds': self.retention,
+            'samples': sum(ring.count for ring in rings),
+            'bytes': sum(ring.data.nbytes for ring in rings),
+            'memory_mapped': bool(self.directory)
+        }
+
+
+def downsample(times, values, points, method='mean'):
+    """Reduce (times, (n, fields) values) to about ``points`` rows.
+
+    ``mean`` averages each bucket, ``minmax`` also returns per-bucket
+    (min, max) arrays, and ``lttb`` keeps the Largest-Triangle-Three-Buckets
+    selection of the first field. Returns (times, values, extremes); raises
+    ValueError for fewer than 3 points.
+    """
+    if points is not None and points < 3:
+        raise ValueError(f'cannot downsample to {points} points (at least 3)')
+    n = len(times)
+    if points is None or n <= points:
+        return times, values, None
+
+    if method == 'lttb':
+        index = lttb_indices(times, values[:, 0].astype(float), points)
+        return times[index], values[index], None
+
+    edges = np.linspace(0, n, points + 1).astype(int)[:-1]
+    counts = np.diff(np.append(edges, n))[:, None]
+    bucket_times = np.add.reduceat(times, edges) / counts[:, 0]
+    bucket_values = np.add.reduceat(values.astype(float), edges) / counts
+
+    extremes = None
+    if method == 'minmax':
+        extremes = (np.minimum.reduceat(values, edges), np.maximum.reduceat(values, edges))
+    return bucket_times, bucket_values, extremes
+
+
+def lttb_indices(x, y, points):
+    """Indices chosen by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'benchmarks'))
+
+from catalogue import parse_tle_lines
+from fixtures import build_catalogue, write_fixtures
+from run import serve_fixtures
+
+# The app reads its configuration at import: point it at the frozen fixtures served locally
+WORK_DIR = tempfile.mkdtemp(prefix='gs-tests-')
+write_fixtures(os.path.join(WORK_DIR, 'celestrak'))
+os.environ['CELESTRAK_URL'] = serve_fixtures(os.path.join(WORK_DIR, 'celestrak'))
+os.environ['TLE_CACHE_DIR'] = os.path.join(WORK_DIR, 'tle_cache')
+os.environ['CONJUNCTION_WORKERS'] = '1'
+os.environ.pop('PROFILING_ENABLED', None)
+
+TEST_GROUPS = ('space_stations', 'gps', 'weather')
+
+
+@pytest.fixture(scope='session')
+def fixture_groups():
+    """SatelliteRecords of the frozen benchmark catalogue, by group (ungrouped objects left out)"""
+    texts = {}
+    for group, text in build_catalogue():
+        if group is not None:
+            texts.setdefault(group, []).append(text)
+    return {group: parse_tle_lines('\n'.join(entries).splitlines()) for group, entries in texts.items()}
+
+
+@pytest.fixture(scope='session')
+def ground_station_app():
+    """Application with TEST_GROUPS loaded from the fixtures and no background thread"""
+    import app as ground_station
+
+    flask_app = ground_station.create_app(start_background=False)
+    tracker = flask_app.extensions['ground_station'].tracker
+    for group in TEST_GROUPS:
+        assert tracker.fetch_live_tle_data(group)['status'] == 'success'
+    yield flask_app
+    flask_app.extensions['ground_station'].stop_background(5)
+
+
+@pytest.fixture
+def client(ground_station_app):
+    return ground_station_app.test_client()
+
+
+@pytest.fixture
+def tracker(ground_station_app):
+    return ground_station_app.extensions['ground_station'].tracker
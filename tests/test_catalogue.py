@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+
+from catalogue import CatalogueSnapshot, GroupSnapshot, diff_records, parse_tle_lines
+
+FETCHED_AT = datetime(2025, 1, 2)
+
+
+def tle_lines(records, renamed=None):
+    """3-line TLE text lines for records, optionally renaming some NORAD IDs"""
+    renamed = renamed or {}
+    lines = []
+    for record in records:
+        lines += [renamed.get(record.norad_id, record.name), record.line1, record.line2]
+    return lines
+
+
+@pytest.fixture
+def stations(fixture_groups):
+    return fixture_groups['stations'][:6]
+
+
+def test_reparse_reuses_unchanged_records(stations):
+    known = {record.norad_id: record for record in stations}
+    changed = stations[1].norad_id
+    records = parse_tle_lines(tle_lines(stations[:-1], {changed: 'RENAMED'}), known=known)
+
+    assert [record.norad_id for record in records] == [record.norad_id for record in stations[:-1]]
+    for old, new in zip(stations, records):
+        assert (new is old) == (old.norad_id != changed)
+    assert diff_records(stations, records) == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 4}
+    assert diff_records((), records)['added'] == len(records)
+
+
+def test_snapshot_swap_leaves_readers_on_the_old_catalogue(stations):
+    before = CatalogueSnapshot({'stations': GroupSnapshot('stations', stations[:3], FETCHED_AT)}).with_group(
+        GroupSnapshot('extra', stations[3:], FETCHED_AT))
+    engine = before.groups['stations'].engine
+    before.resolver  # built lazily; the swap below must not disturb it
+
+    renamed = parse_tle_lines(tle_lines(stations[:3], {stations[0].norad_id: 'RENAMED'}), known=before.by_norad())
+    after = before.with_group(GroupSnapshot('stations', renamed, FETCHED_AT))
+
+    # The old snapshot is untouched and still resolves the old name
+    assert after.version == before.version + 1
+    assert before.resolve(stations[0].name) is stations[0] and before.resolve('RENAMED') is None
+    assert after.resolve('RENAMED').norad_id == stations[0].norad_id
+    assert len(after) == len(before) == len(stations)
+    # A changed group builds a new engine; untouched groups keep theirs
+    assert after.groups['stations']._engine is None and after.groups['stations'].engine is not engine
+    assert after.groups['extra'] is before.groups['extra']
+
+
+def test_element_only_refresh_keeps_derived_state(stations):
+    before = CatalogueSnapshot({'stations': GroupSnapshot('stations', stations, FETCHED_AT)})
+    engine = before.groups['stations'].engine
+    resolver = before.resolver
+
+    # Same objects re-listed: engine and name index carry over
+    same = before.with_group(GroupSnapshot('stations', parse_tle_lines(tle_lines(stations), before.by_norad()), FETCHED_AT))
+    assert same.groups['stations']._engine is engine and same._resolver is resolver
+
+    later = datetime(2025, 1, 3)
+    refreshed = same.with_refreshed_group('stations', later)
+    assert refreshed.groups['stations'].fetched_at == later and refreshed.last_update == later
+    assert refreshed.records is same.records and refreshed.resolver is resolver
+
+
+def test_publishing_a_changed_group_invalidates_its_cached_positions(tracker):
+    group = tracker.catalogue.groups['weather']
+    weather = group.records
+    first, second = weather[0], weather[1]
+    tracker.get_position(first.name)
+    tracker.get_position(second.name)
+    cached = {key[0] for key in tracker.position_cache.entries}
+    assert {first.norad_id, second.norad_id} <= cached
+
+    renamed = tracker._parse_tle_data(tle_lines(weather, {first.norad_id: first.name + ' X'}), 'weather')
+    try:
+        changes = tracker._publish_group('weather', renamed, FETCHED_AT)
+        assert changes == {'added': 0, 'updated': 1, 'removed': 0, 'unchanged': len(weather) - 1}
+        cached = {key[0] for key in tracker.position_cache.entries}
+        assert first.norad_id not in cached and second.norad_id in cached
+    finally:
+        tracker._publish_group('weather', tracker._parse_tle_data(tle_lines(weather), 'weather'), group.fetched_at)
+    assert tracker.catalogue.resolve(first.name).norad_id == first.norad_id
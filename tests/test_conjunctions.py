@@ -0,0 +1,108 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sgp4.api import SatrecArray
+
+from conjunctions import ConjunctionScreener, close_pairs
+from propagation import time_grid
+
+START = datetime(2025, 1, 2)
+DURATION = 3600.0
+THRESHOLD = 50.0  # km
+SWEEP_STEP = 1.0  # seconds
+SWEEP_SLACK = 10.0  # km the 1 s sweep can overshoot a closest approach by (relative speed x half a step)
+
+
+@pytest.fixture(scope='module')
+def population(fixture_groups):
+    # A slice of the dense shell plus the stations and their debris gives close pairs of every geometry
+    return fixture_groups['stations'] + fixture_groups['starlink'][::50]
+
+
+def brute_force_minima(records, start, duration):
+    """Smallest sampled separation (km) of every unordered pair, as {(norad_a, norad_b): km}"""
+    jd, fr, _ = time_grid(start, duration + SWEEP_STEP / 2, SWEEP_STEP)
+    e, r, _ = SatrecArray([record.satrec for record in records]).sgp4(jd, fr)
+    r[e != 0] = np.nan
+    minima = {}
+    for a in range(len(records)):
+        distance = np.nanmin(np.linalg.norm(r[a + 1:] - r[a], axis=-1), axis=1)
+        for b, km in zip(range(a + 1, len(records)), distance.tolist()):
+            minima[tuple(sorted((records[a].norad_id, records[b].norad_id)))] = km
+    return minima
+
+
+def event_pairs(result):
+    """Closest reported miss distance per pair (a pair can meet more than once in the window)"""
+    closest = {}
+    for event in result['events']:
+        pair = tuple(sorted((event['primary_norad_id'], event['secondary_norad_id'])))
+        closest[pair] = min(closest.get(pair, np.inf), event['miss_distance'])
+    return closest
+
+
+def test_close_pairs_matches_pairwise_distances():
+    rng = np.random.default_rng(3)
+    a = rng.uniform(-100, 100, (400, 3))
+    b = rng.uniform(-100, 100, (300, 3))
+    radius = 12.0
+
+    i, j = close_pairs(a, radius)
+    d = np.linalg.norm(a[:, None] - a[None, :], axis=-1)
+    expected = {(p, q) for p, q in zip(*np.nonzero(d < radius)) if p < q}
+    assert {(min(p, q), max(p, q)) for p, q in zip(i.tolist(), j.tolist())} == expected
+    assert len(i) == len(expected)
+
+    i, j = close_pairs(a, radius, b)
+    d = np.linalg.norm(a[:, None] - b[None, :], axis=-1)
+    assert set(zip(i.tolist(), j.tolist())) == set(zip(*(x.tolist() for x in np.nonzero(d < radius))))
+
+
+def test_screening_finds_every_close_approach_of_a_brute_force_sweep(population):
+    result = ConjunctionScreener(THRESHOLD, 30.0).screen(population, START, DURATION)
+    found = event_pairs(result)
+    minima = brute_force_minima(population, START, DURATION)
+
+    missed = [pair for pair, km in minima.items() if km < THRESHOLD - SWEEP_SLACK and pair not in found]
+    assert not missed
+    assert found, 'fixture should contain close approaches'
+    for pair, miss in found.items():
+        assert miss <= THRESHOLD
+        # The refined time of closest approach is never worse than the best sampled one
+        assert miss <= minima[pair] + 1e-3
+
+
+def test_primary_screening_only_reports_the_primary(population):
+    primary = population[0]
+    result = ConjunctionScreener(THRESHOLD, 30.0).screen(population, START, DURATION, [primary])
+    everything = event_pairs(ConjunctionScreener(THRESHOLD, 30.0).screen(population, START, DURATION))
+    assert event_pairs(result) == pytest.approx(
+        {pair: km for pair, km in everything.items() if primary.norad_id in pair}, abs=1e-6)
+
+
+def test_pool_screening_matches_inline(population):
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('spawn')) as pool:
+        parallel = ConjunctionScreener(THRESHOLD, 30.0, workers=2, pool=pool).screen(population, START, DURATION)
+    inline = ConjunctionScreener(THRESHOLD, 30.0).screen(population, START, DURATION)
+    assert event_pairs(parallel) == pytest.approx(event_pairs(inline), abs=1e-9)
+
+
+def test_screening_rejects_oversized_populations(population):
+    with pytest.raises(ValueError):
+        ConjunctionScreener(THRESHOLD, 30.0).screen(population, START, DURATION, max_objects=len(population) - 1)
+
+
+def test_tracker_pool_is_started_on_first_use_and_closed(monkeypatch, tracker):
+    import app as ground_station
+
+    assert tracker.conjunction_pool is None
+    monkeypatch.setattr(ground_station, 'CONJUNCTION_WORKERS', 2)
+    pool = tracker.get_conjunction_pool()
+    assert pool is tracker.get_conjunction_pool()
+    tracker.close()
+    assert tracker.conjunction_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(int)
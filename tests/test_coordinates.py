@@ -0,0 +1,46 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from coordinates import teme_to_ecef, teme_to_geodetic
+from propagation import julian_date
+
+# Vallado, "Fundamentals of Astrodynamics and Applications", example 3-15:
+# TEME position at 2004-04-06 07:51:28.386009 UTC (UT1 - UTC = -0.4399619 s)
+TEME = np.array([5094.18016210, 6127.64465950, 6380.34453270])
+ITRF = np.array([-1033.4793830, 7901.2952754, 6380.3565958])
+UT1 = datetime(2004, 4, 6, 7, 51, 28, 386009) - timedelta(seconds=0.4399619)
+
+# WGS84 geodetic coordinates of ITRF (degrees, degrees, km), by fixed-point iteration
+LATITUDE, LONGITUDE, ALTITUDE = 38.801004533, 97.451910795, 3838.4371069
+
+# Polar motion (0.33 arcsec here) is neglected, which moves the result by about 16 m
+POSITION_TOLERANCE = 0.03  # km
+ANGLE_TOLERANCE = 2e-4  # degrees
+
+
+def test_teme_to_ecef_matches_reference():
+    r_ecef, _ = teme_to_ecef(TEME, None, *julian_date(UT1))
+    assert np.linalg.norm(r_ecef - ITRF) < POSITION_TOLERANCE
+
+
+def test_teme_to_geodetic_matches_reference():
+    latitude, longitude, altitude = teme_to_geodetic(TEME, *julian_date(UT1))
+    assert abs(math.degrees(latitude) - LATITUDE) < ANGLE_TOLERANCE
+    assert abs(math.degrees(longitude) - LONGITUDE) < ANGLE_TOLERANCE
+    assert abs(altitude - ALTITUDE) < POSITION_TOLERANCE
+
+
+def test_teme_to_geodetic_broadcasts_over_times():
+    times = [UT1 + timedelta(seconds=s) for s in (0.0, 0.5, 60.0)]
+    jd = np.array([julian_date(t)[0] for t in times])
+    fr = np.array([julian_date(t)[1] for t in times])
+    latitude, longitude, altitude = teme_to_geodetic(np.tile(TEME, (3, 1)), jd, fr)
+
+    single = [teme_to_geodetic(TEME, *julian_date(t)) for t in times]
+    np.testing.assert_allclose(longitude, [lon for _, lon, _ in single], atol=1e-12)
+    # Half a second of Earth rotation is resolved, not rounded away
+    assert abs(math.degrees(longitude[1] - longitude[0]) + 0.5 * 360.98564724 / 86400) < 1e-6
+    np.testing.assert_allclose(latitude, LATITUDE * np.pi / 180, atol=np.radians(ANGLE_TOLERANCE))
+    np.testing.assert_allclose(altitude, ALTITUDE, atol=POSITION_TOLERANCE)
@@ -0,0 +1,115 @@
+import csv
+import gzip
+import io
+import json
+
+import brotli
+import msgpack
+import numpy as np
+import pyarrow as pa
+import pytest
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from encoding import COMPRESS_MIN_BYTES, UnsupportedFormat, compress, encode, negotiate_format
+
+CONSTELLATION = '/api/constellation/weather'
+PAYLOAD = {
+    'group': 'weather',
+    'count': 3,
+    'name': ['A', 'B', 'C'],
+    'latitude': np.array([1.5, np.nan, -2.25]),
+    'norad_id': np.array([1, 2, 3])
+}
+
+
+def decode(body, mimetype):
+    """Columns of an encoded body as plain lists (None where the value is missing)"""
+    if mimetype == 'application/msgpack':
+        return msgpack.unpackb(body)
+    if mimetype == 'application/vnd.apache.arrow.stream':
+        table = pa.ipc.open_stream(body).read_all()
+        return dict(json.loads(table.schema.metadata[b'payload']), **table.to_pydict())
+    if mimetype == 'text/csv':
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        return dict(zip(rows[0], map(list, zip(*rows[1:]))))
+    return json.loads(body)
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('', 'json'),
+    ('*/*', 'json'),
+    ('application/msgpack', 'msgpack'),
+    ('application/x-msgpack', 'msgpack'),
+    ('application/vnd.apache.arrow.stream, application/json;q=0.5', 'arrow'),
+    ('text/csv;q=0.9, application/json;q=0.1', 'csv'),
+    ('image/png', 'json'),
+])
+def test_accept_header_negotiation(accept, expected):
+    assert negotiate_format(None, MIMEAccept(parse_accept_header(accept))) == expected
+
+
+def test_explicit_format_wins_and_unknown_is_rejected():
+    accept = MIMEAccept(parse_accept_header('application/msgpack'))
+    assert negotiate_format('csv', accept) == 'csv'
+    with pytest.raises(UnsupportedFormat):
+        negotiate_format('xml', accept)
+
+
+@pytest.mark.parametrize('fmt', ['json', 'msgpack', 'arrow'])
+def test_encodings_round_trip(fmt):
+    body, mimetype = encode(PAYLOAD, fmt)
+    decoded = decode(body, mimetype)
+    assert decoded['group'] == 'weather' and decoded['name'] == ['A', 'B', 'C']
+    assert decoded['norad_id'] == [1, 2, 3]
+    latitude = np.array(decoded['latitude'], dtype=float)
+    np.testing.assert_array_equal(latitude, PAYLOAD['latitude'])
+
+
+def test_csv_has_columns_only_and_blank_missing_values():
+    body, _ = encode(PAYLOAD, 'csv')
+    assert body.decode().splitlines() == ['name,latitude,norad_id', 'A,1.5,1', 'B,,2', 'C,-2.25,3']
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, br', 'br'),
+    ('gzip', 'gzip'),
+    ('*', 'br'),
+    ('gzip, br;q=0', 'gzip'),
+    ('br;q=0, gzip;q=0', None),
+    ('identity', None),
+])
+def test_compression_respects_quality(accept_encoding, expected):
+    body = b'x' * COMPRESS_MIN_BYTES
+    compressed, encoding = compress(body, parse_accept_header(accept_encoding))
+    assert encoding == expected
+    assert {'br': brotli.decompress, 'gzip': gzip.decompress, None: bytes}[expected](compressed) == body
+    assert compress(b'short', parse_accept_header('br'))[1] is None
+
+
+@pytest.mark.parametrize('query, accept, mimetype', [
+    ('', 'application/json', 'application/json'),
+    ('?format=msgpack', '', 'application/msgpack'),
+    ('', 'application/vnd.apache.arrow.stream', 'application/vnd.apache.arrow.stream'),
+    ('?format=csv', '', 'text/csv'),
+])
+@pytest.mark.parametrize('accept_encoding', ['gzip', 'br', 'br;q=0, gzip'])
+def test_constellation_formats_agree(client, query, accept, mimetype, accept_encoding):
+    response = client.get(CONSTELLATION + query + ('&' if query else '?') + 'layout=columns',
+                          headers={'Accept': accept, 'Accept-Encoding': accept_encoding})
+    assert response.status_code == 200 and response.mimetype == mimetype
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    body = response.data
+    encoding = response.headers.get('Content-Encoding')
+    assert encoding == ('br' if accept_encoding == 'br' else 'gzip')
+    body = brotli.decompress(body) if encoding == 'br' else gzip.decompress(body)
+
+    columns = decode(body, mimetype)
+    reference = client.get(CONSTELLATION + '?layout=columns').get_json()
+    assert columns['name'] == reference['name']
+    assert np.array(columns['norad_id'], dtype=int).tolist() == reference['norad_id']
+
+
+def test_unknown_format_is_not_acceptable(client):
+    assert client.get(CONSTELLATION + '?format=xml').status_code == 406
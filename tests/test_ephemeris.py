@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sgp4.api import SatrecArray
+
+from ephemeris import EphemerisStore
+from propagation import JD_UNIX_EPOCH, SECONDS_PER_DAY
+
+NOW = 1735776000.0  # 2025-01-02 00:00 UTC, unix seconds
+SAMPLES = 500
+
+
+@pytest.fixture(scope='module')
+def records(fixture_groups):
+    return [record for group in ('stations', 'weather', 'gps', 'galileo', 'glonass')
+            for record in fixture_groups[group]]
+
+
+@pytest.mark.parametrize('step, tolerance', [(60.0, 0.01), (120.0, 0.05)])
+def test_interpolation_error_stays_within_tolerance(records, step, tolerance):
+    store = EphemerisStore(window=7200.0, step=step, tolerance=tolerance)
+    table = store.rebuild(SimpleNamespace(records=tuple(records)), now=NOW)
+    rows = np.flatnonzero(table.usable)
+    assert len(rows) and table.max_error_km <= tolerance
+
+    # Reference positions straight from SGP4 in double precision at random times in the window
+    times = np.random.default_rng(0).uniform(table.start, table.end, SAMPLES)
+    e, r, _ = SatrecArray([records[i].satrec for i in rows.tolist()]).sgp4(
+        np.full(SAMPLES, JD_UNIX_EPOCH), times / SECONDS_PER_DAY)
+    interpolated, _ = table.interpolate(rows[:, None], times[None, :])
+
+    error = np.linalg.norm(interpolated - r, axis=-1)[e == 0]
+    assert error.max() <= tolerance
+
+
+def test_rebuild_reuses_unchanged_satellites(records):
+    store = EphemerisStore(window=7200.0, step=60.0, tolerance=0.01)
+    catalogue = SimpleNamespace(records=tuple(records))
+    first = store.rebuild(catalogue, now=NOW)
+    second = store.rebuild(catalogue, now=NOW + 3600.0)
+
+    assert store.last_build['reused_satellites'] == len(records)
+    shift = int(round((second.start - first.start) / first.step))
+    np.testing.assert_array_equal(second.states[:first.nodes - shift], first.states[shift:])
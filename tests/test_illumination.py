@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from illumination import AU, illuminated_fraction, illumination_state, shadow_geometry, shadow_margin
+
+SUN = np.array([AU, 0.0, 0.0])
+ORBIT_RADIUS = 7000.0  # km
+
+
+def behind_earth(offset):
+    """Positions on the night side at ORBIT_RADIUS, offset (km) perpendicular to the Sun line"""
+    offset = np.asarray(offset, dtype=float)
+    return np.stack((-np.sqrt(ORBIT_RADIUS ** 2 - offset ** 2), offset, np.zeros_like(offset)), axis=-1)
+
+
+def sampled_fraction(r, samples=2001):
+    """Visible Sun fraction from a grid over the Sun's disk with the Earth's disk masked out"""
+    a, b, c = (float(value) for value in shadow_geometry(r, SUN))
+    x, y = np.meshgrid(np.linspace(-a, a, samples), np.linspace(-a, a, samples))
+    sun = x ** 2 + y ** 2 <= a ** 2
+    earth = (x - c) ** 2 + y ** 2 <= b ** 2
+    return (sun & ~earth).sum() / sun.sum()
+
+
+def test_sunlit_umbra_and_penumbra():
+    fractions = illuminated_fraction(np.array([[ORBIT_RADIUS, 0.0, 0.0], [-ORBIT_RADIUS, 0.0, 0.0]]), SUN)
+    np.testing.assert_array_equal(fractions, [1.0, 0.0])
+
+    # Walk out of the shadow: the fraction rises monotonically through the penumbra
+    offsets = np.linspace(6300.0, 6500.0, 401)
+    r = behind_earth(offsets)
+    fraction = illuminated_fraction(r, SUN)
+    states = illumination_state(fraction)
+    assert states[0] == 'umbra' and states[-1] == 'sunlit' and 'penumbra' in states
+    assert np.all(np.diff(fraction) >= 0)
+    # Partial illumination exactly where the Sun's disk overlaps the Earth's
+    penumbra = (fraction > 0) & (fraction < 1)
+    np.testing.assert_array_equal(penumbra[fraction > 0], shadow_margin(r, SUN)[fraction > 0] < 0)
+
+
+@pytest.mark.parametrize('offset', [6368.0, 6378.0, 6388.0])
+def test_penumbra_matches_disk_overlap(offset):
+    r = behind_earth(offset)
+    fraction = float(illuminated_fraction(r, SUN))
+    assert 0.0 < fraction < 1.0
+    assert fraction == pytest.approx(sampled_fraction(r), abs=0.01)
+
+
+def test_telemetry_does_not_mutate_cached_positions(monkeypatch, tracker):
+    # A long quantum keeps both calls in the same bucket
+    monkeypatch.setattr(tracker.position_cache, 'quantum', 3600.0)
+    position = tracker.get_position('ISS')
+    bucket, _ = tracker.position_cache.quantize(datetime.fromisoformat(position['timestamp']))
+    record = tracker.catalogue.resolve('ISS')
+    shared = tracker.position_cache.get(record, bucket)
+    assert shared['illumination'] is None
+
+    telemetry = tracker.get_telemetry('ISS')
+    assert telemetry is not None
+    assert shared['illumination'] is None
+    cached = tracker.position_cache.get(record, bucket)
+    assert cached is not shared and 0.0 <= cached['illumination'] <= 1.0
@@ -0,0 +1,82 @@
+import math
+import re
+
+from metrics import MetricsRegistry
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(?:,|$)')
+
+
+def parse_exposition(text):
+    """{family: {'type', 'help', 'samples': [(name, labels, value)]}}, asserting the text format rules"""
+    assert text.endswith('\n')
+    families = {}
+    family = None
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            name, documentation = line[7:].split(' ', 1)
+            assert name not in families, f'{name} declared twice'
+            family = name
+            families[name] = {'help': documentation, 'type': None, 'samples': []}
+        elif line.startswith('# TYPE '):
+            name, kind = line[7:].split(' ')
+            assert name in families and kind in ('counter', 'gauge', 'histogram', 'untyped')
+            families[name]['type'] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name, _, labels, value = match.groups()
+            # Samples belong to the family declared last (histograms add _bucket/_sum/_count)
+            assert family is not None and name.startswith(family), line
+            parsed = dict(LABEL.findall(labels or ''))
+            assert ','.join(f'{k}="{v}"' for k, v in parsed.items()) == (labels or ''), line
+            families[family]['samples'].append((name, parsed, float(value)))
+    return families
+
+
+def test_registry_renders_valid_exposition():
+    registry = MetricsRegistry()
+    requests = registry.counter('test_requests_total', 'Requests', ('route', 'status'))
+    depth = registry.gauge('test_depth', 'Queue depth')
+    latency = registry.histogram('test_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+    registry.collector(lambda scale: depth.set(3 * scale))
+
+    requests.inc(route='/api/x', status=200)
+    requests.inc(2, route='/api/x', status=200)
+    requests.inc(route='say "hi"\\\n', status=500)
+    for value in (0.05, 0.5, 0.5, 7.0):
+        latency.observe(value, route='/api/x')
+
+    families = parse_exposition(registry.render(2))
+    assert list(families) == ['test_requests_total', 'test_depth', 'test_seconds']
+    assert families['test_requests_total']['type'] == 'counter'
+    assert families['test_requests_total']['samples'] == [
+        ('test_requests_total', {'route': '/api/x', 'status': '200'}, 3.0),
+        ('test_requests_total', {'route': 'say \\"hi\\"\\\\\\n', 'status': '500'}, 1.0),
+    ]
+    assert families['test_depth']['samples'] == [('test_depth', {}, 6.0)]
+
+    samples = families['test_seconds']['samples']
+    buckets = [(labels['le'], value) for name, labels, value in samples if name == 'test_seconds_bucket']
+    assert buckets == [('0.1', 1.0), ('1.0', 3.0), ('+Inf', 4.0)]
+    totals = {name: value for name, _, value in samples if not name.endswith('_bucket')}
+    assert totals['test_seconds_count'] == 4.0
+    assert math.isclose(totals['test_seconds_sum'], 8.05)
+
+
+def test_metrics_endpoint_reports_requests_and_caches(client):
+    client.get('/api/satellite/ISS/position')
+    client.get('/api/satellite/ISS/position')
+    response = client.get('/api/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+
+    families = parse_exposition(response.get_data(as_text=True))
+    for name in ('gs_http_request_duration_seconds', 'gs_position_cache_lookups_total', 'gs_catalogue_satellites'):
+        assert name in families, name
+
+    routes = {labels.get('route') for _, labels, _ in families['gs_http_request_duration_seconds']['samples']}
+    assert '/api/satellite/<satellite_name>/position' in routes
+    lookups = {labels['result']: value for _, labels, value in families['gs_position_cache_lookups_total']['samples']}
+    assert lookups['hit'] + lookups['miss'] > 0
+    assert families['gs_catalogue_satellites']['samples'][0][2] > 0
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from coordinates import GroundStation, teme_to_ecef
+from passes import PassPredictor
+from propagation import time_grid
+
+START = datetime(2025, 1, 2)
+DURATION = 12 * 3600.0
+MIN_ELEVATION = 10.0
+SWEEP_STEP = 1.0  # seconds
+FINE_STEP = 30.0
+
+
+def brute_force_passes(record, station, start, duration):
+    """(AOS, LOS) offsets of every run above the mask on a SWEEP_STEP grid"""
+    jd, fr, t = time_grid(start, duration + SWEEP_STEP / 2, SWEEP_STEP)
+    e, r, _ = record.satrec.sgp4_array(jd, fr)
+    r_ecef, _ = teme_to_ecef(r, None, jd, fr)
+    _, elevation, _ = station.look_angles(r_ecef)
+    above = (np.degrees(elevation) >= MIN_ELEVATION) & (e == 0)
+
+    edges = np.diff(above.astype(int))
+    rises = np.flatnonzero(edges == 1) + 1
+    sets = np.flatnonzero(edges == -1)
+    if above[0]:
+        rises = np.r_[0, rises]
+    if above[-1]:
+        sets = np.r_[sets, len(t) - 1]
+    return list(zip(t[rises].tolist(), t[sets].tolist()))
+
+
+@pytest.mark.parametrize('latitude, longitude', [(51.5, -0.1), (-33.9, 18.4), (78.2, 15.6)])
+def test_pass_counts_match_brute_force_sweep(fixture_groups, latitude, longitude):
+    station = GroundStation(latitude, longitude, 0.05)
+    records = fixture_groups['stations'] + fixture_groups['gps']
+    predicted = PassPredictor(station, MIN_ELEVATION, fine_step=FINE_STEP).predict(records, START, DURATION)
+
+    for record in records:
+        expected = brute_force_passes(record, station, START, DURATION)
+        found = [p for p in predicted if p['norad_id'] == record.norad_id]
+        # Passes shorter than the fine step may legitimately be missed
+        required = [(aos, los) for aos, los in expected if los - aos >= FINE_STEP]
+        assert len(required) <= len(found) <= len(expected), record.name
+
+        for p in found:
+            aos = (datetime.fromisoformat(p['aos']) - START).total_seconds()
+            los = (datetime.fromisoformat(p['los']) - START).total_seconds()
+            assert any(abs(aos - a) <= SWEEP_STEP and abs(los - b) <= SWEEP_STEP for a, b in expected), record.name
+            assert p['max_elevation'] >= MIN_ELEVATION
+
+
+def test_passes_are_sorted_and_inside_the_window(fixture_groups):
+    station = GroundStation(51.5, -0.1, 0.05)
+    predicted = PassPredictor(station, MIN_ELEVATION).predict(fixture_groups['stations'], START, DURATION)
+    aos = [datetime.fromisoformat(p['aos']) for p in predicted]
+    assert predicted and aos == sorted(aos)
+    assert all(START <= datetime.fromisoformat(p['los']) <= START + timedelta(seconds=DURATION) for p in predicted)
+
+
+def test_pass_under_way_at_the_edges_is_flagged(fixture_groups):
+    station = GroundStation(51.5, -0.1, 0.05)
+    iss = fixture_groups['stations'][:1]
+    predictor = PassPredictor(station, MIN_ELEVATION)
+    first = predictor.predict(iss, START, DURATION)[0]
+    assert not first['aos_truncated'] and not first['los_truncated']
+
+    tca = datetime.fromisoformat(first['tca'])
+    after = predictor.predict(iss, tca, DURATION)[0]
+    assert after['aos_truncated'] and after['aos'] == tca.isoformat()
+    assert abs((datetime.fromisoformat(after['los']) - datetime.fromisoformat(first['los'])).total_seconds()) < 0.1
+
+    before = predictor.predict(iss, START, (tca - START).total_seconds())[-1]
+    assert before['los_truncated'] and not before['aos_truncated']
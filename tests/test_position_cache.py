@@ -0,0 +1,84 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from position_cache import PositionCache
+
+
+class Record:
+    def __init__(self, norad_id):
+        self.norad_id = norad_id
+
+
+def test_quantize_snaps_to_the_bucket_start():
+    cache = PositionCache(quantum=5.0)
+    first, start = cache.quantize(datetime(2025, 1, 2, 0, 0, 4, 999000))
+    assert start == datetime(2025, 1, 2)
+    second, start = cache.quantize(datetime(2025, 1, 2, 0, 0, 5))
+    assert second == first + 1 and start == datetime(2025, 1, 2, 0, 0, 5)
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = PositionCache(max_entries=2)
+    records = [Record(n) for n in range(3)]
+    cache.put(records[0], 0, 'a')
+    cache.put(records[1], 0, 'b')
+    assert cache.get(records[0], 0) == 'a'
+    cache.put(records[2], 0, 'c')
+
+    assert cache.get(records[1], 0) is None
+    assert (cache.get(records[0], 0), cache.get(records[2], 0)) == ('a', 'c')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_new_element_set_and_invalidation_miss():
+    cache = PositionCache()
+    old = Record(25544)
+    cache.put(old, 0, 'old')
+    assert cache.get(Record(25544), 0) is None
+    cache.invalidate([25544])
+    assert cache.get(old, 0) is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_concurrent_misses_propagate_once():
+    cache = PositionCache()
+    record = Record(25544)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'position'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(record, 7, compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and results == ['position'] * 8
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['hits'] + stats['coalesced'] == 7
+    assert stats['in_flight'] == 0 and cache.get(record, 7) == 'position'
+
+
+def test_failed_and_empty_computations_are_not_cached():
+    cache = PositionCache()
+    record = Record(25544)
+    assert cache.get_or_compute(record, 0, lambda: None) is None
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_compute(record, 0, lambda: 1 / 0)
+    assert cache.get_or_compute(record, 0, lambda: 'position') == 'position'
+    assert cache.stats()['misses'] == 3
+
+
+def test_now_positions_report_bucket_and_request_time(tracker):
+    position = tracker.get_position('ISS')
+    bucket_start = datetime.fromisoformat(position['timestamp'])
+    requested_at = datetime.fromisoformat(position['requested_at'])
+    assert 0 <= (requested_at - bucket_start).total_seconds() < tracker.position_cache.quantum
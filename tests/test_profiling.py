@@ -0,0 +1,45 @@
+import pytest
+
+from profiling import RequestProfiler
+
+POSITION = '/api/satellite/ISS/position'
+
+
+@pytest.fixture
+def profiling(monkeypatch, ground_station_app):
+    monkeypatch.setitem(ground_station_app.config, 'PROFILING_ENABLED', True)
+
+
+def test_header_is_ignored_unless_profiling_is_enabled(client):
+    response = client.get(POSITION, headers={'X-Profile': 'pstats'})
+    assert response.status_code == 200 and 'X-Profile-Id' not in response.headers
+    assert client.get('/api/debug/profiles').status_code == 404
+
+
+@pytest.mark.parametrize('header', [None, '0', 'false', 'yes please'])
+def test_only_explicit_modes_profile(profiling, client, header):
+    response = client.get(POSITION, headers={'X-Profile': header} if header else {})
+    assert response.status_code == 200 and 'X-Profile-Id' not in response.headers
+
+
+@pytest.mark.parametrize('header, mode', [('pstats', 'pstats'), ('collapsed', 'collapsed'), ('1', 'collapsed')])
+def test_profiled_request_is_stored(profiling, client, header, mode):
+    response = client.get(POSITION, headers={'X-Profile': header})
+    assert response.status_code == 200
+    assert response.headers['X-Profile-Scope'] == 'request-thread'
+    profile_id = response.headers['X-Profile-Id']
+
+    index = client.get('/api/debug/profiles').get_json()['profiles']
+    assert {'id': profile_id, 'mode': mode, 'scope': 'request-thread'}.items() <= index[0].items()
+    assert client.get(f'/api/debug/profiles/{profile_id}').status_code == 200
+    if mode == 'pstats':
+        assert 'cumulative' in client.get(f'/api/debug/profiles/{profile_id}?format=text').get_data(as_text=True)
+
+
+def test_concurrent_profiled_request_is_refused(profiling, client):
+    with RequestProfiler.active:
+        response = client.get(POSITION, headers={'X-Profile': 'pstats'})
+        assert response.status_code == 409
+        # Unprofiled requests are unaffected
+        assert client.get(POSITION).status_code == 200
+    assert client.get(POSITION, headers={'X-Profile': 'pstats'}).status_code == 200
@@ -0,0 +1,53 @@
+import pytest
+
+from resolver import SatelliteResolver
+
+NAMES = ['ISS (ZARYA)', 'CSS (TIANHE)', 'HST', 'STARLINK-1007', 'STARLINK-10070', 'NOAA 19']
+NORAD_IDS = [25544, 48274, 20580, 44713, 58000, 33591]
+ALIASES = {
+    'ISS': ['ISS (ZARYA)', 'INTERNATIONAL SPACE STATION'],
+    'HUBBLE': ['HST', 'HUBBLE SPACE TELESCOPE'],
+    'TIANGONG': ['TIANGONG', 'CSS (TIANHE)']
+}
+
+
+def linear_scan(names, needle):
+    """Reference for the substring fallback: first name containing the needle"""
+    return next((i for i, name in enumerate(names) if needle.upper() in name.upper()), None)
+
+
+@pytest.fixture
+def resolver():
+    return SatelliteResolver(NAMES, NORAD_IDS, ALIASES)
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('iss (zarya)', 'ISS (ZARYA)'),      # exact, case-insensitive
+    ('  NOAA 19 ', 'NOAA 19'),           # surrounding whitespace
+    ('20580', 'HST'),                    # NORAD catalogue number
+    ('hubble', 'HST'),                   # alias
+    ('Tiangong', 'CSS (TIANHE)'),        # alias whose first target is not in the catalogue
+    ('ISS', 'ISS (ZARYA)'),
+    ('STARLINK-1007', 'STARLINK-1007'),  # exact beats the longer name containing it
+    ('1007', 'STARLINK-1007'),           # digits that are not a NORAD ID fall back to substrings
+    ('LINK-1007', 'STARLINK-1007'),
+    ('AA', 'NOAA 19'),                   # shorter than a trigram
+])
+def test_resolves_names_ids_aliases_and_substrings(resolver, query, expected):
+    assert resolver.resolve(query) == expected
+
+
+@pytest.mark.parametrize('query', ['', '   ', 'MIR', '99999', 'STARLINK-2'])
+def test_unknown_names_resolve_to_none(resolver, query):
+    assert resolver.resolve(query) is None
+
+
+def test_trigram_lookup_matches_a_linear_scan(fixture_groups):
+    records = [record for group in fixture_groups.values() for record in group]
+    names = [record.name for record in records]
+    resolver = SatelliteResolver(names, [record.norad_id for record in records])
+
+    needles = {name[start:start + length] for name in names[::25] for start in (0, 3) for length in (2, 4, 7)}
+    for needle in needles | {'ZZZZ', 'STARLINK', 'GPS BIIR'}:
+        if needle.strip() and not needle.strip().isdigit():
+            assert resolver.resolve_index(needle) == linear_scan(names, needle.strip()), needle
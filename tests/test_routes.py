@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import pytest
+
+
+@pytest.mark.parametrize('query', [
+    'span=nan', 'step=nan', 'span=inf&step=inf', 'span=-inf', 'span=0', 'step=-1',
+    'span=86400&step=0.001', 'start=yesterday', 'start=2025-01-02T00:00:00%2B25:00'
+])
+def test_orbit_rejects_bad_parameters(client, query):
+    response = client.get(f'/api/satellite/ISS/orbit?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_orbit_accepts_offset_start(client):
+    response = client.get('/api/satellite/ISS/orbit?span=600&step=60&start=2025-01-02T02:00:00%2B02:00')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 10
+    assert body['start'].startswith('2025-01-02T00:00:00')
+
+
+TRACKING = '/api/satellite/ISS/tracking?lat=51.5&lon=-0.1'
+
+
+@pytest.mark.parametrize('query', [
+    'duration=nan', 'duration=inf', 'duration=0', 'alt=nan', 'alt=inf', 'rate=nan', 'rate=0',
+    'frequency=nan', 'frequency=inf', 'frequency=-1', 'min_elevation=nan', 'min_elevation=95'
+])
+def test_tracking_rejects_bad_parameters(client, query):
+    response = client.get(f'{TRACKING}&{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_tracking_table_has_one_row_per_sample(client):
+    response = client.get(f'{TRACKING}&duration=60&rate=2&frequency=437e6&start=2025-01-02T00:00:00')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 120
+    assert all(abs(shift) < 437e6 * 1e-4 for shift in body['doppler'])
+
+
+HISTORY = '/api/satellite/ISS/telemetry/historical'
+
+
+@pytest.mark.parametrize('query', [
+    'hours=nan', 'hours=inf', 'hours=0', 'hours=-1', 'hours=1000', 'hours=0.001',
+    'points=2', 'points=0', 'hours=1&step=1800', 'step=nan', 'step=-5', 'method=median'
+])
+def test_telemetry_history_rejects_bad_parameters(client, query):
+    response = client.get(f'{HISTORY}?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('query, count', [('hours=1&points=3', 3), ('hours=1&step=60', 60), ('hours=1&step=1', 360)])
+def test_telemetry_history_is_bounded_by_points(client, query, count):
+    response = client.get(f'{HISTORY}?{query}')
+    assert response.status_code == 200
+    assert response.get_json()['count'] in (count, count + 1)
+
+
+PASSES = '/api/passes?lat=51.5&lon=-0.1&group=space_stations'
+
+
+@pytest.mark.parametrize('query', ['min_elevation=nan', 'min_elevation=95', 'min_elevation=-91', 'alt=nan',
+                                   'days=nan', 'days=0'])
+def test_passes_reject_bad_parameters(client, query):
+    response = client.get(f'{PASSES}&{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_passes_body_is_strict_json(client):
+    response = client.get(f'{PASSES}&start=2025-01-02T00:00:00&days=0.5')
+    assert response.status_code == 200
+    assert 'NaN' not in response.get_data(as_text=True)
+    body = response.get_json()
+    assert body['count'] and all(p['max_elevation'] >= 10 for p in body['passes'])
+
+
+POSITIONS = '/api/positions'
+TIMES = ['2025-01-02T00:00:00', '2025-01-02T00:10:00Z', '2025-01-02T02:20:00+02:00']
+
+
+def test_bulk_positions_match_single_lookups(client, tracker):
+    gps = tracker.catalogue.groups['gps'].records[0].norad_id
+    response = client.post(POSITIONS, json={'satellites': ['ISS', gps, 'NO SUCH SAT'], 'timestamps': TIMES})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['satellites'], body['times'], body['count']) == (2, 3, 6)
+    assert body['missing'] == ['NO SUCH SAT'] and body['requested_name'] == ['ISS', str(gps)]
+    assert body['timestamp'] == ['2025-01-02T00:00:00', '2025-01-02T00:10:00', '2025-01-02T00:20:00']
+
+    # Satellite-major: row i * times + j is satellite i at time j
+    for i, name in enumerate(body['requested_name']):
+        for j, timestamp in enumerate(body['timestamp']):
+            single = tracker.get_position(name, datetime.fromisoformat(timestamp))
+            assert body['latitude'][i * 3 + j] == pytest.approx(single['latitude'], abs=1e-6)
+            assert body['longitude'][i * 3 + j] == pytest.approx(single['longitude'], abs=1e-6)
+
+
+def test_bulk_positions_on_a_grid(client):
+    response = client.post(POSITIONS, json={'satellites': ['ISS'], 'start': TIMES[0],
+                                            'stop': '2025-01-02T01:00:00', 'step': 600})
+    assert response.status_code == 200
+    assert response.get_json()['timestamp'][-1] == '2025-01-02T00:50:00'
+
+
+@pytest.mark.parametrize('body', [
+    [], {}, {'satellites': []}, {'satellites': [True]}, {'satellites': ['ISS'], 'timestamps': []},
+    {'satellites': ['ISS'], 'timestamps': ['soon']},
+    {'satellites': ['ISS'], 'timestamps': ['1900-01-01T00:00:00']},
+    {'satellites': ['ISS'], 'timestamps': [TIMES[0], '2300-01-01T00:00:00']},
+    {'satellites': ['ISS'], 'start': '1900-01-01T00:00:00', 'stop': TIMES[0]},
+    {'satellites': ['ISS'], 'start': TIMES[0], 'stop': '2300-01-01T00:00:00', 'step': 1e9},
+    {'satellites': ['ISS'], 'start': TIMES[0], 'stop': TIMES[0]},
+    {'satellites': ['ISS'], 'start': TIMES[0], 'stop': TIMES[1], 'step': 'nan'},
+    {'satellites': ['ISS'], 'start': TIMES[0], 'stop': TIMES[1], 'step': 0.001},
+])
+def test_bulk_positions_reject_bad_bodies(client, body):
+    response = client.post(POSITIONS, json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('route', ['/api/constellation/gps', '/api/constellation/gps/illumination'])
+@pytest.mark.parametrize('query', ['max=0', 'max=-1', 'max=two', 'max='])
+def test_constellation_routes_reject_bad_max(client, route, query):
+    response = client.get(f'{route}?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('route', ['/api/constellation/gps?layout=columns', '/api/constellation/gps/illumination?hours=1'])
+def test_constellation_routes_limit_to_max(client, route):
+    response = client.get(f'{route}&max=3')
+    assert response.status_code == 200
+    assert len(response.get_json()['norad_id']) == 3
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+from catalogue import CatalogueSnapshot, GroupSnapshot
+from shared_catalogue import SharedCatalogue
+
+FETCHED_AT = datetime(2025, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture
+def catalogue(fixture_groups):
+    groups = {key: GroupSnapshot(key, fixture_groups[key], FETCHED_AT if key != 'gps' else None)
+              for key in ('stations', 'gps', 'weather')}
+    return CatalogueSnapshot(groups, version=7)
+
+
+def record_tuples(records):
+    return [(record.norad_id, record.name, record.line1, record.line2) for record in records]
+
+
+def test_write_and_attach_round_trip(tmp_path, catalogue):
+    shared = SharedCatalogue(str(tmp_path / 'catalogue.bin'))
+    assert shared.attach() is None and not shared.changed()
+
+    shared.publish(catalogue)
+    assert shared.changed()
+    view = shared.attach()
+    assert not shared.changed()
+    assert view.version == 7 and len(view) == len(catalogue)
+
+    mapped = view.to_snapshot(version=8)
+    assert record_tuples(mapped.records) == record_tuples(catalogue.records)
+    for key, group in catalogue.groups.items():
+        assert record_tuples(mapped.groups[key].records) == record_tuples(group.records)
+        assert mapped.groups[key].fetched_at == group.fetched_at
+    assert mapped.resolve('ISS').norad_id == catalogue.resolve('ISS').norad_id
+    assert shared.stats()['attached_version'] == 7
+
+    # Unchanged element sets are reused rather than parsed again
+    reused = view.to_snapshot(known=mapped.by_norad())
+    assert all(a is b for a, b in zip(reused.records, mapped.records))
+
+
+def test_readers_keep_their_view_across_a_republish(tmp_path, catalogue, fixture_groups):
+    writer = SharedCatalogue(str(tmp_path / 'catalogue.bin'))
+    reader = SharedCatalogue(writer.path)
+    writer.publish(catalogue)
+    old = reader.attach()
+    old_names = [old.name(i) for i in range(len(old))]
+
+    writer.publish(catalogue.with_group(GroupSnapshot('starlink', fixture_groups['starlink'][:10], FETCHED_AT)))
+    assert reader.changed()
+    # The old mapping still reads the previous file after the swap
+    assert [old.name(i) for i in range(len(old))] == old_names
+
+    new = SharedCatalogue(writer.path).attach()
+    assert new.version == 8 and len(new) == len(old) + 10 and 'starlink' in new.groups
+
+
+def test_refresh_requests_are_consumed_once(tmp_path):
+    shared = SharedCatalogue(str(tmp_path / 'catalogue.bin'))
+    assert shared.take_requests() == []
+    shared.request_refresh()
+    shared.request_refresh('gps', force=True)
+    requests = shared.take_requests()
+    assert len(requests) == 2 and set(requests) == {(None, False), ('gps', True)}
+    assert shared.take_requests() == []
+
+
+def test_updater_publishes_and_reader_requests_refresh(tmp_path, ground_station_app):
+    import app as ground_station
+
+    path = str(tmp_path / 'catalogue.bin')
+    # The session app has already filled the disk TLE cache the updater starts from
+    updater = ground_station.GroundStationService(mode='updater', shared_path=path)
+    reader = ground_station.GroundStationService(mode='reader', shared_path=path)
+    try:
+        published = updater.tracker.catalogue
+        assert len(published) and updater.published_version == published.version
+
+        mapped = reader.tracker.catalogue
+        assert reader.cache_load['status'] == 'shared'
+        assert record_tuples(mapped.records) == record_tuples(published.records)
+        assert reader.readiness()['shared_catalogue']['satellites'] == len(published)
+
+        reader.request_refresh('weather', force=True)
+        assert updater.shared.take_requests() == [('weather', True)]
+    finally:
+        updater.stop_background(5)
+        reader.stop_background(5)
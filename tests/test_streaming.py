@@ -0,0 +1,67 @@
+import json
+import time
+
+import pytest
+
+from streaming import StreamHub, StreamSubscriber
+
+
+@pytest.fixture
+def hub(tracker):
+    hub = StreamHub(tracker, tick=0.02, queue_size=2, max_dropped=3)
+    yield hub
+    hub.stop(5)
+
+
+def test_frames_fan_out_to_every_subscriber(hub, tracker):
+    iss = tracker.catalogue.resolve('ISS')
+    following_iss = hub.subscribe([iss.norad_id], [], 0.02)
+    following_group = hub.subscribe([], ['space_stations'], 0.02)
+
+    frame = json.loads(following_iss.next_frame(5))
+    assert [satellite['norad_id'] for satellite in frame['satellites']] == [iss.norad_id]
+    assert frame['groups'] == {}
+    assert -90 <= frame['satellites'][0]['latitude'] <= 90
+
+    frame = json.loads(following_group.next_frame(5))
+    assert frame['satellites'] == []
+    assert frame['groups']['space_stations']['count'] == len(tracker.catalogue.groups['space_stations'])
+
+
+def test_interval_is_rounded_to_ticks(hub, tracker):
+    iss = tracker.catalogue.resolve('ISS')
+    every_tick = hub.subscribe([iss.norad_id], [], 0.02)
+    every_fifth = hub.subscribe([iss.norad_id], [], 0.1)
+    assert (every_tick.every, every_fifth.every) == (1, 5)
+
+
+def test_slow_subscriber_is_dropped(hub, tracker):
+    iss = tracker.catalogue.resolve('ISS')
+    # Registered without starting the tick thread, so frames are published by hand
+    slow = StreamSubscriber([iss.norad_id], [], 1, hub.queue_size)
+    hub.subscribers.add(slow)
+
+    for _ in range(hub.queue_size):
+        hub._publish([slow])
+    assert slow.dropped == 0 and len(slow.frames) == hub.queue_size and not slow.closed
+    for _ in range(hub.max_dropped + 1):
+        hub._publish([slow])
+
+    assert slow.closed and slow not in hub.subscribers
+    assert hub.disconnected == 1
+    assert hub.frames_dropped == hub.max_dropped + 1
+    # Queued frames are still delivered after the disconnect, newest kept
+    assert slow.next_frame(0) is not None
+
+
+def test_stop_ends_the_ticker_and_closes_subscribers(hub, tracker):
+    subscriber = hub.subscribe([tracker.catalogue.resolve('ISS').norad_id], [], 0.02)
+    assert subscriber.next_frame(5) is not None
+    thread = hub.thread
+
+    hub.stop(5)
+    assert not thread.is_alive()
+    assert subscriber.closed and not hub.subscribers
+    ticks = hub.ticks
+    time.sleep(0.1)
+    assert hub.ticks == ticks
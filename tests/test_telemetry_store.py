@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from telemetry_store import TelemetryRing, TelemetryStore, downsample, lttb_indices
+
+
+def linear_sampler(times, rng):
+    return {'a': times / 10.0, 'b': rng.normal(size=len(times))}
+
+
+def test_downsample_mean_buckets():
+    times = np.arange(100.0)
+    values = np.column_stack((times, 2 * times))
+    bucket_times, bucket_values, extremes = downsample(times, values, 10, 'mean')
+    assert len(bucket_times) == 10 and extremes is None
+    np.testing.assert_allclose(bucket_times, np.arange(10) * 10 + 4.5)
+    np.testing.assert_allclose(bucket_values[:, 1], 2 * bucket_times)
+
+
+def test_downsample_minmax_reports_bucket_extremes():
+    times = np.arange(20.0)
+    values = np.sin(times)[:, None]
+    _, _, (low, high) = downsample(times, values, 4, 'minmax')
+    np.testing.assert_allclose(low[:, 0], values[:, 0].reshape(4, 5).min(axis=1))
+    np.testing.assert_allclose(high[:, 0], values[:, 0].reshape(4, 5).max(axis=1))
+
+
+def test_lttb_keeps_end_points_and_spikes():
+    x = np.arange(1000.0)
+    y = np.zeros(1000)
+    y[637] = 50.0
+    index = lttb_indices(x, y, 20)
+    assert len(index) == 20 and index[0] == 0 and index[-1] == 999
+    assert 637 in index
+    assert np.all(np.diff(index) > 0)
+
+
+def test_downsample_passes_short_series_through_and_rejects_too_few_points():
+    times = np.arange(5.0)
+    values = times[:, None]
+    assert downsample(times, values, 10)[0] is times
+    with pytest.raises(ValueError):
+        downsample(np.arange(100.0), np.zeros((100, 1)), 2)
+
+
+def test_ring_wraps_around_in_time_order():
+    ring = TelemetryRing(1, 5)
+    ring.append(np.arange(3.0), np.arange(3.0)[:, None])
+    ring.append(np.arange(3.0, 8.0), np.arange(3.0, 8.0)[:, None])
+    assert ring.count == 5 and ring.last_time == 7.0
+    np.testing.assert_array_equal(ring.ordered()['time'], np.arange(3.0, 8.0))
+    times, values = ring.range(4.0, 7.0)
+    np.testing.assert_array_equal(times, [4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(values[:, 0], [4.0, 5.0, 6.0])
+
+
+def test_memory_mapped_ring_recovers_after_reopen(tmp_path):
+    path = str(tmp_path / 'series.ring')
+    ring = TelemetryRing(2, 4, path)
+    ring.append(np.arange(6.0), np.column_stack((np.arange(6.0), -np.arange(6.0))))
+    ring.flush()
+    del ring
+
+    reopened = TelemetryRing(2, 4, path)
+    assert reopened.count == 4 and reopened.last_time == 5.0
+    np.testing.assert_array_equal(reopened.ordered()['time'], [2.0, 3.0, 4.0, 5.0])
+    reopened.append(np.array([6.0]), np.array([[6.0, -6.0]]))
+    np.testing.assert_array_equal(reopened.ordered()['time'], [3.0, 4.0, 5.0, 6.0])
+
+
+@pytest.mark.parametrize('directory', [None, 'rings'])
+def test_store_reads_are_repeatable(tmp_path, directory):
+    store = TelemetryStore(['a', 'b'], resolution=10.0, retention=3600.0,
+                           directory=str(tmp_path / directory) if directory else None, seed=7)
+    first = store.read(25544, 10000.0, 12000.0, linear_sampler)
+    second = store.read(25544, 10000.0, 13000.0, linear_sampler)
+    assert len(first[0]) == 200
+    np.testing.assert_array_equal(first[1], second[1][:200])
+    np.testing.assert_allclose(second[1][:, 0], second[0] / 10.0, rtol=1e-6)
+
+    fresh = TelemetryStore(['a', 'b'], resolution=10.0, retention=3600.0, seed=7)
+    np.testing.assert_array_equal(fresh.read(25544, 10000.0, 12000.0, linear_sampler)[1], first[1])
@@ -0,0 +1,78 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from tle_cache import TLEDiskCache
+
+FETCHED_AT = datetime(2025, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture
+def new_tracker(tmp_path):
+    """Tracker factory over a private disk cache, pointed at the fixture server by default"""
+    import app as ground_station
+
+    trackers = []
+
+    def build(base_url=ground_station.CELESTRAK_URL):
+        tracker = ground_station.MultiSatelliteTracker(cache_dir=str(tmp_path / 'tle'), base_url=base_url)
+        trackers.append(tracker)
+        return tracker
+
+    yield build
+    for tracker in trackers:
+        tracker.close()
+        tracker.fetch_executor.shutdown()
+
+
+def test_disk_cache_round_trip_and_validators(tmp_path):
+    cache = TLEDiskCache(str(tmp_path))
+    assert cache.load('stations') is None and cache.conditional_headers('stations') == {}
+
+    cache.store('stations', 'ISS\n1 ...\n2 ...', FETCHED_AT, etag='"abc"', last_modified='Thu, 02 Jan 2025 00:00:00 GMT')
+    entry = cache.load('stations')
+    assert entry['text'] == 'ISS\n1 ...\n2 ...' and entry['fetched_at'] == FETCHED_AT
+    assert cache.conditional_headers('stations') == {
+        'If-None-Match': '"abc"', 'If-Modified-Since': 'Thu, 02 Jan 2025 00:00:00 GMT'
+    }
+
+    later = datetime(2025, 1, 3)
+    cache.touch('stations', later)
+    assert cache.load('stations')['fetched_at'] == later and cache.load('stations')['text'] == entry['text']
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+    cache.forget('stations')
+    assert cache.load('stations') is None and cache.conditional_headers('stations') == {}
+
+
+def test_revalidation_and_warm_start(new_tracker):
+    tracker = new_tracker()
+    first = tracker.fetch_live_tle_data('space_stations')
+    assert first['updated_groups'] == ['space_stations']
+    assert 'If-Modified-Since' in tracker.tle_cache.conditional_headers('space_stations')
+
+    # The fixture server honours If-Modified-Since, so a forced refresh is a 304 without re-parsing
+    records = tracker.catalogue.groups['space_stations'].records
+    second = tracker.fetch_live_tle_data('space_stations', force_update=True)
+    assert second['not_modified_groups'] == ['space_stations']
+    assert tracker.catalogue.groups['space_stations'].records is records
+
+    # A new process starts from the disk cache alone
+    offline = new_tracker(base_url='http://127.0.0.1:9')
+    assert offline.load_cached_tle_data()['loaded_groups'] == ['space_stations']
+    assert [r.norad_id for r in offline.catalogue.groups['space_stations'].records] == \
+        [r.norad_id for r in records]
+    assert not offline.is_group_stale('space_stations', datetime.utcnow())
+
+
+def test_not_modified_without_cached_text_refetches(new_tracker):
+    tracker = new_tracker()
+    tracker.fetch_live_tle_data('space_stations')
+    os.unlink(os.path.join(tracker.tle_cache.directory, 'space_stations.tle'))
+
+    fresh = new_tracker()
+    result = fresh.fetch_live_tle_data('space_stations')
+    assert result['updated_groups'] == ['space_stations']
+    assert len(fresh.catalogue.groups['space_stations']) > 0
+    assert fresh.tle_cache.load('space_stations') is not None
@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+
+
+class TLEDiskCache:
+    """On-disk store of raw TLE text per group with HTTP validators"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, group):
+        base = os.path.join(self.directory, group)
+        return base + '.tle', base + '.json'
+
+    def load(self, group):
+        """Return cached entry {text, fetched_at, etag, last_modified} or None"""
+        tle_path, meta_path = self._paths(group)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(tle_path) as f:
+                text = f.read()
+        except (OSError, ValueError):
+            return None
+
+        return {
+            'text': text,
+            'fetched_at': datetime.fromisoformat(meta['fetched_at']),
+            'etag': meta.get('etag'),
+            'last_modified': meta.get('last_modified')
+        }
+
+    def load_meta(self, group):
+        """Return the stored metadata for a group, or an empty dict"""
+        _, meta_path = self._paths(group)
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def conditional_headers(self, group):
+        """Build If-None-Match / If-Modified-Since headers for a cached group"""
+        entry = self.load_meta(group)
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, group, text, fetched_at, etag=None, last_modified=None):
+        """Persist TLE text and validators for a group"""
+        tle_path, _ = self._paths(group)
+        self._write_atomic(tle_path, text)
+        self._write_meta(group, {
+            'fetched_at': fetched_at.isoformat(),
+            'etag': etag,
+            'last_modified': last_modified
+        })
+
+    def touch(self, group, fetched_at):
+        """Record a successful revalidation (HTTP 304) without rewriting the TLE text"""
+        meta = self.load_meta(group)
+        if meta:
+            meta['fetched_at'] = fetched_at.isoformat()
+            self._write_meta(group, meta)
+
+    def forget(self, group):
+        """Drop a group's stored validators and text so the next fetch is unconditional"""
+        for path in self._paths(group):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def _write_meta(self, group, meta):
+        _, meta_path = self._paths(group)
+        self._write_atomic(meta_path, json.dumps(meta))
+
+    def _write_atomic(self, path, content):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
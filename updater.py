@@ -0,0 +1,35 @@
+"""Single TLE updater for multi-worker deployments.
+
+Fetches and refreshes TLE data on the usual schedule and publishes the
+catalogue to the shared file that request workers running with
+CATALOGUE_MODE=reader map read-only, so CelesTrak is polled and every
+element set is parsed once however many workers there are:
+
+    python updater.py &
+    CATALOGUE_MODE=reader gunicorn -w 4 'app:create_app()'
+
+Both sides must agree on SHARED_CATALOGUE_PATH (or TLE_CACHE_DIR).
+"""
+import signal
+
+from app import GroundStationService, logger
+
+
+def main():
+    service = GroundStationService(mode='updater')
+    service.tracker
+    thread = service.start_background()
+
+    def stop(signum, frame):
+        logger.info("🛑 Stopping TLE updater")
+        service.stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info("🛰️  TLE updater running", extra={'path': service.shared.path})
+    while thread.is_alive():
+        thread.join(1.0)
+
+
+if __name__ == '__main__':
+    main()